@@ -0,0 +1,75 @@
+"""
+Benchmark: serial vs concurrent transaction assembly
+
+Assembles N unsigned transactions one after another against a local stub
+RPC node with an injected round-trip latency and reports the mean
+assembly latency for:
+
+- serial:     nonce, gas estimate, pending block and fee history awaited
+              one after another (the previous `assemble_unsigned_transaction`)
+- concurrent: the current `assemble_unsigned_transaction`
+
+followed by the per-step breakdown recorded in `Blockchain.metrics`.
+
+$ python benchmarks/bench_assemble.py -n 20 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.stub_servers import StubRpcServer, make_blockchain  # noqa: E402
+from web3gateway.gateway_blockchain import Blockchain  # noqa: E402
+
+
+FROM_ADDRESS = "0x32f7CB25353F1Acae03ADe9Ca8e91ECAd57Fd7B0"
+TO_ADDRESS = "0x742d35Cc6634C0532925a3b844Bc454e4438f44e"
+
+
+async def assemble_serial(gateway: Blockchain, chain_id: int) -> dict:
+    """ the previous assembly: every RPC call awaited in turn """
+    pool = gateway._get_provider_pool(chain_id)
+    transaction = {'from': FROM_ADDRESS, 'to': TO_ADDRESS, 'value': 0,
+                   'nonce': await gateway.get_nonce(chain_id, FROM_ADDRESS),
+                   'chainId': chain_id}
+    transaction['gas'] = await gateway.estimate_gas(chain_id, transaction)
+    block = await pool.call(lambda web3: web3.eth.get_block('pending'))
+    fee_history = await pool.call(lambda web3: web3.eth.fee_history(3, 'pending', [50.0]))
+    transaction['maxPriorityFeePerGas'] = fee_history['reward'][0][0]
+    transaction['maxFeePerGas'] = block['baseFeePerGas'] * 2
+    return transaction
+
+
+async def assemble_concurrent(gateway: Blockchain, chain_id: int) -> dict:
+    return await gateway.assemble_unsigned_transaction(
+        chain_id, FROM_ADDRESS, TO_ADDRESS, 0, '')
+
+
+async def main(count: int, latency: float) -> None:
+    with StubRpcServer(latency=latency) as rpc:
+        gateway = make_blockchain([rpc.url], {"rpc_probe_interval": 0})
+        for name, assemble in (("serial", assemble_serial),
+                               ("concurrent", assemble_concurrent)):
+            await assemble(gateway, 1)  # warm up the connection
+            start = time.perf_counter()
+            for _ in range(count):
+                await assemble(gateway, 1)
+            elapsed = time.perf_counter() - start
+            print(f"{name:>10}: {elapsed / count * 1000:8.1f}ms per assembly")
+        print(json.dumps(gateway.metrics.snapshot()["stages"], indent=2))
+        await gateway.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-n", "--transactions", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="stub RPC round-trip latency in seconds")
+    args = parser.parse_args()
+    asyncio.run(main(args.transactions, args.latency))
@@ -0,0 +1,68 @@
+"""
+Benchmark: one batch assembly vs N single assemblies
+
+Assembles N transfers from one sender against a local stub RPC node with
+an injected round-trip latency and reports wall time and RPC calls for:
+
+- single: N concurrent `assemble_unsigned_transaction` calls (one
+          `/transaction/assemble` each)
+- batch:  one `assemble_unsigned_transactions` call (the call behind
+          `/transaction/assemble:batch`)
+
+$ python benchmarks/bench_assemble_batch.py -n 500 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from web3 import Web3
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.stub_servers import StubRpcServer, make_blockchain  # noqa: E402
+from web3gateway.gateway_blockchain import Blockchain  # noqa: E402
+
+
+FROM_ADDRESS = "0x32f7CB25353F1Acae03ADe9Ca8e91ECAd57Fd7B0"
+
+
+def recipients(count: int) -> list[str]:
+    return [Web3.to_checksum_address(f"0x{i + 1:040x}") for i in range(count)]
+
+
+async def single(gateway: Blockchain, count: int) -> None:
+    await asyncio.gather(*(
+        gateway.assemble_unsigned_transaction(1, FROM_ADDRESS, to, 1, '')
+        for to in recipients(count)))
+
+
+async def batch(gateway: Blockchain, count: int) -> None:
+    await gateway.assemble_unsigned_transactions(
+        1, FROM_ADDRESS, [{"to": to, "value": 1} for to in recipients(count)])
+
+
+async def main(count: int, latency: float) -> None:
+    for name, assemble in (("single", single), ("batch", batch)):
+        with StubRpcServer(latency=latency) as rpc:
+            # fees over RPC, as a cold gateway would fetch them
+            gateway = make_blockchain([rpc.url], {"rpc_probe_interval": 0,
+                                                  "fee_poll_interval": 0})
+            start = time.perf_counter()
+            await assemble(gateway, count)
+            elapsed = time.perf_counter() - start
+            print(f"{name:>6}: {count} transactions in {elapsed * 1000:8.1f}ms "
+                  f"rpc_calls={rpc.calls}")
+            await gateway.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-n", "--transactions", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="stub RPC round-trip latency in seconds")
+    args = parser.parse_args()
+    asyncio.run(main(args.transactions, args.latency))
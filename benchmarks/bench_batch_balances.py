@@ -0,0 +1,75 @@
+"""
+Benchmark: one batch lookup vs N single balance lookups
+
+Looks up the native balance of N addresses against a local stub Etherscan
+server and reports wall time and upstream calls for:
+
+- single: N concurrent `account.balance` calls (one `/account/balance` each)
+- batch:  one `account.balances` call (the call behind `/account/balances:batch`)
+
+The Redis tier is replaced by a no-op cache and the balance micro-batcher
+is disabled, so every lookup reaches the upstream.
+
+$ python benchmarks/bench_batch_balances.py -n 100 --latency 0.05 --rate 5
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_etherscan_transport import NullCache  # noqa: E402
+from benchmarks.stub_servers import StubEtherscanServer  # noqa: E402
+from web3gateway.gateway_etherscanv2 import EtherScanV2  # noqa: E402
+
+
+def make_gateway(stub: StubEtherscanServer, rate: int) -> EtherScanV2:
+    config = {
+        "redis_url": "redis://localhost:6379",
+        "etherscan_api_key": "bench",
+        "etherscan_chainlist_url": stub.chainlist_url,
+        "rate_limit_calls": rate,
+        "rate_limit_period": 1,
+        "cache_expiration": 10,
+    }
+    gateway = EtherScanV2(config)
+    gateway.cache = NullCache()
+    return gateway
+
+
+async def single(gateway: EtherScanV2, addresses: list[str]) -> None:
+    chain = gateway.for_chain(1)
+    await asyncio.gather(*(chain.account.balance(a) for a in addresses))
+
+
+async def batch(gateway: EtherScanV2, addresses: list[str]) -> None:
+    await gateway.for_chain(1).account.balances(addresses)
+
+
+async def main(count: int, latency: float, rate: int) -> None:
+    addresses = [f"0x{i:040x}" for i in range(count)]
+    for name, lookup in (("single", single), ("batch", batch)):
+        with StubEtherscanServer(latency=latency) as stub:
+            gateway = make_gateway(stub, rate)
+            calls_before = stub.calls
+            start = time.perf_counter()
+            await lookup(gateway, addresses)
+            elapsed = time.perf_counter() - start
+            print(f"{name:>6}: {count} balances in {elapsed * 1000:8.1f}ms "
+                  f"upstream_calls={stub.calls - calls_before}")
+            await gateway.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-n", "--addresses", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="stub upstream latency in seconds")
+    parser.add_argument("--rate", type=int, default=5,
+                        help="Etherscan calls per second allowed by the rate limiter")
+    args = parser.parse_args()
+    asyncio.run(main(args.addresses, args.latency, args.rate))
@@ -0,0 +1,118 @@
+"""
+Benchmark: cache value size and encode/decode time per codec
+
+Encodes and decodes typical Etherscan results the way CacheService stores
+them in Redis: a 10,000-row `txlist` (Accounts), a 10,000-row `tokentx`
+(Tokens), 1,000 `getLogs` entries (Logs) and a single balance. Reports the
+stored size and the time per value for plain JSON text (the format before
+value headers) and every installed serializer and compression.
+
+$ python benchmarks/bench_cache_codec.py -n 20
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from web3gateway.utils.cache_codec import COMPRESSIONS, SERIALIZERS, CacheCodec  # noqa: E402
+
+
+def txlist(rows: int) -> list[dict]:
+    """ account.txlist rows """
+    return [{
+        "blockNumber": str(19_000_000 + i), "timeStamp": str(1_700_000_000 + i * 12),
+        "hash": f"0x{i:064x}", "nonce": str(i), "blockHash": f"0x{i * 7:064x}",
+        "transactionIndex": str(i % 200), "from": f"0x{i % 97:040x}",
+        "to": f"0x{i % 89:040x}", "value": str(i * 10 ** 15), "gas": "21000",
+        "gasPrice": str(20_000_000_000 + i), "isError": "0", "txreceipt_status": "1",
+        "input": "0x", "contractAddress": "", "cumulativeGasUsed": str(21000 * (i % 200 + 1)),
+        "gasUsed": "21000", "confirmations": str(100_000 - i), "methodId": "0x",
+        "functionName": ""} for i in range(rows)]
+
+
+def tokentx(rows: int) -> list[dict]:
+    """ account.tokentx rows """
+    return [{
+        "blockNumber": str(19_000_000 + i), "timeStamp": str(1_700_000_000 + i * 12),
+        "hash": f"0x{i:064x}", "nonce": str(i), "blockHash": f"0x{i * 7:064x}",
+        "from": f"0x{i % 97:040x}", "contractAddress": f"0x{i % 5:040x}",
+        "to": f"0x{i % 89:040x}", "value": str(i * 10 ** 6), "tokenName": "Tether USD",
+        "tokenSymbol": "USDT", "tokenDecimal": "6", "transactionIndex": str(i % 200),
+        "gas": "65000", "gasPrice": str(20_000_000_000 + i), "gasUsed": "46109",
+        "cumulativeGasUsed": str(46109 * (i % 200 + 1)), "input": "deprecated",
+        "confirmations": str(100_000 - i)} for i in range(rows)]
+
+
+def logs(entries: int) -> list[dict]:
+    """ logs.getLogs entries """
+    return [{
+        "address": f"0x{i % 5:040x}",
+        "topics": ["0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef",
+                   f"0x{i % 97:064x}", f"0x{i % 89:064x}"],
+        "data": f"0x{i * 10 ** 6:064x}", "blockNumber": hex(19_000_000 + i),
+        "blockHash": f"0x{i * 7:064x}", "timeStamp": hex(1_700_000_000 + i * 12),
+        "gasPrice": hex(20_000_000_000 + i), "gasUsed": hex(46109), "logIndex": hex(i % 300),
+        "transactionHash": f"0x{i:064x}", "transactionIndex": hex(i % 200)}
+        for i in range(entries)]
+
+
+PAYLOADS = {
+    "txlist 10k": txlist(10_000),
+    "tokentx 10k": tokentx(10_000),
+    "getLogs 1k": logs(1_000),
+    "balance": "172774397764084972158218",
+}
+
+
+def timed(fn: Callable[[Any], Any], arg: Any, count: int) -> float:
+    """ mean seconds of a call """
+    start = time.perf_counter()
+    for _ in range(count):
+        fn(arg)
+    return (time.perf_counter() - start) / count
+
+
+def installed(loaders: dict) -> list[str]:
+    """ names of the formats whose package is installed """
+    names = []
+    for name, loader in loaders.items():
+        try:
+            loader()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def main(count: int) -> None:
+    codecs: dict[str, tuple[Callable[[Any], bytes], Callable[[bytes], Any]]] = {
+        # before value headers: json text through a decode_responses client
+        "json text": (lambda value: json.dumps(value).encode(),
+                      lambda data: json.loads(data.decode())),
+    }
+    for serializer in installed(SERIALIZERS):
+        for compression in installed(COMPRESSIONS):
+            codec = CacheCodec(serializer, compression, compress_min_size=16384)
+            codecs[f"{serializer}+{compression}"] = (codec.encode, codec.decode)
+
+    for payload_name, value in PAYLOADS.items():
+        print(f"{payload_name}:")
+        for name, (encode, decode) in codecs.items():
+            data = encode(value)
+            encode_s = timed(encode, value, count)
+            decode_s = timed(decode, data, count)
+            print(f"  {name:>16}: {len(data):10,d} bytes, encode {encode_s * 1000:8.3f}ms, "
+                  f"decode {decode_s * 1000:8.3f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-n", "--count", type=int, default=20, help="runs per measurement")
+    args = parser.parse_args()
+    main(args.count)
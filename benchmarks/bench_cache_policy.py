@@ -0,0 +1,96 @@
+"""
+Benchmark: upstream calls with one cache TTL vs the per-action TTL policy
+
+Replays an analytics dashboard (contract ABIs, past block rewards and
+receipts, past daily stats, historical transaction lists, gas oracle and
+balances) every `cache_expiration` + 1 seconds of simulated time against a
+local stub Etherscan server and reports the upstream calls for:
+
+- uniform: every result cached for `cache_expiration` seconds
+- policy:  TTL per action, final blocks and past days cached until evicted
+
+The Redis tier is replaced by an in-memory cache on the simulated clock.
+
+$ python benchmarks/bench_cache_policy.py --rounds 30
+"""
+
+import argparse
+import asyncio
+import math
+import sys
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.stub_servers import StubEtherscanServer  # noqa: E402
+from web3gateway.gateway_etherscanv2 import EtherScanV2  # noqa: E402
+from web3gateway.gateway_etherscanv2.metadata import valid_params  # noqa: E402
+
+
+CACHE_EXPIRATION = 10
+
+
+class ClockCache:
+    """ in-memory cache expiring entries on a simulated clock """
+
+    def __init__(self):
+        self.now = 0.0
+        self.data = {}
+
+    def get_local(self, key):
+        return None
+
+    async def get_remote_with_ttl(self, key, stale=0, raw=False):
+        value, expires_at = self.data.get(key, (None, 0))
+        return (value if self.now < expires_at else None), None
+
+    async def set(self, key, value, expire=0, stale=0):
+        self.data[key] = (value, self.now + expire if expire else math.inf)
+        return True
+
+    async def close(self):
+        pass
+
+
+async def dashboard(gateway: EtherScanV2) -> None:
+    """ the lookups behind one dashboard refresh """
+    chain = gateway.for_chain(1)
+    addresses = [f"0x{i:040x}" for i in range(10)]
+    await asyncio.gather(
+        *(chain.contract.getabi(address) for address in addresses),
+        *(chain.block.getblockreward(1_000_000 + i) for i in range(10)),
+        *(chain.proxy.eth_get_transaction_receipt(f"0x{i:064x}") for i in range(10)),
+        *(chain.account.txlist(address, startblock=0, endblock=1_000_000)
+          for address in addresses),
+        chain.stats.dailytx(startdate="2024-01-01", enddate="2024-01-31"),
+        chain.gas_tracker.gasoracle(),
+        *(chain.account.balance(address) for address in addresses))
+
+
+async def main(rounds: int) -> None:
+    uniform = {action: CACHE_EXPIRATION for action in valid_params}
+    for name, overrides in (("uniform", uniform), ("policy", {})):
+        with StubEtherscanServer(latency=0) as stub:
+            gateway = EtherScanV2({
+                "redis_url": "redis://localhost:6379",
+                "etherscan_api_key": "bench",
+                "etherscan_chainlist_url": stub.chainlist_url,
+                "rate_limit_calls": 1_000_000,
+                "rate_limit_period": 1,
+                "cache_expiration": CACHE_EXPIRATION,
+                "cache_action_expiration": overrides,
+            })
+            gateway.cache = cache = ClockCache()
+            for _ in range(rounds):
+                await dashboard(gateway)
+                cache.now += CACHE_EXPIRATION + 1
+            print(f"{name:>8}: {stub.calls:6d} upstream calls in {rounds} refreshes")
+            await gateway.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=30)
+    args = parser.parse_args()
+    asyncio.run(main(args.rounds))
@@ -0,0 +1,97 @@
+"""
+Benchmark: chain lookups by linear scan vs through the chain registry
+
+Builds a chain list shaped like chainid.network's chains.json (synthetic,
+or the file given with --file) and reports:
+
+- memory: bytes allocated by the parsed JSON vs by the registry built from it
+- lookup: mean time per chain id lookup with the old linear scan
+          (`select_chain_by_key_value` + `.copy()`) vs `ChainRegistry.get`
+
+$ python benchmarks/bench_chain_registry.py --chains 3000 -n 2000
+"""
+
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from web3gateway.utils.chain_registry import ChainRegistry  # noqa: E402
+
+
+def synthetic_chains_json(count: int) -> str:
+    """ chains.json text with `count` entries of realistic size """
+    chains = []
+    for i in range(count):
+        chains.append({
+            "name": f"Chain {i} Mainnet",
+            "chain": f"C{i}",
+            "icon": "ethereum",
+            "rpc": [f"https://rpc{j}.chain{i}.example/${{INFURA_API_KEY}}" for j in range(4)],
+            "features": [{"name": "EIP155"}, {"name": "EIP1559"}],
+            "faucets": [],
+            "nativeCurrency": {"name": "Ether", "symbol": "ETH", "decimals": 18},
+            "infoURL": f"https://chain{i}.example",
+            "shortName": f"c{i}",
+            "chainId": i + 1,
+            "networkId": i + 1,
+            "slip44": 60,
+            "ens": {"registry": "0x00000000000C2E074eC69A0dFb2997BA6C7d2e1e"},
+            "explorers": [{"name": "explorer", "url": f"https://scan.chain{i}.example",
+                           "standard": "EIP3091"}],
+        })
+    return json.dumps(chains)
+
+
+def allocated(build: Callable[[], Any]) -> tuple[Any, int]:
+    """ build an object and return it with the bytes it keeps allocated """
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, size
+
+
+def linear_select(chains_json: list[dict], chain_id: int) -> dict:
+    """ the lookup Chains did before the registry """
+    for chain_info in chains_json:
+        if isinstance(chain_info, dict) and chain_info.get("chainId") == chain_id:
+            return chain_info.copy()
+    raise KeyError(chain_id)
+
+
+def main(text: str, count: int) -> None:
+    chains_json, json_bytes = allocated(lambda: json.loads(text))
+    registry, registry_bytes = allocated(lambda: ChainRegistry.from_chainid_network(chains_json))
+    print(f"{len(chains_json)} chains")
+    print(f"  memory: json {json_bytes / 1024:10.1f}KiB, registry {registry_bytes / 1024:10.1f}KiB")
+
+    ids = [random.choice(chains_json)["chainId"] for _ in range(count)]
+    for name, lookup in (("scan", lambda chain_id: linear_select(chains_json, chain_id)),
+                         ("registry", registry.get)):
+        start = time.perf_counter()
+        for chain_id in ids:
+            lookup(chain_id)
+        elapsed = time.perf_counter() - start
+        print(f"{name:>8}: {elapsed / count * 1e6:10.2f}us per lookup")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--chains", type=int, default=3000,
+                        help="synthetic chains when --file is not given")
+    parser.add_argument("--file", type=Path, help="chains.json to load instead")
+    parser.add_argument("-n", "--lookups", type=int, default=2000)
+    args = parser.parse_args()
+    main(args.file.read_text(encoding="utf-8") if args.file else synthetic_chains_json(args.chains),
+         args.lookups)
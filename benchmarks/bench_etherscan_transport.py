@@ -0,0 +1,114 @@
+"""
+Benchmark: blocking vs pooled async transport for EtherScanV2.request
+
+Fires N concurrent `account.balance` lookups (the call behind
+`/account/balance`) against a local stub Etherscan server and reports
+p50/p99 latency and throughput for:
+
+- blocking: the previous `requests.get` call inside the coroutine
+- async:    the shared pooled `HttpClient`
+
+Every lookup uses a distinct address and the Redis tier is replaced by a
+no-op cache, so each call reaches the transport.
+
+$ python benchmarks/bench_etherscan_transport.py -n 200 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import requests
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.stub_servers import StubEtherscanServer, percentile  # noqa: E402
+from web3gateway.gateway_etherscanv2 import EtherScanV2  # noqa: E402
+from web3gateway.utils.http_client import HttpClient  # noqa: E402
+
+
+class NullCache:
+    """ cache that never hits, isolating transport cost """
+
+    def get_local(self, key):
+        return None
+
+    async def get_remote_with_ttl(self, key, stale=0, raw=False):
+        return None, None
+
+    async def get_remote_many_with_ttl(self, keys, stale=0):
+        return [(None, None)] * len(keys)
+
+    async def set(self, key, value, expire=0, stale=0):
+        return True
+
+    async def close(self):
+        pass
+
+
+class BlockingHttpClient:
+    """ the previous transport: a blocking requests.get per call """
+
+    async def get(self, url, **kwargs):
+        return requests.get(url, timeout=10)
+
+    async def close(self):
+        pass
+
+
+def make_gateway(stub: StubEtherscanServer) -> EtherScanV2:
+    config = {
+        "redis_url": "redis://localhost:6379",
+        "etherscan_api_key": "bench",
+        "etherscan_chainlist_url": stub.chainlist_url,
+        "rate_limit_calls": 1_000_000,
+        "rate_limit_period": 1,
+        "cache_expiration": 10,
+    }
+    gateway = EtherScanV2(config)
+    gateway.cache = NullCache()
+    return gateway
+
+
+async def run(gateway: EtherScanV2, count: int) -> tuple[list[float], float]:
+    chain = gateway.for_chain(1)
+    latencies: list[float] = []
+    # all requests are fired at once, so latency is measured from the burst start
+    start = time.perf_counter()
+
+    async def one(i: int):
+        await chain.account.balance(f"0x{i:040x}")
+        latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one(i) for i in range(count)))
+    return latencies, time.perf_counter() - start
+
+
+def report(name: str, latencies: list[float], elapsed: float) -> None:
+    print(f"{name:>9}: p50={percentile(latencies, 50) * 1000:8.1f}ms "
+          f"p99={percentile(latencies, 99) * 1000:8.1f}ms "
+          f"throughput={len(latencies) / elapsed:8.1f} req/s")
+
+
+async def main(count: int, latency: float) -> None:
+    with StubEtherscanServer(latency=latency) as stub:
+        gateway = make_gateway(stub)
+
+        gateway.http = BlockingHttpClient()
+        report("blocking", *await run(gateway, count))
+
+        gateway.http = HttpClient(gateway.config)
+        report("async", *await run(gateway, count))
+        await gateway.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-n", "--requests", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="stub upstream latency in seconds")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.latency))
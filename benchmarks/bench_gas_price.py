@@ -0,0 +1,48 @@
+"""
+Benchmark: gas price over RPC vs from the fee tracker
+
+Calls `Blockchain.get_gas_price` N times per gas level against a local
+stub RPC node with an injected round-trip latency and reports the mean
+latency for:
+
+- rpc:    fee tracker disabled, pending block and fee history fetched per call
+- memory: fee tracker enabled, estimates computed from the ring buffer
+
+$ python benchmarks/bench_gas_price.py -n 100 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.stub_servers import StubRpcServer, make_blockchain  # noqa: E402
+from web3gateway.gateway_blockchain import MODE  # noqa: E402
+
+
+async def main(count: int, latency: float) -> None:
+    with StubRpcServer(latency=latency) as rpc:
+        for name, poll_interval in (("rpc", 0), ("memory", 2)):
+            gateway = make_blockchain([rpc.url], {"rpc_probe_interval": 0,
+                                                  "fee_poll_interval": poll_interval})
+            await gateway.get_gas_price(1, "normal")  # warm up connection and tracker
+            start = time.perf_counter()
+            for _ in range(count):
+                for level in MODE:
+                    await gateway.get_gas_price(1, level)
+            elapsed = time.perf_counter() - start
+            print(f"{name:>6}: {elapsed / (count * len(MODE)) * 1e6:10.1f}us per get_gas_price")
+            await gateway.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-n", "--calls", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="stub RPC round-trip latency in seconds")
+    args = parser.parse_args()
+    asyncio.run(main(args.calls, args.latency))
@@ -0,0 +1,126 @@
+"""
+Benchmark: "latest" results cached with a TTL vs keyed by the chain head
+
+A wallet screen polls the balances of 20 addresses, a nonce and the block
+number every 100ms for `--duration` seconds, against a local stub
+Etherscan server producing a block every `--block-time` seconds; every
+balance returned is the block it was read at. Reports upstream calls and
+stale reads (a balance of an older block than the stub's head) for:
+
+- short ttl: entries cached for a quarter of a block
+- long ttl:  entries cached for three blocks
+- epoch:     entries keyed by the head block, polled every `--poll` seconds
+
+The Redis tier is replaced by an in-memory cache (the head watcher then
+polls for itself, as a single worker would with Redis).
+
+$ python benchmarks/bench_head_epoch.py --duration 20 --block-time 4
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.stub_servers import StubEtherscanServer  # noqa: E402
+from web3gateway.gateway_etherscanv2 import EtherScanV2  # noqa: E402
+
+
+ADDRESSES = [f"0x{i:040x}" for i in range(20)]
+POLL_INTERVAL = 0.1
+
+
+class BlockStub(StubEtherscanServer):
+    """ stub Etherscan whose head and balances move every block_time seconds """
+
+    def __init__(self, block_time: float):
+        super().__init__(latency=0.02)
+        self.block_time = block_time
+
+    def head(self) -> int:
+        return int(time.time() / self.block_time)
+
+    def result_for(self, params: dict[str, str]) -> Any:
+        action = params.get("action", "")
+        if action == "eth_blockNumber":
+            return hex(self.head())
+        if action in ("balance", "eth_getTransactionCount"):
+            return str(self.head())
+        return super().result_for(params)
+
+
+class MemoryCache:
+    """ in-memory cache expiring entries in real time """
+
+    def __init__(self):
+        self.data = {}
+        self.redis = None
+
+    def get_local(self, key):
+        return None
+
+    async def get_remote_with_ttl(self, key, stale=0, raw=False):
+        value, expires_at = self.data.get(key, (None, 0))
+        return (value if time.monotonic() < expires_at else None), None
+
+    async def set(self, key, value, expire=0, stale=0):
+        self.data[key] = (value, time.monotonic() + (expire or 3600))
+        return True
+
+    async def close(self):
+        pass
+
+
+async def wallet(gateway: EtherScanV2, stub: BlockStub, duration: float) -> tuple[int, int]:
+    """ poll the wallet screen, returning (balance reads, stale reads) """
+    chain = gateway.for_chain(1)
+    reads = stale = 0
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        balances = await asyncio.gather(*(chain.account.balance(a) for a in ADDRESSES),
+                                        chain.proxy.eth_get_transaction_count(ADDRESSES[0]),
+                                        chain.proxy.eth_block_number())
+        head = stub.head()
+        reads += len(ADDRESSES)
+        stale += sum(int(balance) < head for balance in balances[:len(ADDRESSES)])
+        await asyncio.sleep(POLL_INTERVAL)
+    return reads, stale
+
+
+async def main(duration: float, block_time: float, poll: float) -> None:
+    scenarios = (
+        ("short ttl", {"cache_block_expiration": block_time / 4}),
+        ("long ttl", {"cache_block_expiration": block_time * 3}),
+        ("epoch", {"cache_block_expiration": block_time / 4, "head_poll_interval": poll}),
+    )
+    for name, settings in scenarios:
+        with BlockStub(block_time) as stub:
+            gateway = EtherScanV2({
+                "redis_url": "redis://localhost:6379",
+                "etherscan_api_key": "bench",
+                "etherscan_chainlist_url": stub.chainlist_url,
+                "rate_limit_calls": 1_000_000,
+                "rate_limit_period": 1,
+                "cache_expiration": 10,
+                **settings,
+            })
+            gateway.cache = MemoryCache()
+            gateway.head_watcher.redis = gateway.cache.redis
+            reads, stale = await wallet(gateway, stub, duration)
+            print(f"{name:>9}: {stub.calls:5d} upstream calls, "
+                  f"{stale / reads:6.1%} stale balance reads ({reads} reads)")
+            await gateway.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--duration", type=float, default=20, help="seconds per scenario")
+    parser.add_argument("--block-time", type=float, default=4, help="stub seconds per block")
+    parser.add_argument("--poll", type=float, default=0.25, help="head poll interval")
+    args = parser.parse_args()
+    asyncio.run(main(args.duration, args.block_time, args.poll))
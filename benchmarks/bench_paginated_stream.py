@@ -0,0 +1,135 @@
+"""
+Benchmark: full account histories buffered vs streamed page by page
+
+Reads the `--rows` transactions of one address from a local stub Etherscan
+server with `--latency` seconds of upstream latency, 1,000 rows per page,
+for a client taking `--client-delay` seconds to receive each page, and
+reports the time to the first and last row and the peak Python memory of:
+
+- buffered: every page collected, then one JSON document written
+- stream:   NDJSON written page by page, the next page fetched on demand
+- prefetch: NDJSON written page by page, the next page fetched meanwhile
+
+The Redis tier is replaced by a cache keeping nothing, as Redis keeps the
+pages out of the process.
+
+$ python benchmarks/bench_paginated_stream.py --rows 50000 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import bisect
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_cache_codec import txlist  # noqa: E402
+from benchmarks.stub_servers import StubEtherscanServer  # noqa: E402
+from web3gateway.gateway_etherscanv2 import EtherScanV2  # noqa: E402
+from web3gateway.responses import dumps  # noqa: E402
+
+
+HOLDER = "0x" + "ab" * 20
+
+
+class HistoryStub(StubEtherscanServer):
+    """ stub Etherscan answering txlist pages of a `rows` transaction history """
+
+    def __init__(self, rows: int, latency: float):
+        super().__init__(latency=latency)
+        self.rows = txlist(rows)
+        self.blocks = [int(row["blockNumber"]) for row in self.rows]
+
+    def result_for(self, params: dict[str, str]) -> Any:
+        if params.get("action") != "txlist":
+            return super().result_for(params)
+        start, end = int(params["startblock"]), int(params["endblock"])
+        page, offset = int(params["page"]), int(params["offset"])
+        first = bisect.bisect_left(self.blocks, start) + (page - 1) * offset
+        last = min(first + offset, bisect.bisect_right(self.blocks, end))
+        return self.rows[first:last]
+
+
+class NullCache:
+    """ cache keeping nothing """
+
+    def get_local(self, key):
+        return None
+
+    async def get_remote_with_ttl(self, key, stale=0, raw=False):
+        return None, None
+
+    async def set(self, key, value, expire=0, stale=0):
+        return True
+
+    async def close(self):
+        pass
+
+
+async def buffered(pages: AsyncIterator[list[dict]]) -> AsyncIterator[bytes]:
+    rows = [row async for page in pages for row in page]
+    yield dumps({"last transactions": rows})
+
+
+async def streamed(pages: AsyncIterator[list[dict]]) -> AsyncIterator[bytes]:
+    async for page in pages:
+        yield b"".join(dumps(row) + b"\n" for row in page)
+
+
+async def timed(gateway: EtherScanV2, render, client_delay: float) -> tuple[float, float]:
+    """ seconds to the first and the last chunk """
+    start = time.perf_counter()
+    first = 0.0
+    async for _ in render(gateway.for_chain(1).account.txlist_pages(HOLDER)):
+        first = first or time.perf_counter() - start
+        await asyncio.sleep(client_delay)
+    return first, time.perf_counter() - start
+
+
+async def peak_memory(gateway: EtherScanV2, render) -> int:
+    """ peak traced bytes (the stub's own allocations included) """
+    tracemalloc.start()
+    async for _ in render(gateway.for_chain(1).account.txlist_pages(HOLDER)):
+        pass
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+async def main(rows: int, latency: float, client_delay: float) -> None:
+    with HistoryStub(rows, latency) as stub:
+        gateway = EtherScanV2({
+            "redis_url": "redis://localhost:6379",
+            "etherscan_api_key": "bench",
+            "etherscan_chainlist_url": stub.chainlist_url,
+            "rate_limit_calls": 1_000_000,
+            "rate_limit_period": 1,
+            "cache_expiration": 10,
+        })
+        gateway.cache = NullCache()
+        has_slack = gateway.key_pool.has_slack
+        scenarios = (("buffered", buffered, False), ("stream", streamed, False),
+                     ("prefetch", streamed, True))
+        for name, render, prefetch in scenarios:
+            gateway.key_pool.has_slack = has_slack if prefetch else lambda: False
+            first, total = await timed(gateway, render, client_delay)
+            peak = await peak_memory(gateway, render)
+            print(f"{name:>8}: first row {first:6.2f}s, last row {total:6.2f}s, "
+                  f"{peak / 2 ** 20:7.2f}MiB peak, {rows:,d} rows")
+        await gateway.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=50_000, help="transactions in the history")
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="stub upstream latency in seconds")
+    parser.add_argument("--client-delay", type=float, default=0.05,
+                        help="seconds the client takes to receive a page")
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.latency, args.client_delay))
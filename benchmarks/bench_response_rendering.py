@@ -0,0 +1,160 @@
+"""
+Benchmark: /account/txlist throughput with FastAPI's default rendering vs the gateway's
+
+Serves a cached `--rows` transactions result through the ASGI app
+in-process (no sockets) with `--concurrency` clients for `--requests`
+requests per scenario:
+
+- default: rows decoded from the cache, rendered as FastAPI renders routes
+           without response schema (jsonable_encoder and stdlib json)
+- schema:  rows decoded from the cache, validated by the response schema and
+           rendered with orjson, as the other gateway routes are
+- gateway: the app of `create_app`, cached JSON text passed through
+- gzip:    the gateway with `response_compression` set to gzip
+
+The Redis tier is replaced by an in-memory cache storing values encoded
+like Redis does.
+
+$ python benchmarks/bench_response_rendering.py --rows 1000 --requests 200
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from benchmarks.bench_cache_codec import txlist  # noqa: E402
+from benchmarks.stub_servers import StubEtherscanServer  # noqa: E402
+from web3gateway.gateway_etherscanv2 import EtherScanV2  # noqa: E402
+from web3gateway.main import (  # noqa: E402
+    AccountTransactions,
+    AccountTransactionsRequest,
+    Timestamped,
+    create_app,
+    with_timestamp,
+)
+from web3gateway.responses import FastJSONResponse  # noqa: E402
+from web3gateway.utils.cache_codec import CacheCodec  # noqa: E402
+
+
+AUTH = ("bench", "bench")
+HOLDER = "0x" + "ab" * 20
+
+
+class TxlistStub(StubEtherscanServer):
+    """ stub Etherscan answering txlist with `rows` transactions """
+
+    def __init__(self, rows: int):
+        super().__init__(latency=0)
+        self.rows = txlist(rows)
+
+    def result_for(self, params: dict[str, str]) -> Any:
+        if params.get("action") == "txlist":
+            return self.rows
+        return super().result_for(params)
+
+
+class MemoryCache:
+    """ in-memory cache holding values encoded by the codec, like Redis """
+
+    def __init__(self, codec: CacheCodec):
+        self.codec = codec
+        self.data: dict[str, bytes] = {}
+
+    def get_local(self, key):
+        return None
+
+    async def get_remote_with_ttl(self, key, stale=0, raw=False):
+        value = self.data.get(key)
+        if value is None:
+            return None, None
+        return (self.codec.to_json(value) if raw else self.codec.decode(value)), None
+
+    async def set(self, key, value, expire=0, stale=0):
+        self.data[key] = self.codec.encode(value)
+        return True
+
+    def stats(self):
+        return {}
+
+    async def close(self):
+        pass
+
+
+def decoding_app(gateway: EtherScanV2, schema: bool) -> FastAPI:
+    """ a txlist route returning the decoded rows, with or without response schema """
+    app = FastAPI(default_response_class=FastJSONResponse) if schema else FastAPI()
+    response_model = Timestamped[AccountTransactions] if schema else None
+
+    @app.post("/account/txlist", response_model=response_model)
+    async def txlist_route(request: AccountTransactionsRequest):
+        txs = await gateway.for_chain(request.chain_id).account.txlist(request.address)
+        return with_timestamp({"last transactions": txs})
+
+    return app
+
+
+async def run(app: FastAPI, path: str, body: dict, requests: int,
+              concurrency: int, encoding: Optional[str]) -> tuple[float, int]:
+    """ requests per second and response bytes on the wire """
+    headers = {"Accept-Encoding": encoding or "identity"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench",
+                                 auth=AUTH, headers=headers) as client:
+        res = await client.post(path, json=body)
+        assert res.status_code == 200, res.text
+        size = int(res.headers.get("content-length") or len(res.content))
+        remaining = requests
+
+        async def worker() -> None:
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                (await client.post(path, json=body)).raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return requests / (time.perf_counter() - start), size
+
+
+async def main(rows: int, requests: int, concurrency: int) -> None:
+    with TxlistStub(rows) as stub:
+        config = {
+            "auth_username": AUTH[0], "auth_password": AUTH[1], "infura_project_id": "",
+            "redis_url": "redis://localhost:6379", "etherscan_api_key": "bench",
+            "etherscan_chainlist_url": stub.chainlist_url, "chains_json_url": stub.chains_json_url,
+            "rate_limit_calls": 1_000_000, "rate_limit_period": 1, "cache_expiration": 3600,
+        }
+        apps = {"gateway": create_app(config),
+                "gzip": create_app({**config, "response_compression": ["gzip"]})}
+        gateway = apps["gateway"].state.gw_etherscan
+        gateway.cache = MemoryCache(gateway.codec)
+        for app in apps.values():
+            app.state.gw_etherscan = gateway
+        apps = {"default": decoding_app(gateway, schema=False),
+                "schema": decoding_app(gateway, schema=True), **apps}
+
+        body = {"chain_id": 1, "address": HOLDER}
+        print(f"/account/txlist, {rows:,d} rows:")
+        for name, app in apps.items():
+            encoding = "gzip" if name == "gzip" else None
+            rate, size = await run(app, "/account/txlist", body, requests, concurrency, encoding)
+            print(f"  {name:>7}: {rate:8.1f} req/s, {size:10,d} bytes per response")
+        await gateway.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000, help="transactions per txlist")
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10, help="concurrent clients")
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.requests, args.concurrency))
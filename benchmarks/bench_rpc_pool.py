@@ -0,0 +1,99 @@
+"""
+Benchmark: first RPC url only vs health-scored provider pool
+
+Sends N `eth_getTransactionCount` calls (the call behind nonce lookups in
+`/transaction/assemble`) with bounded concurrency to three local stub RPC
+nodes:
+
+- the first url is slow and fails part of its calls
+- the second url is fast and healthy
+- the third url is down (every call fails)
+
+and reports p50/p99 latency, throughput and errors for:
+
+- first-url: the previous `AsyncWeb3(AsyncHTTPProvider(rpc_urls[0]))`
+- pool:      `ProviderPool` over all three urls
+
+$ python benchmarks/bench_rpc_pool.py -n 500 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+
+from web3 import AsyncHTTPProvider, AsyncWeb3
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.stub_servers import StubRpcServer, percentile  # noqa: E402
+from web3gateway.gateway_blockchain.provider_pool import ProviderPool  # noqa: E402
+
+
+ADDRESS = "0x32f7CB25353F1Acae03ADe9Ca8e91ECAd57Fd7B0"
+
+
+async def run(call, count: int, concurrency: int) -> tuple[list[float], int, float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    errors = 0
+
+    async def one():
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await call()
+            except Exception:
+                errors += 1
+                return
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(count)))
+    return latencies, errors, time.perf_counter() - start
+
+
+def report(name: str, latencies: list[float], errors: int, elapsed: float) -> None:
+    print(f"{name:>9}: p50={percentile(latencies, 50) * 1000:8.1f}ms "
+          f"p99={percentile(latencies, 99) * 1000:8.1f}ms "
+          f"throughput={len(latencies) / elapsed:8.1f} req/s errors={errors}")
+
+
+async def main(count: int, concurrency: int, slow_latency: float, slow_failure_rate: float):
+    with StubRpcServer(latency=slow_latency, failure_rate=slow_failure_rate) as slow, \
+            StubRpcServer(latency=0.02) as fast, \
+            StubRpcServer(latency=0.0, failure_rate=1.0) as down:
+        urls = [slow.url, fast.url, down.url]
+
+        web3 = AsyncWeb3(AsyncHTTPProvider(urls[0]))
+        report("first-url", *await run(
+            lambda: web3.eth.get_transaction_count(ADDRESS), count, concurrency))
+        await web3.provider.disconnect()
+
+        pool = ProviderPool(1, urls, {"rpc_probe_interval": 1, "rpc_eject_seconds": 5})
+        await pool.probe()
+        report("pool", *await run(
+            lambda: pool.call(lambda w3: w3.eth.get_transaction_count(ADDRESS)),
+            count, concurrency))
+        for endpoint in pool.state()["endpoints"]:
+            print(f"           {endpoint}")
+        await pool.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-n", "--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--slow-latency", type=float, default=0.2,
+                        help="latency of the first url in seconds")
+    parser.add_argument("--slow-failure-rate", type=float, default=0.2,
+                        help="share of failed calls on the first url")
+    args = parser.parse_args()
+    # failover warnings would drown the report
+    logging.basicConfig(level=logging.ERROR)
+    asyncio.run(main(args.requests, args.concurrency, args.slow_latency,
+                     args.slow_failure_rate))
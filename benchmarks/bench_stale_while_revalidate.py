@@ -0,0 +1,103 @@
+"""
+Benchmark: expiring cache entries with and without stale-while-revalidate
+
+A dashboard refreshes 10 token balances every 100ms for `--duration`
+seconds against a local stub Etherscan server with `--latency` seconds of
+upstream latency and a 5 calls/s rate limit; the balances are cached for
+`--ttl` seconds. Reports lookup latency percentiles of the warm dashboard
+and upstream calls for:
+
+- expire: an expired entry is a miss, the next lookup waits for Etherscan
+- stale:  an expired entry is served stale for up to `--stale` seconds
+          while one background refresh replaces it
+
+The Redis tier is replaced by an in-memory cache with the same expiry rules.
+
+$ python benchmarks/bench_stale_while_revalidate.py --duration 10 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.stub_servers import StubEtherscanServer, percentile  # noqa: E402
+from web3gateway.gateway_etherscanv2 import EtherScanV2  # noqa: E402
+
+
+TOKENS = [f"0x{i:040x}" for i in range(10)]
+HOLDER = "0x" + "ab" * 20
+REFRESH_INTERVAL = 0.1
+
+
+class MemoryCache:
+    """ in-memory cache keeping entries for their stale window past expiry """
+
+    def __init__(self):
+        self.data = {}
+
+    def get_local(self, key):
+        return None
+
+    async def get_remote_with_ttl(self, key, stale=0, raw=False):
+        value, expires_at = self.data.get(key, (None, 0))
+        remaining = expires_at - time.monotonic()
+        if value is None or remaining <= 0:
+            return None, None
+        return value, remaining - stale
+
+    async def set(self, key, value, expire=0, stale=0):
+        self.data[key] = (value, time.monotonic() + (expire + stale if expire else 3600))
+        return True
+
+    async def close(self):
+        pass
+
+
+async def lookup(gateway: EtherScanV2, token: str, latencies: list[float]) -> None:
+    """ one timed token balance lookup """
+    start = time.perf_counter()
+    await gateway.for_chain(1).tokens.tokenbalance(token, HOLDER)
+    latencies.append(time.perf_counter() - start)
+
+
+async def main(duration: float, latency: float, ttl: int, stale: int) -> None:
+    for name, window in (("expire", 0), ("stale", stale)):
+        with StubEtherscanServer(latency=latency) as stub:
+            gateway = EtherScanV2({
+                "redis_url": "redis://localhost:6379",
+                "etherscan_api_key": "bench",
+                "etherscan_chainlist_url": stub.chainlist_url,
+                "rate_limit_calls": 5,
+                "rate_limit_period": 1,
+                "cache_expiration": ttl,
+                "cache_action_expiration": {"tokenbalance": ttl},
+                "cache_stale_window": window,
+            })
+            gateway.cache = MemoryCache()
+            # fill the cache first: cold misses wait for the rate limiter either way
+            await asyncio.gather(*(lookup(gateway, token, []) for token in TOKENS))
+            latencies: list[float] = []
+            deadline = time.monotonic() + duration
+            while time.monotonic() < deadline:
+                await asyncio.gather(*(lookup(gateway, token, latencies) for token in TOKENS))
+                await asyncio.sleep(REFRESH_INTERVAL)
+            ms = sorted(latency * 1000 for latency in latencies)
+            print(f"{name:>6}: p50 {percentile(ms, 50):7.2f}ms, p99 {percentile(ms, 99):7.2f}ms, "
+                  f"max {ms[-1]:7.2f}ms, {stub.calls} upstream calls for {len(ms)} lookups")
+            await gateway.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--duration", type=float, default=10, help="seconds per scenario")
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="stub upstream latency in seconds")
+    parser.add_argument("--ttl", type=int, default=2, help="balance cache expiration")
+    parser.add_argument("--stale", type=int, default=10, help="stale window in seconds")
+    args = parser.parse_args()
+    asyncio.run(main(args.duration, args.latency, args.ttl, args.stale))
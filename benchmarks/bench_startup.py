@@ -0,0 +1,120 @@
+"""
+Benchmark: gateway startup with and without saved chain lists
+
+Starts fresh worker processes that import the gateways, construct
+`EtherScanV2` and `Blockchain` and serve a first lookup of chain 1 (the
+Etherscan chain view and the RPC provider pool), and reports the time of
+each step for:
+
+- cold:    empty data folder, both chain lists are downloaded (every start
+           before the lists were saved on disk)
+- warm:    chain lists read from the data folder, no download
+- offline: chain lists read from the data folder, list urls unreachable
+  ("offline, cold" has no saved lists and is expected to fail)
+
+The chain lists are served by the local stub server with an injected
+latency; workers run in temporary working directories, so their data
+folders are isolated from the repository's.
+
+$ python benchmarks/bench_startup.py --list-latency 0.3 -n 5
+"""
+
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def child(chainlist_url: str, chains_json_url: str) -> None:
+    """ one worker start, timings printed as JSON """
+    start = time.perf_counter()
+    from web3gateway.gateway_blockchain import Blockchain
+    from web3gateway.gateway_etherscanv2 import EtherScanV2
+    imported = time.perf_counter()
+
+    config = {"redis_url": "redis://localhost:6379", "etherscan_api_key": "bench",
+              "etherscan_chainlist_url": chainlist_url, "chains_json_url": chains_json_url,
+              "infura_project_id": "", "rate_limit_calls": 5, "rate_limit_period": 1,
+              "cache_expiration": 10, "rpc_probe_interval": 0}
+    gw_etherscan = EtherScanV2(config)
+    gw_blockchain = Blockchain(config)
+    constructed = time.perf_counter()
+
+    async def first_request() -> None:
+        gw_etherscan.for_chain(1)
+        gw_blockchain._get_provider_pool(1)
+        await gw_blockchain.close()
+
+    asyncio.run(first_request())
+    served = time.perf_counter()
+    print(json.dumps({"import": imported - start, "init": constructed - imported,
+                      "first": served - constructed}))
+
+
+def start_worker(cwd: Path, chainlist_url: str, chains_json_url: str) -> dict:
+    """ run one worker process, returning its timings or the error """
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, str(Path(__file__).resolve()), "--child",
+         "--chainlist-url", chainlist_url, "--chains-json-url", chains_json_url],
+        cwd=cwd, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        return {"error": proc.stderr.strip().splitlines()[-1], "wall": wall}
+    return {**json.loads(proc.stdout.strip().splitlines()[-1]), "wall": wall}
+
+
+def report(name: str, runs: list[dict]) -> None:
+    """ print the mean timings of a scenario """
+    failed = [run for run in runs if "error" in run]
+    if failed:
+        print(f"{name:>13}: failed ({failed[0]['error']})")
+        return
+    mean = {key: sum(run[key] for run in runs) / len(runs) * 1000 for key in runs[0]}
+    print(f"{name:>13}: import {mean['import']:7.1f}ms, init {mean['init']:6.1f}ms, "
+          f"first lookup {mean['first']:7.1f}ms, process {mean['wall']:7.1f}ms")
+
+
+def main(count: int, list_latency: float) -> None:
+    from benchmarks.stub_servers import StubEtherscanServer
+
+    with tempfile.TemporaryDirectory() as tmp:
+        saved = Path(tmp, "saved")
+        saved.mkdir()
+
+        def fresh_dir(name: str, i: int) -> Path:
+            path = Path(tmp, f"{name}-{i}")
+            path.mkdir()
+            return path
+
+        with StubEtherscanServer(list_latency=list_latency) as stub:
+            urls = (stub.chainlist_url, stub.chains_json_url)
+            start_worker(saved, *urls)  # fill the data folder
+            report("cold", [start_worker(fresh_dir("cold", i), *urls) for i in range(count)])
+            report("warm", [start_worker(saved, *urls) for _ in range(count)])
+        # the stub is stopped: the same urls are now refused
+        report("offline", [start_worker(saved, *urls) for _ in range(count)])
+        report("offline, cold", [start_worker(fresh_dir("offline", i), *urls)
+                                 for i in range(count)])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-n", "--starts", type=int, default=5, help="worker starts per scenario")
+    parser.add_argument("--list-latency", type=float, default=0.3,
+                        help="stub chain list download time in seconds")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--chainlist-url", help=argparse.SUPPRESS)
+    parser.add_argument("--chains-json-url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.chainlist_url, args.chains_json_url)
+    else:
+        main(args.starts, args.list_latency)
@@ -0,0 +1,254 @@
+"""
+Local stub servers used by the benchmarks.
+
+The stub Etherscan server answers `/v2/chainlist`, `/v2/api` and a
+chainid.network style `/chains.json` with canned payloads after an injected
+latency, and the stub RPC server answers JSON-RPC
+calls with injected latency and failures, so benchmarks measure the gateway
+and not the public internet.
+"""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+from web3gateway.gateway_blockchain import Blockchain
+from web3gateway.utils.chains_json import Chains
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+class StubEtherscanServer:
+    """
+    Minimal Etherscan V2 look-alike running in a background thread.
+
+    Attributes:
+        latency (float): Seconds slept before every `/v2/api` response
+        list_latency (float): Seconds slept before every chain list response
+        calls (int): Number of `/v2/api` requests served
+        list_calls (int): Number of chain list requests served
+
+    Example:
+        with StubEtherscanServer(latency=0.05) as stub:
+            config = {..., "etherscan_chainlist_url": stub.chainlist_url}
+    """
+
+    # ETag of the (never changing) chain lists
+    LIST_ETAG = '"stub-v1"'
+
+    def __init__(self, latency: float = 0.05, chain_id: int = 1, list_latency: float = 0.0):
+        self.latency = latency
+        self.list_latency = list_latency
+        self.chain_id = chain_id
+        self.calls = 0
+        self.list_calls = 0
+        self._lock = threading.Lock()
+        self._server = _Server(("127.0.0.1", 0), self._make_handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def chainlist_url(self) -> str:
+        return f"{self.base_url}/v2/chainlist"
+
+    @property
+    def chains_json_url(self) -> str:
+        return f"{self.base_url}/chains.json"
+
+    def chain_list(self, path: str) -> Any:
+        """ canned Etherscan chainlist or chainid.network chains.json """
+        if path == "/chains.json":
+            return [{"name": "Stub Mainnet", "shortName": "stub", "chainId": self.chain_id,
+                     "rpc": [f"{self.base_url}/rpc"],
+                     "nativeCurrency": {"name": "Ether", "symbol": "ETH", "decimals": 18}}]
+        return {"totalcount": 1, "result": [{
+            "chainname": "Stub Mainnet",
+            "chainid": str(self.chain_id),
+            "blockexplorer": self.base_url,
+            "apiurl": f"{self.base_url}/v2/api?chainid={self.chain_id}",
+            "status": 1}]}
+
+    def result_for(self, params: dict[str, str]) -> Any:
+        """ canned `result` for an api call """
+        action = params.get("action", "")
+        if action == "balancemulti":
+            return [{"account": a, "balance": "1000000000000000000"}
+                    for a in params.get("address", "").split(",")]
+        if action in ("balance", "tokenbalance"):
+            return "1000000000000000000"
+        if action == "eth_blockNumber":
+            return hex(int(time.time()) // 12)
+        if action == "eth_getTransactionReceipt":
+            return {"transactionHash": params.get("txhash"), "blockNumber": hex(1000),
+                    "status": "0x1"}
+        return []
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):  # noqa: N802
+                parts = urlsplit(self.path)
+                params = {k: v[0] for k, v in parse_qs(parts.query).items()}
+                if parts.path in ("/v2/chainlist", "/chains.json"):
+                    with stub._lock:
+                        stub.list_calls += 1
+                    time.sleep(stub.list_latency)
+                    if self.headers.get("If-None-Match") == stub.LIST_ETAG:
+                        self.send_response(304)
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+                    body = stub.chain_list(parts.path)
+                else:
+                    with stub._lock:
+                        stub.calls += 1
+                    time.sleep(stub.latency)
+                    if params.get("module") == "proxy":
+                        body = {"jsonrpc": "2.0", "id": 1, "result": stub.result_for(params)}
+                    else:
+                        body = {"status": "1", "message": "OK",
+                                "result": stub.result_for(params)}
+                payload = json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.send_header("ETag", stub.LIST_ETAG)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):  # noqa: A002
+                pass
+
+        return Handler
+
+    def __enter__(self) -> "StubEtherscanServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class StubRpcServer:
+    """
+    Minimal JSON-RPC node look-alike running in a background thread.
+
+    Attributes:
+        latency (float): Seconds slept before every response
+        failure_rate (float): Share of calls answered with HTTP 503
+        block_number (int): Block number reported by the node
+        calls (int): Number of JSON-RPC requests served
+
+    Example:
+        with StubRpcServer(latency=0.02, failure_rate=0.1) as rpc:
+            web3 = AsyncWeb3(AsyncHTTPProvider(rpc.url))
+    """
+
+    def __init__(self, latency: float = 0.02, failure_rate: float = 0.0,
+                 block_number: int = 1000, chain_id: int = 1):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.block_number = block_number
+        self.chain_id = chain_id
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._random = random.Random(0)
+        self._server = _Server(("127.0.0.1", 0), self._make_handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def result_for(self, method: str, params: list) -> Any:
+        """ canned `result` for a JSON-RPC method """
+        if method == "eth_blockNumber":
+            return hex(self.block_number)
+        if method == "eth_getBlockByNumber":
+            return {"number": hex(self.block_number), "hash": "0x" + "11" * 32,
+                    "parentHash": "0x" + "22" * 32, "timestamp": hex(int(time.time())),
+                    "baseFeePerGas": hex(10 ** 9), "gasLimit": hex(30_000_000),
+                    "gasUsed": hex(15_000_000), "transactions": []}
+        if method == "eth_feeHistory":
+            block_count, percentiles = int(params[0], 16), params[2]
+            return {"oldestBlock": hex(self.block_number - block_count + 1),
+                    "baseFeePerGas": [hex(10 ** 9)] * (block_count + 1),
+                    "gasUsedRatio": [0.5] * block_count,
+                    "reward": [[hex(int(p * 10 ** 7)) for p in percentiles]] * block_count}
+        if method == "eth_chainId":
+            return hex(self.chain_id)
+        if method in ("eth_getTransactionCount", "eth_estimateGas", "eth_gasPrice",
+                      "eth_maxPriorityFeePerGas"):
+            return hex(21000)
+        return None
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):  # noqa: N802
+                request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with stub._lock:
+                    stub.calls += 1
+                    failed = stub._random.random() < stub.failure_rate
+                time.sleep(stub.latency)
+                if failed:
+                    status, payload = 503, b"Service Unavailable"
+                else:
+                    status = 200
+                    result = stub.result_for(request["method"], request.get("params", []))
+                    payload = json.dumps({"jsonrpc": "2.0", "id": request["id"],
+                                          "result": result}).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):  # noqa: A002
+                pass
+
+        return Handler
+
+    def __enter__(self) -> "StubRpcServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def make_blockchain(rpc_urls: list[str], config: dict[str, Any] = None,
+                    chain_id: int = 1) -> Blockchain:
+    """ Blockchain gateway whose only chain is served by the given rpc urls """
+    gateway = Blockchain({"infura_project_id": "", **(config or {})})
+    gateway.chains = Chains("", chains_json=[{"chainId": chain_id, "rpc": rpc_urls}])
+    return gateway
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """ nearest-rank percentile of a list of samples """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
@@ -0,0 +1,88 @@
+import asyncio
+import time
+
+import pytest
+
+from web3gateway.gateway_blockchain import Blockchain
+from web3gateway.utils.chains_json import Chains
+
+
+FROM_ADDRESS = "0x32f7CB25353F1Acae03ADe9Ca8e91ECAd57Fd7B0"
+TO_ADDRESS = "0x742d35Cc6634C0532925a3b844Bc454e4438f44e"
+
+
+@pytest.fixture
+def blockchain(mocker):
+    """ Blockchain gateway with slow fake RPC lookups """
+    mocker.patch.object(Chains, "update_chains_json")
+    mocker.patch.object(Chains, "load_chains_json_file", return_value=True)
+    gateway = Blockchain({"infura_project_id": ""})
+
+    async def get_nonce(chain_id, address):
+        await asyncio.sleep(0.05)
+        return 7
+
+    async def estimate_gas(chain_id, tx_params):
+        assert "nonce" not in tx_params
+        await asyncio.sleep(0.05)
+        return 21000
+
+    async def get_gas_price(chain_id, gas_level):
+        await asyncio.sleep(0.05)
+        return {"maxPriorityFeePerGas": 1, "maxFeePerGas": 2}
+
+    gateway.get_nonce = get_nonce
+    gateway.estimate_gas = estimate_gas
+    gateway.get_gas_price = get_gas_price
+    return gateway
+
+
+@pytest.mark.asyncio
+async def test_assembly_lookups_run_concurrently(blockchain):
+    start = time.perf_counter()
+    tx = await blockchain.assemble_unsigned_transaction(1, FROM_ADDRESS, TO_ADDRESS, 5, "0x")
+    assert time.perf_counter() - start < 0.1
+    assert tx == {"from": FROM_ADDRESS, "to": TO_ADDRESS, "value": 5, "nonce": 7,
+                  "chainId": 1, "data": "0x", "gas": 21000,
+                  "maxPriorityFeePerGas": 1, "maxFeePerGas": 2}
+    stages = blockchain.metrics.snapshot()["stages"]
+    assert {"assemble", "assemble.nonce", "assemble.estimate_gas",
+            "assemble.gas_price"} <= set(stages)
+
+
+@pytest.mark.asyncio
+async def test_batch_assembly_assigns_consecutive_nonces(blockchain):
+    estimated = []
+    gas_price_calls = []
+
+    async def estimate_gas(chain_id, tx_params):
+        estimated.append(tx_params)
+        await asyncio.sleep(0.05)
+        if tx_params.get("data") == "0xbad":
+            raise ValueError("execution reverted")
+        return 21000
+
+    async def get_gas_price(chain_id, gas_level):
+        gas_price_calls.append(gas_level)
+        return {"gasPrice": 3}
+
+    async def get_pending_nonce(chain_id, address):
+        return 40
+
+    blockchain.estimate_gas = estimate_gas
+    blockchain.get_gas_price = get_gas_price
+    blockchain.get_pending_nonce = get_pending_nonce
+    transactions = [{"to": TO_ADDRESS, "value": 1}] * 50
+    transactions.insert(1, {"to": TO_ADDRESS, "value": 1, "data": "0xbad"})
+
+    start = time.perf_counter()
+    results = await blockchain.assemble_unsigned_transactions(1, FROM_ADDRESS, transactions)
+    assert time.perf_counter() - start < 0.2
+    # identical calls are estimated once, fees are fetched once
+    assert len(estimated) == 2
+    assert gas_price_calls == ["normal"]
+    assert isinstance(results[1], ValueError)
+    assembled = [tx for tx in results if not isinstance(tx, Exception)]
+    assert [tx["nonce"] for tx in assembled] == list(range(40, 90))
+    assert assembled[0] == {"from": FROM_ADDRESS, "to": TO_ADDRESS, "value": 1, "nonce": 40,
+                            "chainId": 1, "gas": 21000, "gasPrice": 3}
@@ -0,0 +1,131 @@
+import asyncio
+
+import pytest
+
+from web3gateway.gateway_blockchain.fee_tracker import FeeTracker
+
+
+PERCENTILES = [10.0, 50.0, 90.0]
+
+
+class FakeChain:
+    """ fee history of a chain whose block n pays n * percentile in rewards """
+
+    def __init__(self, head, base_fees=True):
+        self.head = head
+        self.base_fees = base_fees
+        self.rewards = True
+        self.requested = []
+
+    async def fee_history(self, count, block, percentiles):
+        self.requested.append(count)
+        oldest = self.head - count + 1
+        numbers = range(oldest, self.head + 1)
+        return {"oldestBlock": oldest,
+                "baseFeePerGas": [n * 100 if self.base_fees else 0
+                                  for n in range(oldest, self.head + 2)],
+                "gasUsedRatio": [0.5] * count,
+                "reward": [[int(n * p) for p in percentiles] for n in numbers]
+                if self.rewards else []}
+
+
+class FakePool:
+    """ provider pool handing out a fake web3 """
+
+    def __init__(self, chain):
+        self.eth = chain
+
+    async def call(self, fn, failover=True):
+        return await fn(self)
+
+
+def make_tracker(chain, **config):
+    return FeeTracker(1, FakePool(chain), PERCENTILES,
+                      {"fee_history_blocks": 10, "fee_estimate_blocks": 2, **config})
+
+
+@pytest.mark.asyncio
+async def test_refresh_fills_buffer_and_estimates_from_memory():
+    chain = FakeChain(head=100)
+    tracker = make_tracker(chain)
+    assert not tracker.ready()
+    await tracker.refresh()
+    assert tracker.ready()
+    assert [b.number for b in tracker.blocks] == list(range(91, 101))
+    assert tracker.next_base_fee == 101 * 100
+    # blocks 99 and 100 at the 10th and 50th percentiles
+    reward = (990 + 4950 + 1000 + 5000) // 4
+    assert tracker.estimate([10.0, 50.0]) == {"maxPriorityFeePerGas": reward,
+                                              "maxFeePerGas": reward + 101 * 100 * 2}
+    with pytest.raises(KeyError):
+        tracker.estimate([20.0])
+
+
+@pytest.mark.asyncio
+async def test_polls_append_new_blocks_and_refetch_after_gap():
+    chain = FakeChain(head=100)
+    tracker = make_tracker(chain)
+    await tracker.refresh()
+    chain.head = 102
+    await tracker.refresh()
+    assert [b.number for b in tracker.blocks] == list(range(93, 103))
+    assert chain.requested == [10, 4]
+
+    chain.head = 120
+    await tracker.refresh()
+    assert [b.number for b in tracker.blocks] == list(range(111, 121))
+    assert chain.requested == [10, 4, 4, 10]
+
+
+@pytest.mark.asyncio
+async def test_chain_without_base_fee_is_not_tracked():
+    tracker = make_tracker(FakeChain(head=100, base_fees=False))
+    await tracker.refresh()
+    assert not tracker.supported
+    assert not tracker.ready()
+    assert not tracker.due()
+
+    # probed again after the back-off
+    tracker.recheck_at = 0.0
+    tracker.pool.eth.base_fees = True
+    assert tracker.due()
+    await tracker.refresh()
+    assert tracker.supported and tracker.ready()
+
+
+@pytest.mark.asyncio
+async def test_empty_rewards_only_fail_one_poll():
+    chain = FakeChain(head=100)
+    tracker = make_tracker(chain)
+    await tracker.refresh()
+    # a lagging node answers without rewards
+    chain.rewards = False
+    chain.head = 101
+    with pytest.raises(ValueError):
+        await tracker.refresh()
+    assert tracker.supported and tracker.ready()
+    assert tracker.blocks[-1].number == 100
+
+    chain.rewards = True
+    await tracker.refresh()
+    assert tracker.blocks[-1].number == 101
+
+
+@pytest.mark.asyncio
+async def test_polling_stops_when_idle():
+    chain = FakeChain(head=100)
+    tracker = make_tracker(chain, fee_poll_interval=0.01, fee_idle_timeout=0.05)
+    tracker.start()
+    await asyncio.sleep(0.03)
+    assert chain.requested
+    await asyncio.sleep(0.1)
+    assert tracker._poller.done()
+    polls = len(chain.requested)
+    await asyncio.sleep(0.05)
+    assert len(chain.requested) == polls
+
+    # the next use resumes polling
+    tracker.start()
+    await asyncio.sleep(0.03)
+    assert len(chain.requested) > polls
+    await tracker.close()
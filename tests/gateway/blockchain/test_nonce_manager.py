@@ -0,0 +1,138 @@
+import pytest
+from eth_account import Account
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from web3gateway.gateway_blockchain import Blockchain
+from web3gateway.gateway_blockchain.nonce_manager import (
+    NonceManager,
+    transaction_sender_and_nonce,
+)
+from web3gateway.utils.chains_json import Chains
+
+
+FROM_ADDRESS = "0x32f7CB25353F1Acae03ADe9Ca8e91ECAd57Fd7B0"
+TO_ADDRESS = "0x742d35Cc6634C0532925a3b844Bc454e4438f44e"
+
+
+class FakeNonceManager:
+    """ in-memory stand-in for NonceManager """
+
+    def __init__(self, available=True):
+        self.available = available
+        self.next = 10
+        self.released = []
+
+    async def reserve(self, chain_id, address):
+        if not self.available:
+            raise RedisConnectionError("redis down")
+        self.next += 1
+        return self.next - 1
+
+    async def release(self, chain_id, address, nonce):
+        self.released.append(nonce)
+        return True
+
+
+@pytest.fixture
+def blockchain(mocker):
+    """ Blockchain gateway with a fake nonce manager and fake RPC lookups """
+    mocker.patch.object(Chains, "update_chains_json")
+    mocker.patch.object(Chains, "load_chains_json_file", return_value=True)
+    gateway = Blockchain({"infura_project_id": ""})
+    gateway.nonce_manager = FakeNonceManager()
+
+    async def get_pending_nonce(chain_id, address):
+        return 3
+
+    async def get_gas_price(chain_id, gas_level):
+        return {"gasPrice": 1}
+
+    gateway.get_pending_nonce = get_pending_nonce
+    gateway.get_gas_price = get_gas_price
+    return gateway
+
+
+@pytest.mark.parametrize("fees", [
+    {"maxFeePerGas": 2, "maxPriorityFeePerGas": 1},
+    {"gasPrice": 2},
+])
+def test_transaction_sender_and_nonce(fees):
+    account = Account.create()
+    signed = account.sign_transaction({"to": TO_ADDRESS, "value": 0, "gas": 21000,
+                                       "nonce": 300, "chainId": 1, **fees})
+    assert transaction_sender_and_nonce(signed.raw_transaction.hex()) == (account.address, 300)
+
+
+def test_transaction_sender_and_nonce_invalid():
+    with pytest.raises(ValueError):
+        transaction_sender_and_nonce("0x1234")
+
+
+@pytest.mark.asyncio
+async def test_nonces_are_reserved_and_released_on_failure(blockchain):
+    async def estimate_gas(chain_id, tx_params):
+        return 21000
+
+    blockchain.estimate_gas = estimate_gas
+    first = await blockchain.assemble_unsigned_transaction(1, FROM_ADDRESS, TO_ADDRESS, 0, "")
+    second = await blockchain.assemble_unsigned_transaction(1, FROM_ADDRESS, TO_ADDRESS, 0, "")
+    assert (first["nonce"], second["nonce"]) == (10, 11)
+
+    async def failing_estimate_gas(chain_id, tx_params):
+        raise ValueError("execution reverted")
+
+    blockchain.estimate_gas = failing_estimate_gas
+    with pytest.raises(ValueError):
+        await blockchain.assemble_unsigned_transaction(1, FROM_ADDRESS, TO_ADDRESS, 0, "")
+    assert blockchain.nonce_manager.released == [12]
+
+
+@pytest.mark.asyncio
+async def test_pending_count_is_used_when_redis_is_down(blockchain):
+    blockchain.nonce_manager.available = False
+    assert await blockchain.get_nonce(1, FROM_ADDRESS) == 3
+
+
+async def make_nonce_manager(pending, **config):
+    """ NonceManager on an in-memory Redis, syncing from a fixed pending count """
+    fakeredis = pytest.importorskip("fakeredis")
+
+    async def fetch_pending(chain_id, address):
+        return pending
+
+    redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    return NonceManager(redis, fetch_pending, {"nonce_repair_interval": 0, **config})
+
+
+async def age_state(nonces, seconds):
+    """ move every reservation and send of FROM_ADDRESS `seconds` into the past """
+    now = int((await nonces.redis.time())[0])
+    for key in NonceManager._keys(1, FROM_ADDRESS)[1:3]:
+        for member in await nonces.redis.zrange(key, 0, -1):
+            await nonces.redis.zadd(key, {member: now - seconds})
+
+
+@pytest.mark.asyncio
+async def test_unseen_nonces_are_not_handed_out_again():
+    nonces = await make_nonce_manager(pending=5)
+    # 5 is signed and broadcast by the client, 6 is sent through the gateway;
+    # the node has seen neither for an hour
+    assert await nonces.reserve(1, FROM_ADDRESS) == 5
+    assert await nonces.reserve(1, FROM_ADDRESS) == 6
+    assert await nonces.confirm(1, FROM_ADDRESS, 6)
+    await age_state(nonces, 3600)
+    assert await nonces.repair(1, FROM_ADDRESS) == 0
+    assert await nonces.reserve(1, FROM_ADDRESS) == 7
+    await nonces.close()
+
+
+@pytest.mark.asyncio
+async def test_opt_in_timeout_reuses_stale_nonces():
+    nonces = await make_nonce_manager(pending=5, nonce_reservation_timeout=120)
+    assert await nonces.reserve(1, FROM_ADDRESS) == 5
+    await age_state(nonces, 60)
+    assert await nonces.repair(1, FROM_ADDRESS) == 0
+    await age_state(nonces, 600)
+    assert await nonces.repair(1, FROM_ADDRESS) == 1
+    assert await nonces.reserve(1, FROM_ADDRESS) == 5
+    await nonces.close()
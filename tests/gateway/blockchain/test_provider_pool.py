@@ -0,0 +1,132 @@
+import aiohttp
+import pytest
+from web3.exceptions import ContractLogicError, RequestTimedOut, Web3ValidationError
+
+from web3gateway.gateway_blockchain.provider_pool import (
+    ProviderPool,
+    is_provider_error,
+    usable_rpc_urls,
+)
+
+
+URLS = ["http://rpc-a", "http://rpc-b", "http://rpc-c"]
+CONFIG = {"rpc_probe_interval": 0, "rpc_eject_after_failures": 2, "rpc_eject_seconds": 30}
+
+
+def make_call(failing=(), calls=None, error=ConnectionError):
+    """ fake rpc call failing on some urls and recording the urls tried """
+    async def call(web3):
+        url = web3.provider.endpoint_uri
+        if calls is not None:
+            calls.append(url)
+        if url in failing:
+            raise error(f"{url} failed")
+        return url
+    return call
+
+
+def test_usable_rpc_urls():
+    assert usable_rpc_urls([
+        "https://rpc-a", "wss://rpc-b", "https://rpc-c/${ALCHEMY_API_KEY}", "https://rpc-a",
+    ]) == ["https://rpc-a"]
+
+
+def test_no_usable_rpc_url():
+    with pytest.raises(ValueError):
+        ProviderPool(1, ["wss://rpc-a"], CONFIG)
+
+
+@pytest.mark.asyncio
+async def test_calls_go_to_the_fastest_endpoint():
+    pool = ProviderPool(1, URLS, CONFIG)
+    for endpoint, latency in zip(pool.endpoints, (0.3, 0.05, 0.1), strict=True):
+        endpoint.record_success(latency)
+    assert await pool.call(make_call()) == "http://rpc-b"
+
+
+@pytest.mark.asyncio
+async def test_provider_errors_fail_over_and_eject():
+    pool = ProviderPool(1, URLS, CONFIG)
+    calls = []
+    for _ in range(2):
+        assert await pool.call(make_call({"http://rpc-a"}, calls)) != "http://rpc-a"
+    assert pool.failovers == 2
+    assert pool.endpoints[0].ejected()
+    # the ejected endpoint is no longer tried first
+    calls.clear()
+    await pool.call(make_call({"http://rpc-a"}, calls))
+    assert calls[0] != "http://rpc-a"
+    assert pool.state()["endpoints"][-1]["url"] == "http://rpc-a"
+
+
+@pytest.mark.asyncio
+async def test_request_errors_are_not_failed_over():
+    pool = ProviderPool(1, URLS, CONFIG)
+    calls = []
+    with pytest.raises(ContractLogicError):
+        await pool.call(make_call(set(URLS), calls, ContractLogicError))
+    assert len(calls) == 1
+    assert pool.failovers == 0
+
+
+def http_error(status):
+    return aiohttp.ClientResponseError(None, (), status=status)
+
+
+@pytest.mark.parametrize("error,expected", [
+    (ConnectionError("refused"), True),
+    (RequestTimedOut("timed out"), True),
+    (http_error(429), True),
+    (http_error(503), True),
+    (http_error(400), False),
+    (ContractLogicError("execution reverted"), False),
+    (Web3ValidationError("bad argument"), False),
+    (ValueError("invalid address"), False),
+])
+def test_is_provider_error(error, expected):
+    assert is_provider_error(error) is expected
+
+
+@pytest.mark.asyncio
+async def test_malformed_requests_do_not_eject_endpoints():
+    pool = ProviderPool(1, URLS, CONFIG)
+    for _ in range(3):
+        with pytest.raises(Web3ValidationError):
+            await pool.call(make_call(set(URLS), error=Web3ValidationError))
+    assert pool.failovers == 0
+    assert not any(endpoint.ejected() for endpoint in pool.endpoints)
+
+
+@pytest.mark.asyncio
+async def test_ejected_endpoint_is_readmitted_after_backoff():
+    pool = ProviderPool(1, URLS, CONFIG)
+    endpoint = pool.endpoints[0]
+    for _ in range(2):
+        await pool.call(make_call({"http://rpc-a"}))
+    assert endpoint.ejected()
+
+    # backoff elapsed: one more failure ejects it again, for twice as long
+    endpoint.ejected_until = 0.0
+    await pool.call(make_call({"http://rpc-a"}))
+    assert endpoint.ejected() and endpoint.ejections == 2
+
+    # backoff elapsed and the endpoint answers: back in rotation
+    endpoint.ejected_until = 0.0
+    endpoint.latency = 0.0
+    assert await pool.call(make_call()) == "http://rpc-a"
+    assert endpoint.ejections == 0
+
+
+@pytest.mark.asyncio
+async def test_all_failing_raises_last_error():
+    pool = ProviderPool(1, URLS, CONFIG)
+    with pytest.raises(ConnectionError):
+        await pool.call(make_call(set(URLS)))
+
+
+@pytest.mark.asyncio
+async def test_no_endpoint_to_call():
+    pool = ProviderPool(1, URLS, CONFIG)
+    pool.endpoints = []
+    with pytest.raises(ValueError):
+        await pool.call(make_call())
@@ -0,0 +1,376 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from web3gateway.gateway_etherscanv2 import EtherScanV2
+
+
+SUPPORTED_CHAINS = [
+    {"chainname": "Ethereum Mainnet", "chainid": "1",
+     "apiurl": "https://api.etherscan.io/v2/api?chainid=1"},
+    {"chainname": "Base Mainnet", "chainid": "8453",
+     "apiurl": "https://api.etherscan.io/v2/api?chainid=8453"},
+]
+
+CONFIG = {
+    "redis_url": "redis://localhost:6379",
+    "etherscan_api_key": "test",
+    "rate_limit_calls": 1000,
+    "rate_limit_period": 1,
+    "cache_expiration": 10,
+}
+
+
+class FakeCache:
+    """ in-memory stand-in for CacheService """
+
+    def __init__(self):
+        self.data = {}
+
+    def get_local(self, key):
+        return None
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def get_remote_with_ttl(self, key, stale=0, raw=False):
+        value = self.data.get(key)
+        if raw and value is not None:
+            value = json.dumps(value).encode()
+        return value, None
+
+    async def get_remote_many_with_ttl(self, keys, stale=0):
+        return [await self.get_remote_with_ttl(key, stale) for key in keys]
+
+    async def set(self, key, value, expire=0, stale=0):
+        self.data[key] = value
+        return True
+
+
+@pytest.fixture
+def etherscan(mocker):
+    """ EtherScanV2 with a fixed chainlist and a fake upstream """
+    def load_supported_chains(self):
+        self._supported_chains = SUPPORTED_CHAINS
+        return True
+
+    mocker.patch.object(EtherScanV2, "load_supported_chains", load_supported_chains)
+    instance = EtherScanV2(dict(CONFIG))
+    instance.cache = FakeCache()
+    instance.upstream_urls = []
+
+    async def fake_get(url, **kwargs):
+        instance.upstream_urls.append(url)
+        # let other requests interleave while this one is in flight
+        await asyncio.sleep(0.01)
+        chain_id = url.split("chainid=")[1].split("&")[0]
+        body = {"status": "1", "message": "OK", "result": f"balance-on-{chain_id}"}
+        return httpx.Response(200, content=json.dumps(body))
+
+    instance.http.get = fake_get
+    return instance
+
+
+def test_for_chain_returns_cached_view(etherscan):
+    view = etherscan.for_chain(8453)
+    assert view is etherscan.for_chain(8453)
+    assert view.chain_id == 8453
+    assert view.chain_name == "Base Mainnet"
+    assert etherscan.chain_id == 0
+
+
+def test_for_chain_unsupported(etherscan):
+    with pytest.raises(ValueError):
+        etherscan.for_chain(999999)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_chains_do_not_interfere(etherscan):
+    address = "0x742d35Cc6634C0532925a3b844Bc454e4438f44e"
+    mainnet, base = await asyncio.gather(
+        etherscan.for_chain(1).account.balance(address),
+        etherscan.for_chain(8453).account.balance(address))
+    assert mainnet == "balance-on-1"
+    assert base == "balance-on-8453"
+    assert any(key.startswith("etherscanv2:1:") for key in etherscan.cache.data)
+    assert any(key.startswith("etherscanv2:8453:") for key in etherscan.cache.data)
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_skips_rate_limiter(etherscan, mocker):
+    acquire = mocker.spy(etherscan.key_pool, "acquire")
+    address = "0x742d35Cc6634C0532925a3b844Bc454e4438f44e"
+    await etherscan.for_chain(1).account.balance(address)
+    await etherscan.for_chain(1).account.balance(address)
+    assert acquire.call_count == 1
+    assert len(etherscan.upstream_urls) == 1
+
+    snapshot = etherscan.metrics.snapshot()
+    assert snapshot["counters"]["cache_hit"] == 1
+    assert snapshot["counters"]["cache_miss"] == 1
+    for stage in ("key_build", "local_cache", "redis", "rate_limit", "upstream", "cache_store"):
+        assert stage in snapshot["stages"]
+    assert snapshot["stages"]["redis"]["count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_upstream_call(etherscan):
+    address = "0x742d35Cc6634C0532925a3b844Bc454e4438f44e"
+    chain = etherscan.for_chain(1)
+    results = await asyncio.gather(*(chain.account.balance(address) for _ in range(20)))
+    assert results == ["balance-on-1"] * 20
+    assert len(etherscan.upstream_urls) == 1
+    assert etherscan.metrics.snapshot()["counters"]["coalesced"] == 19
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_key_is_rotated(mocker):
+    mocker.patch.object(EtherScanV2, "load_supported_chains",
+                        lambda self: setattr(self, "_supported_chains", SUPPORTED_CHAINS) or True)
+    instance = EtherScanV2({**CONFIG, "etherscan_api_key": ["limited-key", "healthy-key"]})
+    instance.cache = FakeCache()
+
+    async def fake_get(url, **kwargs):
+        if "apikey=limited-key" in url:
+            body = {"status": "0", "message": "NOTOK",
+                    "result": "Max calls per sec rate limit reached (5/sec)"}
+        else:
+            body = {"status": "1", "message": "OK", "result": "42"}
+        return httpx.Response(200, content=json.dumps(body))
+
+    instance.http.get = fake_get
+    mocker.patch.object(instance.key_pool, "select",
+                        side_effect=[instance.key_pool.keys[0], instance.key_pool.keys[1]])
+    result = await instance.for_chain(1).account.balance("0x0")
+    assert result == "42"
+    limited, healthy = instance.key_pool.keys
+    assert limited.cooling_down()
+    assert not healthy.cooling_down()
+
+
+@pytest.mark.asyncio
+async def test_balance_lookups_are_batched(mocker):
+    mocker.patch.object(EtherScanV2, "load_supported_chains",
+                        lambda self: setattr(self, "_supported_chains", SUPPORTED_CHAINS) or True)
+    instance = EtherScanV2({**CONFIG, "balance_batch_window_ms": 10,
+                            "balance_batch_max_size": 3})
+    instance.cache = FakeCache()
+    upstream_urls = []
+
+    async def fake_get(url, **kwargs):
+        upstream_urls.append(url)
+        assert "action=balancemulti" in url
+        addresses = url.split("address=")[1].split("&")[0].split("%2C")
+        body = {"status": "1", "message": "OK",
+                "result": [{"account": a, "balance": a[-1]} for a in addresses]}
+        return httpx.Response(200, content=json.dumps(body))
+
+    instance.http.get = fake_get
+    chain = instance.for_chain(1)
+    addresses = [f"0x{i:040x}" for i in range(1, 6)]
+    results = await asyncio.gather(*(chain.account.balance(a) for a in addresses))
+    assert results == ["1", "2", "3", "4", "5"]
+    # one full batch of 3 sent immediately, the remaining 2 after the window
+    assert len(upstream_urls) == 2
+    assert instance.metrics.snapshot()["histograms"]["balance_batch_size"] == {2: 1, 3: 1}
+    # per-address results are cached under the single balance key
+    assert await chain.account.balance(addresses[0]) == "1"
+    assert len(upstream_urls) == 2
+
+
+@pytest.mark.asyncio
+async def test_balances_use_cache_and_balancemulti_chunks(etherscan):
+    addresses = [f"0x{i:040x}" for i in range(1, 26)]
+    cached_key = etherscan.build_cache_key(
+        1, "account", "balance", {"address": addresses[0], "tag": "latest"})
+    etherscan.cache.data[cached_key] = "cached"
+
+    async def fake_get(url, **kwargs):
+        etherscan.upstream_urls.append(url)
+        assert "action=balancemulti" in url
+        chunk = url.split("address=")[1].split("&")[0].split("%2C")
+        # the upstream omits one address of the batch
+        body = {"status": "1", "message": "OK",
+                "result": [{"account": a, "balance": a[-2:]} for a in chunk
+                           if a != addresses[-1]]}
+        return httpx.Response(200, content=json.dumps(body))
+
+    etherscan.http.get = fake_get
+    results = await etherscan.for_chain(1).account.balances(addresses)
+    assert results[addresses[0]] == "cached"
+    assert results[addresses[1]] == "02"
+    assert isinstance(results[addresses[-1]], ValueError)
+    # 24 misses: one chunk of 20 and one of 4
+    assert len(etherscan.upstream_urls) == 2
+    fetched_key = etherscan.build_cache_key(
+        1, "account", "balance", {"address": addresses[1], "tag": "latest"})
+    assert etherscan.cache.data[fetched_key] == "02"
+
+
+@pytest.mark.asyncio
+async def test_final_block_results_are_cached_without_expiry(etherscan, mocker):
+    async def fake_get(url, **kwargs):
+        etherscan.upstream_urls.append(url)
+        if "eth_blockNumber" in url:
+            body = {"jsonrpc": "2.0", "id": 1, "result": hex(1000)}
+        else:
+            body = {"status": "1", "message": "OK", "result": {"blockNumber": "100"}}
+        return httpx.Response(200, content=json.dumps(body))
+
+    etherscan.http.get = fake_get
+    cache_set = mocker.spy(etherscan.cache, "set")
+    blocks = etherscan.for_chain(1).block
+    await blocks.getblockreward(100)
+    await blocks.getblockreward(990)
+    head, final, recent = cache_set.call_args_list
+    assert ":eth_blockNumber:" in head.args[0] and head.kwargs["expire"] == 2
+    assert final.kwargs["expire"] == 0  # block 100 is 900 blocks deep
+    assert recent.kwargs["expire"] == 2  # block 990 is not final yet
+    # the head lookup was cached for the second call
+    assert sum("eth_blockNumber" in url for url in etherscan.upstream_urls) == 1
+
+
+@pytest.mark.asyncio
+async def test_latest_results_are_cached_until_the_next_block(etherscan, mocker):
+    head = {"block": 100}
+    etherscan.head_watcher.poll_interval = 1
+    mocker.patch.object(etherscan.head_watcher, "epoch", lambda chain_id: head["block"])
+    cache_set = mocker.spy(etherscan.cache, "set")
+    chain = etherscan.for_chain(1)
+
+    assert await chain.proxy.eth_block_number() == hex(100)
+    await chain.account.balance("0x1")
+    await chain.account.balance("0x1")
+    assert len(etherscan.upstream_urls) == 1
+    key, _ = cache_set.call_args.args
+    assert key.endswith("@100") and cache_set.call_args.kwargs["expire"] == 60
+
+    head["block"] = 101
+    await chain.account.balance("0x1")
+    await chain.account.balances(["0x1"])
+    assert len(etherscan.upstream_urls) == 2
+    # explicit blocks and pending state are not keyed by head
+    await chain.account.balance("0x1", tag="pending")
+    assert "@" not in cache_set.call_args.args[0]
+
+
+@pytest.mark.asyncio
+async def test_raw_requests_return_json_text(etherscan):
+    chain = etherscan.for_chain(1)
+    key = etherscan.build_cache_key(1, "account", "txlist", {"address": "0x1"})
+
+    # a miss serializes the fetched result
+    assert await chain.request("account", "txlist", {"address": "0x1"}, raw=True) == \
+        b'"balance-on-1"'
+    # a hit passes the cached JSON text through
+    etherscan.cache.data[key] = [{"hash": "0x2"}]
+    assert json.loads(await chain.request("account", "txlist", {"address": "0x1"}, raw=True)) \
+        == [{"hash": "0x2"}]
+    assert await chain.request("account", "txlist", {"address": "0x1"}) == [{"hash": "0x2"}]
+    assert len(etherscan.upstream_urls) == 1
+
+
+class StaleCache(FakeCache):
+    """ FakeCache whose entries are past their expiration, within the stale window """
+
+    async def get_remote_with_ttl(self, key, stale=0, raw=False):
+        value = self.data.get(key)
+        return value, None if value is None else -3.0
+
+
+@pytest.mark.asyncio
+async def test_stale_entries_are_served_while_refreshed_once(etherscan, mocker):
+    etherscan.ttl_policy.stale_overrides = {"balance": 30}
+    etherscan.cache = StaleCache()
+    cache_set = mocker.spy(etherscan.cache, "set")
+    chain = etherscan.for_chain(1)
+    key = etherscan.build_cache_key(1, "account", "balance", {"address": "0x1", "tag": "latest"})
+
+    await chain.account.balance("0x1")
+    assert cache_set.call_args.kwargs["stale"] == 30
+    etherscan.cache.data[key] = "old"
+    results = await asyncio.gather(*(chain.account.balance("0x1") for _ in range(5)))
+    assert results == ["old"] * 5
+    # one background refresh for the five stale hits
+    await asyncio.sleep(0.05)
+    assert len(etherscan.upstream_urls) == 2
+    assert etherscan.cache.data[key] == "balance-on-1"
+    snapshot = etherscan.metrics.snapshot()
+    assert snapshot["counters"]["cache_stale"] == 5
+    assert snapshot["counters"]["revalidate_coalesced"] == 4
+    assert snapshot["counters"]["revalidated"] == 1
+    assert snapshot["stages"]["stale_age"]["max_ms"] == 3000
+
+    # without rate limit budget to spare the refresh waits for a later hit
+    mocker.patch.object(etherscan.key_pool, "has_slack", return_value=False)
+    assert await chain.account.balance("0x1") == "balance-on-1"
+    await asyncio.sleep(0.05)
+    assert len(etherscan.upstream_urls) == 2
+    assert etherscan.metrics.snapshot()["counters"]["revalidate_deferred"] == 1
+
+
+@pytest.mark.asyncio
+async def test_miss_during_a_refresh_gets_data(etherscan):
+    etherscan.ttl_policy.stale_overrides = {"balance": 30}
+    etherscan.cache = StaleCache()
+    chain = etherscan.for_chain(1)
+    key = etherscan.build_cache_key(1, "account", "balance", {"address": "0x1", "tag": "latest"})
+    etherscan.cache.data[key] = "old"
+
+    assert await chain.account.balance("0x1") == "old"
+    # the entry expires for good while its refresh is still in flight
+    del etherscan.cache.data[key]
+    assert await chain.account.balance("0x1") == "balance-on-1"
+    await asyncio.sleep(0.05)
+    assert etherscan.metrics.snapshot()["counters"]["revalidated"] == 1
+
+
+@pytest.mark.asyncio
+async def test_batched_balances_share_the_stale_policy(etherscan, mocker):
+    etherscan.ttl_policy.stale_overrides = {"balance": 30}
+    etherscan.cache = StaleCache()
+    lookups = mocker.spy(etherscan.cache, "get_remote_many_with_ttl")
+    cache_set = mocker.spy(etherscan.cache, "set")
+    addresses = ["0x1", "0x2", "0x3"]
+    key = etherscan.build_cache_key(1, "account", "balance", {"address": "0x1", "tag": "latest"})
+    etherscan.cache.data[key] = "old"
+
+    async def fake_get(url, **kwargs):
+        etherscan.upstream_urls.append(url)
+        if "action=balancemulti" in url:
+            result = [{"account": a, "balance": "new"} for a in ("0x2", "0x3")]
+        else:
+            result = "refreshed"
+        return httpx.Response(200, content=json.dumps({"status": "1", "message": "OK",
+                                                       "result": result}))
+
+    etherscan.http.get = fake_get
+    results = await etherscan.for_chain(1).account.balances(addresses)
+    assert results == {"0x1": "old", "0x2": "new", "0x3": "new"}
+    # one Redis round trip for the whole batch
+    assert lookups.call_count == 1
+    assert {call.kwargs["stale"] for call in cache_set.call_args_list} == {30}
+    # the stale balance is refreshed in the background
+    await asyncio.sleep(0.05)
+    assert etherscan.cache.data[key] == "refreshed"
+    assert etherscan.metrics.snapshot()["counters"]["cache_stale"] == 1
+
+
+@pytest.mark.asyncio
+async def test_pages_are_cached_requests(etherscan):
+    async def fake_get(url, **kwargs):
+        etherscan.upstream_urls.append(url)
+        page = int(url.split("page=")[1].split("&")[0])
+        rows = [{"blockNumber": str(page), "hash": f"0x{page}{i}"} for i in range(3 - page)]
+        return httpx.Response(200, content=json.dumps({"status": "1", "message": "OK",
+                                                       "result": rows}))
+
+    etherscan.http.get = fake_get
+    chain = etherscan.for_chain(1)
+    pages = [page async for page in chain.account.txlist_pages("0x1", page_size=2)]
+    assert [[row["hash"] for row in page] for page in pages] == [["0x10", "0x11"], ["0x20"]]
+    assert [page async for page in chain.account.txlist_pages("0x1", page_size=2)] == pages
+    assert len(etherscan.upstream_urls) == 2
+    assert etherscan.metrics.snapshot()["counters"]["page"] == 4
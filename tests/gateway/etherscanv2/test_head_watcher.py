@@ -0,0 +1,80 @@
+import pytest
+
+from web3gateway.gateway_etherscanv2.head_watcher import HeadWatcher
+
+
+CONFIG = {"head_poll_interval": 1, "head_max_age": 30}
+
+
+class FakeRedis:
+    """ in-memory stand-in for the SET/GET commands of a Redis client """
+
+    def __init__(self):
+        self.data = {}
+
+    async def set(self, key, value, nx=False, px=None, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = str(value).encode()
+        return True
+
+    async def get(self, key):
+        return self.data.get(key)
+
+
+class DownRedis:
+    async def set(self, *args, **kwargs):
+        raise ConnectionError("redis is down")
+
+    async def get(self, key):
+        raise ConnectionError("redis is down")
+
+
+def head_source(*heads):
+    calls = []
+
+    async def fetch_head(chain_id):
+        calls.append(chain_id)
+        return heads[min(len(calls), len(heads)) - 1]
+
+    return fetch_head, calls
+
+
+@pytest.mark.asyncio
+async def test_workers_share_one_poll_per_interval():
+    redis = FakeRedis()
+    fetch_head, calls = head_source(100)
+    leader = HeadWatcher(redis, fetch_head, CONFIG)
+    follower = HeadWatcher(redis, fetch_head, CONFIG)
+
+    assert await leader.refresh(1) == 100
+    # the poll lock is held for the interval: the follower reads the shared head
+    assert await follower.refresh(1) == 100
+    assert calls == [1]
+    assert follower.heads == {1: 100}
+    assert leader.metrics.snapshot()["counters"]["head_poll"] == 1
+
+
+@pytest.mark.asyncio
+async def test_epoch_moves_forward_only_while_confirmed(mocker):
+    fetch_head, _ = head_source(100, 99, 101)
+    watcher = HeadWatcher(DownRedis(), fetch_head, {**CONFIG, "head_max_age": 5})
+    mocker.patch.object(watcher, "_watch", mocker.AsyncMock())
+
+    assert watcher.epoch(1) is None  # starts watching, head not known yet
+    await watcher.refresh(1)  # polls locally without redis
+    assert watcher.epoch(1) == 100
+    await watcher.refresh(1)  # a lagging answer does not move the epoch back
+    assert watcher.epoch(1) == 100
+    await watcher.refresh(1)
+    assert watcher.epoch(1) == 101
+
+    watcher._confirmed_at[1] -= 10
+    assert watcher.epoch(1) is None
+    await watcher.close()
+
+
+def test_disabled_by_default():
+    watcher = HeadWatcher(FakeRedis(), head_source(100)[0], {})
+    assert not watcher.enabled
+    assert watcher.epoch(1) is None
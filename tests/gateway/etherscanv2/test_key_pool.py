@@ -0,0 +1,53 @@
+import pytest
+
+from web3gateway.exceptions import RateLimitException
+from web3gateway.gateway_etherscanv2.key_pool import ApiKeyPool, mask_api_key
+
+
+CONFIG = {
+    "etherscan_api_key": ["AAAAKEY000000001", "BBBBKEY000000002"],
+    "rate_limit_calls": 5,
+    "rate_limit_period": 1,
+    "rate_limit_burst": 2,
+    "etherscan_daily_quota": 3,
+}
+
+
+def test_single_key_config():
+    pool = ApiKeyPool({**CONFIG, "etherscan_api_key": "ONLYKEY000000000"})
+    assert [k.key for k in pool.keys] == ["ONLYKEY000000000"]
+
+
+@pytest.mark.asyncio
+async def test_least_loaded_dispatch():
+    pool = ApiKeyPool(CONFIG)
+    first = await pool.acquire()
+    second = await pool.acquire()
+    # the second call goes to the key whose burst budget is untouched
+    assert first is not second
+
+
+@pytest.mark.asyncio
+async def test_cooldown_and_quota():
+    pool = ApiKeyPool(CONFIG)
+    limited, healthy = pool.keys
+    pool.report_rate_limited(limited)
+    for _ in range(3):
+        assert await pool.acquire() is healthy
+    # healthy key is out of daily quota, limited key is cooling down
+    with pytest.raises(RateLimitException):
+        pool.select()
+    states = pool.state()
+    assert states[0]["key"] == mask_api_key("AAAAKEY000000001")
+    assert states[0]["rate_limited"] == 1
+    assert states[1]["daily_remaining"] == 0
+
+
+@pytest.mark.asyncio
+async def test_slack_follows_rate_limiters():
+    pool = ApiKeyPool({**CONFIG, "rate_limit_burst": 1})
+    assert pool.has_slack()
+    await pool.acquire()
+    await pool.acquire()
+    # both keys just made their call of the current interval
+    assert not pool.has_slack()
@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from web3gateway.gateway_etherscanv2 import pagination
+from web3gateway.gateway_etherscanv2.pagination import paginate
+
+
+# 14 transfers over 8 blocks, several of them split across result windows
+BLOCKS = [1, 1, 2, 3, 3, 3, 4, 5, 5, 6, 7, 7, 7, 8]
+ROWS = [{"blockNumber": str(block), "hash": f"0x{i:x}"} for i, block in enumerate(BLOCKS)]
+
+
+def etherscan_source(rows=ROWS):
+    """ page/offset queries over rows, capped like Etherscan's result window """
+    calls = []
+
+    async def fetch(params):
+        calls.append(params)
+        await asyncio.sleep(0)
+        page, offset = params["page"], params["offset"]
+        assert page * offset <= pagination.MAX_RESULT_WINDOW
+        selected = [row for row in rows
+                    if params["startblock"] <= int(row["blockNumber"]) <= params["endblock"]]
+        if params.get("sort") == "desc":
+            selected.reverse()
+        result = selected[(page - 1) * offset:page * offset]
+        if not result:
+            raise ValueError([])  # "No transactions found"
+        return result
+
+    return fetch, calls
+
+
+async def collect(pages):
+    return [row for page in [p async for p in pages] for row in page]
+
+
+@pytest.mark.asyncio
+async def test_pages_until_a_short_page():
+    fetch, calls = etherscan_source()
+    pages = [page async for page in paginate(fetch, {"address": "0x1"}, page_size=5)]
+    assert [len(page) for page in pages] == [5, 5, 4]
+    assert [call["page"] for call in calls] == [1, 2, 3]
+    assert calls[0]["startblock"] == 0 and calls[0]["endblock"] == 99999999
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sort", ["asc", "desc"])
+async def test_windows_resume_at_the_last_block(mocker, sort):
+    mocker.patch.object(pagination, "MAX_RESULT_WINDOW", 4)
+    fetch, calls = etherscan_source()
+    rows = await collect(paginate(fetch, {"sort": sort}, page_size=2))
+    assert rows == (ROWS if sort == "asc" else ROWS[::-1])
+    # every window restarts at page 1 from the last block of the previous one
+    bound = "startblock" if sort == "asc" else "endblock"
+    assert any(call["page"] == 1 and call[bound] not in (0, 99999999) for call in calls)
+
+
+@pytest.mark.asyncio
+async def test_more_rows_in_one_block_than_a_window(mocker):
+    mocker.patch.object(pagination, "MAX_RESULT_WINDOW", 4)
+    fetch, _ = etherscan_source([{"blockNumber": "9", "hash": f"0x{i}"} for i in range(6)])
+    with pytest.raises(ValueError):
+        await collect(paginate(fetch, {}, page_size=2))
+
+
+@pytest.mark.asyncio
+async def test_prefetch_follows_rate_limit_slack():
+    fetch, calls = etherscan_source()
+    pages = paginate(fetch, {}, page_size=5, has_slack=lambda: True)
+    await anext(pages)
+    await asyncio.sleep(0.01)
+    assert len(calls) == 2  # page 2 fetched while page 1 is consumed
+    await pages.aclose()
+
+    fetch, calls = etherscan_source()
+    pages = paginate(fetch, {}, page_size=5, has_slack=lambda: False)
+    await anext(pages)
+    await asyncio.sleep(0.01)
+    assert len(calls) == 1
+    assert len(await collect(pages)) == len(ROWS) - 5
+
+
+@pytest.mark.asyncio
+async def test_no_results():
+    fetch, _ = etherscan_source([])
+    assert await collect(paginate(fetch, {})) == []
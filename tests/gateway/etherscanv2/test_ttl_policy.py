@@ -0,0 +1,80 @@
+from datetime import date, timedelta
+
+from web3gateway.gateway_etherscanv2.metadata import (
+    TTL_BLOCK,
+    TTL_DEFAULT,
+    TTL_IMMUTABLE,
+    TTL_STATIC,
+)
+from web3gateway.gateway_etherscanv2.ttl_policy import TtlPolicy
+
+
+CONFIG = {"cache_expiration": 10}
+
+
+def test_explicit_final_blocks_are_immutable():
+    policy = TtlPolicy(CONFIG)
+    assert policy.head_block("getblockreward", {"blockno": "100"}, {}) == 100
+    assert policy.ttl_class("getblockreward", {"blockno": "100"}, {}, final_block=1000) \
+        == TTL_IMMUTABLE
+    assert policy.ttl_class("getblockreward", {"blockno": "2000"}, {}, final_block=1000) \
+        == TTL_BLOCK
+    assert policy.ttl_class("eth_getBlockByNumber", {"tag": "0x64"}, {}, final_block=1000) \
+        == TTL_IMMUTABLE
+    storage = {"address": "0x1", "position": "0x0", "tag": "0x64"}
+    assert policy.ttl_class("eth_getStorageAt", storage, "0x0", final_block=1000) \
+        == TTL_IMMUTABLE
+
+    # latest, or a missing end block, is never final
+    assert policy.head_block("eth_getBlockByNumber", {"tag": "latest"}, {}) is None
+    assert policy.head_block("txlist", {"startblock": 0}, []) is None
+    assert policy.head_block("txlist", {"startblock": 0, "endblock": 99999999}, []) is None
+    assert policy.ttl_class("txlist", {"startblock": 0}, [], final_block=1000) == TTL_DEFAULT
+
+    # receipts are final once their block is
+    receipt = {"blockNumber": "0x10", "status": "0x1"}
+    assert policy.ttl_class("eth_getTransactionReceipt", {"txhash": "0x1"}, receipt,
+                            final_block=1000) == TTL_IMMUTABLE
+    assert policy.head_block("eth_getTransactionReceipt", {"txhash": "0x1"}, None) is None
+
+
+def test_past_days_and_expirations():
+    policy = TtlPolicy({**CONFIG, "cache_action_expiration": {"gasoracle": 1}})
+    yesterday = (date.today() - timedelta(days=2)).isoformat()
+    today = (date.today() + timedelta(days=1)).isoformat()
+    assert policy.ttl_class("dailytx", {"startdate": "2024-01-01", "enddate": yesterday},
+                            []) == TTL_IMMUTABLE
+    assert policy.ttl_class("dailytx", {"startdate": "2024-01-01", "enddate": today},
+                            []) == TTL_DEFAULT
+
+    assert policy.expiration("getabi", policy.ttl_class("getabi", {}, "[]")) == 0
+    assert policy.ttl_class("getsourcecode", {}, []) == TTL_STATIC
+    assert policy.expiration("dailytx", TTL_DEFAULT) == 10
+    assert policy.expiration("gasoracle", TTL_BLOCK) == 1
+    assert not policy.cacheable("eth_sendRawTransaction")
+    assert policy.cacheable("getabi")
+
+
+def test_latest_block_results_follow_head():
+    policy = TtlPolicy(CONFIG)
+    assert policy.follows_head("balance", {"address": "0x1", "tag": "latest"})
+    assert policy.follows_head("eth_blockNumber", {})
+    assert policy.follows_head("eth_getTransactionCount", {"address": "0x1", "tag": "latest"})
+    assert policy.follows_head("eth_getStorageAt",
+                               {"address": "0x1", "position": "0x0", "tag": "latest"})
+    assert not policy.follows_head("eth_getStorageAt",
+                                   {"address": "0x1", "position": "0x0", "tag": "0x64"})
+    assert not policy.follows_head("eth_getTransactionCount", {"address": "0x1", "tag": "pending"})
+    assert not policy.follows_head("eth_call", {"to": "0x1", "tag": "0x64"})
+    assert not policy.follows_head("eth_getTransactionReceipt", {"txhash": "0x1"})
+    assert not policy.follows_head("txlist", {"address": "0x1"})
+    assert not TtlPolicy({**CONFIG, "cache_action_expiration": {"balance": 1}}) \
+        .follows_head("balance", {"address": "0x1", "tag": "latest"})
+
+
+def test_stale_window_per_action():
+    policy = TtlPolicy({**CONFIG, "cache_stale_window": 10,
+                        "cache_action_stale_window": {"gasoracle": 0}})
+    assert policy.stale_for("balance") == 10
+    assert policy.stale_for("gasoracle") == 0
+    assert TtlPolicy(CONFIG).stale_for("balance") == 0
@@ -0,0 +1,74 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from web3gateway.main import create_app, raw_with_timestamp
+
+
+CONFIG = {
+    "auth_username": "test_user",
+    "auth_password": "test_password",
+    "infura_project_id": "",
+    "redis_url": "redis://localhost:6379",
+    "etherscan_api_key": "test",
+    "rate_limit_calls": 1000,
+    "rate_limit_period": 1,
+    "cache_expiration": 10,
+}
+
+
+def test_create_app_is_independent_per_config():
+    app = create_app(CONFIG)
+    other = create_app({**CONFIG, "auth_password": "other"})
+    assert app.state.gw_etherscan is not other.state.gw_etherscan
+
+    client = TestClient(app)
+    assert client.get("/ping").status_code == 200
+    assert client.get("/metrics", auth=("test_user", "other")).status_code == 401
+    res = client.get("/metrics", auth=("test_user", "test_password"))
+    assert res.status_code == 200
+    assert set(res.json()["data"]) == {"etherscan", "cache", "blockchain", "rpc"}
+
+    assert TestClient(other).get("/metrics", auth=("test_user", "other")).status_code == 200
+
+
+def test_raw_with_timestamp_splices_json_text():
+    response = raw_with_timestamp("last transactions", b'[{"hash":"0x1"}]')
+    assert response.media_type == "application/json"
+    body = json.loads(response.body)
+    assert body["data"] == {"last transactions": [{"hash": "0x1"}]}
+    assert isinstance(body["timestamp"], int)
+
+
+def test_txlist_streams_every_page(mocker):
+    app = create_app(CONFIG)
+    account = mocker.Mock()
+    pages = [[{"hash": "0x1"}, {"hash": "0x2"}], [{"hash": "0x3"}]]
+
+    def txlist_pages(*args, fail=False):
+        async def iterate():
+            for page in pages:
+                yield page
+            if fail:
+                raise OSError("upstream down")
+        return iterate()
+
+    account.txlist_pages = txlist_pages
+    mocker.patch.object(app.state.gw_etherscan, "for_chain", return_value=mocker.Mock(
+        account=account))
+    client = TestClient(app)
+    body = {"chain_id": 1, "address": "0x1"}
+    auth = ("test_user", "test_password")
+
+    res = client.post("/account/txlist", json={**body, "stream": "ndjson"}, auth=auth)
+    assert res.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line) for line in res.text.splitlines()] == pages[0] + pages[1]
+    res = client.post("/account/txlist", json={**body, "stream": "json"}, auth=auth)
+    assert res.json()["data"] == {"last transactions": pages[0] + pages[1]}
+
+    # an error after the first page ends the stream with an error entry
+    account.txlist_pages = lambda *args: txlist_pages(fail=True)
+    res = client.post("/account/txlist", json={**body, "stream": "json"}, auth=auth)
+    assert res.json()["data"]["error"] == "upstream down"
+    res = client.post("/account/txlist", json={**body, "stream": "ndjson"}, auth=auth)
+    assert json.loads(res.text.splitlines()[-1]) == {"error": "upstream down"}
@@ -0,0 +1,74 @@
+import gzip
+import json
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from web3gateway.responses import CompressionMiddleware, FastJSONResponse, accepted_encodings, dumps
+
+
+ROWS = [{"hash": f"0x{i:064x}", "value": str(i)} for i in range(100)]
+
+
+def compressing_app(**options) -> FastAPI:
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.add_middleware(CompressionMiddleware, **options)
+
+    @app.get("/rows")
+    async def rows():
+        return {"rows": ROWS}
+
+    @app.get("/small")
+    async def small():
+        return PlainTextResponse("ok")
+
+    @app.get("/stream")
+    async def stream():
+        async def lines():
+            for row in ROWS:
+                yield json.dumps(row) + "\n"
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    return app
+
+
+def test_dumps_is_compact_json():
+    assert dumps({"a": [1, "b"]}) == b'{"a":[1,"b"]}'
+    assert json.loads(dumps({"balance": 2 ** 70})) == {"balance": 2 ** 70}
+    assert FastJSONResponse({"rows": ROWS}).body == dumps({"rows": ROWS})
+
+
+def test_accepted_encodings():
+    assert accepted_encodings("gzip, br;q=0.8, identity;q=0") == {"gzip", "br"}
+    assert accepted_encodings("") == set()
+
+
+def test_large_responses_are_compressed():
+    client = TestClient(compressing_app(encodings=["br", "gzip"], min_size=1024))
+    # br is skipped unless the brotli package is installed
+    res = client.get("/rows", headers={"Accept-Encoding": "gzip"})
+    assert res.headers["content-encoding"] == "gzip"
+    assert "accept-encoding" in res.headers["vary"].lower()
+    assert res.json() == {"rows": ROWS}
+    assert int(res.headers["content-length"]) < len(dumps({"rows": ROWS})) / 2
+
+    res = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in res.headers and res.text == "ok"
+    res = client.get("/rows", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in res.headers
+
+
+def test_streams_are_compressed_chunk_by_chunk():
+    client = TestClient(compressing_app(encodings=["gzip"], min_size=1024))
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as res:
+        assert res.headers["content-encoding"] == "gzip"
+        assert "content-length" not in res.headers
+        body = b"".join(res.iter_raw())
+    assert [json.loads(line) for line in gzip.decompress(body).splitlines()] == ROWS
+
+
+def test_compression_is_opt_in():
+    assert CompressionMiddleware.options({}) is None
+    assert CompressionMiddleware.options({"response_compression": "gzip"}) == {
+        "encodings": ["gzip"], "min_size": 1024}
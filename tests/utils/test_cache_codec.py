@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+from web3gateway.utils.cache_codec import CacheCodec
+
+
+ROWS = [{"blockNumber": str(19_000_000 + i), "hash": f"0x{i:064x}", "value": "0"}
+        for i in range(200)]
+
+
+@pytest.mark.parametrize("serializer", ["json", "orjson", "msgpack"])
+@pytest.mark.parametrize("compression", ["none", "zlib", "zstd", "lz4"])
+def test_round_trip_and_cross_decoding(serializer, compression):
+    codec = CacheCodec(serializer, compression, compress_min_size=1024)
+    for value in (ROWS, "0x10", 7, None, {"nested": ROWS[:2]}):
+        assert codec.decode(codec.encode(value)) == value
+    # a codec with other settings still reads the value
+    assert CacheCodec("json", "none").decode(codec.encode(ROWS)) == ROWS
+
+
+def test_compression_threshold():
+    codec = CacheCodec("json", "zlib", compress_min_size=1024)
+    small, large = codec.encode(ROWS[:1]), codec.encode(ROWS)
+    assert small[3] == 0 and large[3] == 1
+    assert len(large) < len(json.dumps(ROWS)) / 4
+
+
+def test_plain_json_and_unencodable_values():
+    codec = CacheCodec("orjson", "none")
+    # values written before the header existed
+    assert codec.decode(json.dumps(ROWS).encode()) == ROWS
+    # orjson rejects integers above 64 bits, stdlib json takes over
+    assert codec.decode(codec.encode(2 ** 70)) == 2 ** 70
+
+    with pytest.raises(ValueError):
+        codec.decode(b"\x00\x09\x00\x00{}")
+    with pytest.raises(ValueError):
+        codec.decode(codec.encode(ROWS)[:-5])
+
+
+def test_json_text_without_decoding(mocker):
+    codec = CacheCodec("orjson", "zlib", compress_min_size=1024)
+    decode = mocker.spy(codec, "decode")
+    for value in (ROWS, "0x10"):
+        assert json.loads(codec.to_json(codec.encode(value))) == value
+    decode.assert_not_called()
+    # values written before the header existed are JSON text already
+    assert codec.to_json(b'["0x1"]') == b'["0x1"]'
+    # other serializers are decoded and written as JSON
+    other = CacheCodec("msgpack", "none")
+    assert json.loads(codec.to_json(other.encode(ROWS))) == ROWS
+    assert codec.dumps_json(2 ** 70) == b"1180591620717411303424"
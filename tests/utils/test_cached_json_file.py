@@ -0,0 +1,51 @@
+from unittest import mock
+
+import pytest
+
+from web3gateway.utils import cached_json_file
+from web3gateway.utils.cached_json_file import CachedJsonFile
+
+
+URL = "https://example.com/chains.json"
+
+
+def response(status_code, document=None, headers=None):
+    return mock.Mock(status_code=status_code, headers=headers or {},
+                     json=mock.Mock(return_value=document))
+
+
+def test_fetch_saves_copy_and_revalidates(mocker, tmp_path):
+    get = mocker.patch.object(cached_json_file.requests, "get", side_effect=[
+        response(200, [{"chainId": 1}], {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024"}),
+        response(304),
+    ])
+    path = tmp_path / "chains.json"
+    cached = CachedJsonFile(URL, path)
+    assert cached.load() is None
+    assert cached.fetch() == [{"chainId": 1}]
+    assert cached.due_in(60) > 0
+
+    # a new process starts from the copy and revalidates it
+    restarted = CachedJsonFile(URL, path)
+    assert restarted.load() == [{"chainId": 1}]
+    assert restarted.fetch() is None
+    assert get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"',
+                                               "If-Modified-Since": "Mon, 01 Jan 2024"}
+
+    # a copy of another url is not used
+    assert CachedJsonFile("https://example.com/other.json", path).load() is None
+
+
+def test_invalid_document_is_not_saved(mocker, tmp_path):
+    def parse(document):
+        if "result" not in document:
+            raise ValueError("invalid")
+        return document["result"]
+
+    mocker.patch.object(cached_json_file.requests, "get",
+                        return_value=response(200, {"message": "NOTOK"}))
+    cached = CachedJsonFile(URL, tmp_path / "chainlist.json", parse)
+    with pytest.raises(ValueError):
+        cached.fetch()
+    assert not cached.path.exists()
+    assert cached.load() is None
@@ -0,0 +1,47 @@
+import pytest
+
+from web3gateway.utils.chain_registry import ChainRegistry
+from web3gateway.utils.chains_json import Chains
+
+
+CHAINS_JSON = [
+    {"name": "Ethereum Mainnet", "shortName": "eth", "chainId": 1,
+     "rpc": ["https://mainnet.infura.io/v3/${INFURA_API_KEY}", "https://eth.example"],
+     "nativeCurrency": {"name": "Ether", "symbol": "ETH", "decimals": 18}},
+    {"name": "Duplicate Mainnet", "shortName": "eth2", "chainId": 1, "rpc": []},
+    {"name": "BNB Smart Chain Mainnet", "shortName": "bnb", "chainId": 56,
+     "rpc": ["https://bsc.example"],
+     "nativeCurrency": {"name": "BNB", "symbol": "BNB", "decimals": 18}},
+    {"name": "no chain id"},
+]
+
+
+def test_registry_indexes_first_entry():
+    registry = ChainRegistry.from_chainid_network(CHAINS_JSON)
+    assert len(registry) == 2
+    assert 56 in registry and 2 not in registry
+
+    eth = registry.get(1)
+    assert eth.name == "Ethereum Mainnet"
+    assert eth.currency_symbol == "ETH"
+    assert eth.rpc_urls("key")[0] == "https://mainnet.infura.io/v3/key"
+    assert registry.get_by_name("ethereum mainnet") is eth
+    assert registry.get_by_short_name("BNB").chain_id == 56
+    assert registry.get(2) is None
+
+    with pytest.raises(TypeError):
+        registry.by_id[2] = eth
+
+
+def test_chains_registry_follows_chains_json():
+    chains = Chains("key", chains_json=CHAINS_JSON)
+    assert chains.get_chain(1).rpc_urls(chains.infura_project_id)[1] == "https://eth.example"
+
+    assert chains.select_chain_by_key_value("chainId", 1)
+    assert chains.get_selected_chain_value("name") == "Ethereum Mainnet"
+    assert chains.select_chain_by_key_value("shortName", "bnb")
+    assert not chains.select_chain_by_key_value("chainId", 2)
+
+    chains.chains_json = CHAINS_JSON[2:]
+    assert chains.get_chain(1) is None
+    assert not chains.select_chain_by_key_value("chainId", 1)
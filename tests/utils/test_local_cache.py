@@ -0,0 +1,37 @@
+import time
+
+from web3gateway.utils.local_cache import LocalCache
+
+
+def test_local_cache_lru_eviction():
+    cache = LocalCache(max_size=2, default_ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" becomes least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_local_cache_ttl():
+    cache = LocalCache(max_size=10, default_ttl=60)
+    cache.set("a", 1, ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert stats["expirations"] == 1
+    assert stats["misses"] == 1
+    assert stats["size"] == 0
+
+
+def test_local_cache_delete_and_prefix():
+    cache = LocalCache(max_size=10, default_ttl=60)
+    cache.set("etherscanv2:1:a", 1)
+    cache.set("etherscanv2:1:b", 2)
+    cache.set("etherscanv2:8453:a", 3)
+    assert cache.delete("etherscanv2:1:a")
+    assert not cache.delete("etherscanv2:1:a")
+    assert cache.clear_prefix("etherscanv2:1:") == 1
+    assert len(cache) == 1
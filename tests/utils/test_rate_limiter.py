@@ -0,0 +1,94 @@
+import asyncio
+from itertools import pairwise
+from time import monotonic
+
+import pytest
+
+from web3gateway.utils.rate_limiter import RateLimiter, RedisRateLimiter, create_rate_limiter
+
+
+def test_reserve_spaces_calls():
+    limiter = RateLimiter({"rate_limit_period": 1, "rate_limit_calls": 10})
+    delays = [limiter.reserve() for _ in range(5)]
+    assert delays[0] == 0
+    for previous, current in pairwise(delays):
+        assert current == pytest.approx(previous + 0.1, abs=0.01)
+
+
+def test_reserve_allows_burst():
+    limiter = RateLimiter({"rate_limit_period": 1, "rate_limit_calls": 10,
+                           "rate_limit_burst": 3})
+    assert limiter.available() == 3
+    assert [limiter.reserve() for _ in range(3)] == [0, 0, 0]
+    assert limiter.available() == 0
+    assert limiter.reserve() == pytest.approx(0.1, abs=0.01)
+
+
+def max_calls_per_window(limiter, calls, period):
+    """ most of `calls` reserved slots falling in any window of `period` seconds """
+    slots = sorted(monotonic() + limiter.reserve() for _ in range(calls))
+    # a millisecond absorbs the time spent between reservations
+    return max(sum(1 for t in slots[i:] if t < start + period - 1e-3)
+               for i, start in enumerate(slots))
+
+
+@pytest.mark.parametrize("backend", ["local", "redis"])
+def test_default_never_exceeds_calls_per_period(backend):
+    config = {"rate_limit_period": 1, "rate_limit_calls": 5, "rate_limit_backend": backend}
+    limiter = create_rate_limiter(config, UnavailableRedis())
+    # the Redis script receives the same tolerance as the local budget
+    assert limiter.rate_limit_burst == 1
+    assert max_calls_per_window(limiter, 12, 1) == 5
+
+    bursty = RateLimiter({**config, "rate_limit_burst": 3})
+    assert max_calls_per_window(bursty, 12, 1) == 5 + 3 - 1
+
+
+@pytest.mark.asyncio
+async def test_waiters_sleep_concurrently():
+    limiter = RateLimiter({"rate_limit_period": 1, "rate_limit_calls": 20})
+    start = monotonic()
+    await asyncio.gather(*(limiter.acquire() for _ in range(5)))
+    # the last slot is 4 intervals away; waiters do not queue behind each other
+    assert monotonic() - start == pytest.approx(0.2, abs=0.05)
+
+
+@pytest.mark.asyncio
+async def test_decorator():
+    limiter = RateLimiter({"rate_limit_period": 1, "rate_limit_calls": 100})
+
+    @limiter
+    async def double(x):
+        return x * 2
+
+    assert await double(2) == 4
+    assert limiter.available() == 0
+
+
+class UnavailableRedis:
+    """ Redis client whose scripts always fail """
+
+    def register_script(self, script):
+        async def run(keys, args):
+            raise ConnectionError("redis is down")
+        return run
+
+
+def test_create_rate_limiter_backends():
+    config = {"rate_limit_period": 1, "rate_limit_calls": 5}
+    assert type(create_rate_limiter(config)) is RateLimiter
+    limiter = create_rate_limiter({**config, "rate_limit_backend": "redis"}, UnavailableRedis())
+    assert isinstance(limiter, RedisRateLimiter)
+    with pytest.raises(ValueError):
+        create_rate_limiter({**config, "rate_limit_backend": "redis"})
+    with pytest.raises(ValueError):
+        create_rate_limiter({**config, "rate_limit_backend": "memcached"})
+
+
+@pytest.mark.asyncio
+async def test_redis_rate_limiter_falls_back_to_local_budget():
+    config = {"rate_limit_period": 1, "rate_limit_calls": 5, "rate_limit_backend": "redis"}
+    limiter = create_rate_limiter(config, UnavailableRedis())
+    await limiter.acquire()
+    assert await limiter.reserve_shared() is None
+    assert limiter.available() == 0
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+from web3gateway.utils.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_result():
+    flight = SingleFlight()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    results = await asyncio.gather(*(flight.do("key", fetch) for _ in range(10)))
+    assert results == [1] * 10
+    assert flight.coalesced == 9
+    assert not flight.in_flight("key")
+
+    # a later call starts a new flight
+    assert await flight.do("key", fetch) == 2
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_exception():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream error")
+
+    results = await asyncio.gather(*(flight.do("key", fail) for _ in range(3)),
+                                   return_exceptions=True)
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_single_flight_survives_waiter_cancellation():
+    flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return "ok"
+
+    first = asyncio.ensure_future(flight.do("key", fetch))
+    second = asyncio.ensure_future(flight.do("key", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    assert await second == "ok"
+
+
+@pytest.mark.asyncio
+async def test_single_flight_start_runs_in_background():
+    flight = SingleFlight()
+    calls = 0
+
+    async def refresh():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+
+    task = flight.start("key", refresh)
+    assert flight.start("key", refresh) is task
+    assert flight.in_flight("key")
+    await task
+    assert calls == 1
+    assert not flight.in_flight("key")
@@ -9,7 +9,7 @@ ensures all required configuration parameters are present.
 import argparse
 import json
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
 
 # Define project directory structure
@@ -93,17 +93,47 @@ def parse_args() -> argparse.Namespace:
         help='Path to configuration file',
         default=None
     )
+    parser.add_argument('--host', default='localhost', help='Bind address')
+    parser.add_argument('--port', type=int, default=8000, help='Bind port')
+    parser.add_argument(
+        '-w', '--workers',
+        type=int,
+        default=1,
+        help='Worker processes sharing the listening socket'
+    )
+    parser.add_argument(
+        '--loop',
+        choices=['auto', 'asyncio', 'uvloop'],
+        default='auto',
+        help='Event loop (auto uses uvloop when installed)'
+    )
+    parser.add_argument(
+        '--http',
+        choices=['auto', 'h11', 'httptools'],
+        default='auto',
+        help='HTTP parser (auto uses httptools when installed)'
+    )
+    parser.add_argument(
+        '--backlog',
+        type=int,
+        default=2048,
+        help='Pending connections queued by the listening socket'
+    )
     return parser.parse_args()
 
 
-def get_config() -> dict[str, Any]:
+def get_config(args: Optional[argparse.Namespace] = None) -> dict[str, Any]:
     """
     Get configuration from command line args or default location.
 
+    Args:
+        args: Parsed command line arguments (parsed from sys.argv if None)
+
     Returns:
         dict[str, Any]: Configuration dictionary
     """
-    args = parse_args()
+    if args is None:
+        args = parse_args()
     config_path = Path(args.config) if args.config else None
     if config_path:
         print(f"Using configuration file: {config_path}")
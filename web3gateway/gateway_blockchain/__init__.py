@@ -1,16 +1,37 @@
+import asyncio
+import logging
 from functools import reduce
-from typing import Any
+from typing import Any, Awaitable, Optional
 
-from web3 import AsyncHTTPProvider, AsyncWeb3
+from redis.asyncio import Redis  # type: ignore
+from redis.exceptions import RedisError
+from web3 import AsyncWeb3
 
-from web3gateway.utils.chains_json import Chains
+from web3gateway.gateway_blockchain.fee_tracker import DEFAULT_POLL_INTERVAL, FeeTracker
+from web3gateway.gateway_blockchain.nonce_manager import (
+    NONCE_USED_MARKERS,
+    NonceManager,
+    transaction_sender_and_nonce,
+)
+from web3gateway.gateway_blockchain.provider_pool import ProviderPool
+from web3gateway.utils.chains_json import CHAINS_JSON_URL, Chains
+from web3gateway.utils.metrics import Metrics
 
 
+logger = logging.getLogger(__name__)
+
 MODE = {
     "slow": [10.0, 20.0, 30.0, 40.0, 50.0],  # <1min
     "normal": [10.0, 30.0, 50.0, 70.0, 90.0],  # <30sec
     "fast": [50.0, 60.0, 70.0, 80.0, 90.0],  # <10sec
 }
+# Reward percentiles tracked by the fee trackers, covering every MODE
+FEE_PERCENTILES = sorted({percentile for percentiles in MODE.values()
+                          for percentile in percentiles})
+# Gas estimates running at once for one batch assembly
+BATCH_ESTIMATE_CONCURRENCY = 16
+# Default of the optional chains_refresh_interval setting (a day)
+CHAINS_REFRESH_INTERVAL = 86400
 
 
 class Blockchain:
@@ -18,42 +39,139 @@ class Blockchain:
 
     def __init__(self, config: dict[str, Any]):
         self.config = config
-        self.web3_instances: dict[int, AsyncWeb3] = {}
-        self.chains = Chains(infura_project_id=self.config["infura_project_id"])
-        if not self.chains.load_chains_json_file():
-            self.chains.update_chains_json()
+        self.provider_pools: dict[int, ProviderPool] = {}
+        self.fee_trackers: dict[int, FeeTracker] = {}
+        self.metrics = Metrics()
+        self.nonce_manager: Optional[NonceManager] = None
+        if self.config.get('nonce_manager_enabled', False):
+            self.nonce_manager = NonceManager(
+                Redis.from_url(self.config['redis_url'], decode_responses=True),
+                self.get_pending_nonce, self.config)
+        # chains.json is read from disk, or downloaded, on first use
+        self.chains = Chains(infura_project_id=self.config["infura_project_id"],
+                             url=self.config.get('chains_json_url', CHAINS_JSON_URL))
+        self._chains_refresher: Optional[asyncio.Task] = None
 
-    def _get_web3_instance(self, chain_id: int) -> AsyncWeb3:
-        if chain_id not in self.web3_instances:
-            # initialize web3 instance
-            if not self.chains.select_chain_by_key_value("chainId", chain_id):
+    def preload(self) -> None:
+        """
+        Load chains.json and build the chain registry now instead of on
+        first use, e.g. once in a parent process before workers are forked.
+
+        Raises:
+            ConnectionError: If chains.json is not saved and cannot be downloaded
+        """
+        registry = self.chains.registry
+        logger.debug(f"{len(registry)} chains preloaded")
+
+    async def start(self) -> None:
+        """
+        Load chains.json and start revalidating it in the background.
+
+        Without a saved chains.json the first download is awaited off the
+        event loop; if it fails the gateway starts anyway and keeps retrying.
+        """
+        if not self.chains.loaded and not self.chains.load_chains_json_file():
+            try:
+                await asyncio.to_thread(self.chains.update_chains_json)
+            except Exception as e:
+                logger.warning(f"chains.json unavailable: {e}")
+        interval = self.config.get('chains_refresh_interval', CHAINS_REFRESH_INTERVAL)
+        if interval > 0 and (self._chains_refresher is None or self._chains_refresher.done()):
+            self._chains_refresher = asyncio.ensure_future(self.chains.refresh_loop(interval))
+
+    def _get_provider_pool(self, chain_id: int) -> ProviderPool:
+        """ get the rpc provider pool of a chain, created on first use """
+        if chain_id not in self.provider_pools:
+            record = self.chains.get_chain(chain_id)
+            if record is None:
                 raise ValueError(f"Chain {chain_id} not supported")
-            rpc_urls = self.chains.get_selected_chain_value("rpc")
+            rpc_urls = record.rpc_urls(self.chains.infura_project_id)
             if not rpc_urls:
                 raise ValueError(f"No rpc url found for Chain {chain_id}")
-            rpc_url = rpc_urls[0]
-            self.web3_instances[chain_id] = AsyncWeb3(AsyncHTTPProvider(rpc_url))
-        return self.web3_instances[chain_id]
+            self.provider_pools[chain_id] = ProviderPool(chain_id, rpc_urls, self.config)
+        return self.provider_pools[chain_id]
 
-    async def get_nonce(self, chain_id: int, address):
-        """ get nonce for the address """
-        web3 = self._get_web3_instance(chain_id)
-        return await web3.eth.get_transaction_count(address)
+    def _get_web3_instance(self, chain_id: int) -> AsyncWeb3:
+        """ get the web3 instance of the healthiest rpc endpoint of a chain """
+        return self._get_provider_pool(chain_id).best().web3
+
+    async def _timed(self, name: str, call: Awaitable[Any]) -> Any:
+        """ await a call, timing it as a metrics stage """
+        with self.metrics.timer(name):
+            return await call
+
+    async def get_pending_nonce(self, chain_id: int, address) -> int:
+        """ get the transaction count of the address, including pending transactions """
+        pool = self._get_provider_pool(chain_id)
+        return await pool.call(lambda web3: web3.eth.get_transaction_count(address, 'pending'))
+
+    async def get_nonce(self, chain_id: int, address) -> int:
+        """
+        get nonce for the address
+
+        With the nonce manager enabled the nonce is reserved in Redis, so
+        concurrent assemblies from one sender get distinct nonces; if Redis
+        is unavailable the pending transaction count is used instead.
+        """
+        if self.nonce_manager is not None:
+            try:
+                return await self.nonce_manager.reserve(chain_id, address)
+            except RedisError as e:
+                logger.warning(f"Nonce manager unavailable, using pending count: {e}")
+        return await self.get_pending_nonce(chain_id, address)
+
+    async def release_nonce(self, chain_id: int, address, nonce: int) -> None:
+        """ hand a reserved nonce out again, its transaction will not be sent """
+        if self.nonce_manager is None:
+            return
+        try:
+            await self.nonce_manager.release(chain_id, address, nonce)
+        except RedisError as e:
+            logger.warning(f"Failed to release nonce {nonce} of {address}: {e}")
 
     async def estimate_gas(self, chain_id: int, tx_params):
         """ estimate gas that will be used by the transaction """
-        web3 = self._get_web3_instance(chain_id)
-        return await web3.eth.estimate_gas(tx_params)
+        pool = self._get_provider_pool(chain_id)
+        return await pool.call(lambda web3: web3.eth.estimate_gas(tx_params))
+
+    async def _get_fee_tracker(self, chain_id: int) -> Optional[FeeTracker]:
+        """ get the fee tracker of a chain, warmed up on first use; None if disabled """
+        if self.config.get('fee_poll_interval', DEFAULT_POLL_INTERVAL) <= 0:
+            return None
+        if chain_id not in self.fee_trackers:
+            self.fee_trackers[chain_id] = FeeTracker(
+                chain_id, self._get_provider_pool(chain_id), FEE_PERCENTILES, self.config)
+        tracker = self.fee_trackers[chain_id]
+        if tracker.due() and not tracker.ready():
+            try:
+                await tracker.refresh()
+            except Exception as e:
+                logger.warning(f"Chain {chain_id}: fee history unavailable: {e}")
+        tracker.start()
+        return tracker
 
     async def get_gas_price(self, chain_id: int, gas_level):
         """ get gas price for the transaction """
-        web3 = self._get_web3_instance(chain_id)
+        pool = self._get_provider_pool(chain_id)
         if gas_level not in MODE:
             raise ValueError(f"Gas level {gas_level} not supported, should be one of {MODE.keys()}")
+        tracker = await self._get_fee_tracker(chain_id)
+        if tracker is not None and tracker.ready():
+            self.metrics.incr("gas_price_from_memory")
+            return tracker.estimate(MODE[gas_level])
+        self.metrics.incr("gas_price_from_rpc")
         try:
             # baseFee:
             # Set by blockchain, varies at each block, always burned
-            block_info = await web3.eth.get_block('pending')
+            # priorityFee:
+            # Set by user, tip/reward paid directly to miners, never returned
+            # (both are fetched concurrently)
+            block_info, fee_history = await asyncio.gather(
+                self._timed("gas_price.pending_block",
+                            pool.call(lambda web3: web3.eth.get_block('pending'))),
+                self._timed("gas_price.fee_history",
+                            pool.call(lambda web3: web3.eth.fee_history(
+                                3, 'pending', MODE[gas_level]))))
             base_fee = block_info.get('baseFeePerGas')
 
             # next baseFee:
@@ -61,9 +179,6 @@ class Blockchain:
             # difference always refunded
             next_base_fee = base_fee * 2 if base_fee is not None else 100000
 
-            # priorityFee:
-            # Set by user, tip/reward paid directly to miners, never returned
-            fee_history = await web3.eth.fee_history(3, 'pending', MODE[gas_level])
             reward_history = fee_history.get('reward')
             rewards = reduce(lambda x, y: x + y, reward_history)
             avg_reward = sum(rewards) // len(rewards)
@@ -74,15 +189,52 @@ class Blockchain:
             return {"maxPriorityFeePerGas": avg_reward,
                     "maxFeePerGas": avg_reward + next_base_fee}
         except Exception:
-            gas_price = await web3.eth.gas_price
+            gas_price = await pool.call(lambda web3: web3.eth.gas_price)
             return {"gasPrice": gas_price}
 
+    async def estimate_fees(self, chain_id: int) -> dict[str, Any]:
+        """
+        estimate the fees of every gas level
+
+        Served from the fee tracker when its data is fresh, together with the
+        newest tracked block and the next base fee; otherwise every level is
+        fetched with `get_gas_price`.
+        """
+        tracker = await self._get_fee_tracker(chain_id)
+        if tracker is not None and tracker.ready():
+            self.metrics.incr("gas_price_from_memory", len(MODE))
+            return {**tracker.state(),
+                    "levels": {level: tracker.estimate(percentiles)
+                               for level, percentiles in MODE.items()}}
+        levels = await asyncio.gather(*(self.get_gas_price(chain_id, level) for level in MODE))
+        return {"levels": dict(zip(MODE, levels, strict=True))}
+
     async def assemble_unsigned_transaction(self, chain_id: int,
                                             from_address: str, to_address: str,
                                             value: int, data: str,
                                             gas_level: str = "normal") -> dict[str, Any]:
-        """ assemble an unsigned transaction """
-        nonce = await self.get_nonce(chain_id, from_address)
+        """
+        assemble an unsigned transaction
+
+        Nonce, gas estimate and fee data do not depend on each other and are
+        fetched concurrently, so assembly costs about one RPC round trip.
+        Each step is timed under "assemble.*" in `metrics`.
+        """
+        with self.metrics.timer("assemble"):
+            call = {'from': from_address, 'to': to_address, 'value': value}
+            if data:
+                call['data'] = data
+            nonce, gas, gas_price = await asyncio.gather(
+                self._timed("assemble.nonce", self.get_nonce(chain_id, from_address)),
+                # estimated without nonce: the node uses the account's current one
+                self._timed("assemble.estimate_gas", self.estimate_gas(chain_id, call)),
+                self._timed("assemble.gas_price", self.get_gas_price(chain_id, gas_level)),
+                return_exceptions=True)
+        for result in (nonce, gas, gas_price):
+            if isinstance(result, BaseException):
+                if not isinstance(nonce, BaseException):
+                    await self.release_nonce(chain_id, from_address, nonce)
+                raise result
         transaction = {
             'from': from_address,
             'to': to_address,
@@ -92,26 +244,152 @@ class Blockchain:
         }
         if data:
             transaction['data'] = data
-        # estimate gas
-        gas = await self.estimate_gas(chain_id, transaction)
         transaction['gas'] = gas
-        # gas price
-        gas_price = await self.get_gas_price(chain_id, gas_level)
         transaction.update(gas_price)
         return transaction
 
+    async def get_nonces(self, chain_id: int, address, count: int) -> int:
+        """
+        get the first of `count` consecutive nonces for the address
+
+        Reserved as one range with the nonce manager enabled, otherwise
+        counted from the pending transaction count.
+        """
+        if self.nonce_manager is not None:
+            try:
+                return await self.nonce_manager.reserve_range(chain_id, address, count)
+            except RedisError as e:
+                logger.warning(f"Nonce manager unavailable, using pending count: {e}")
+        return await self.get_pending_nonce(chain_id, address)
+
+    async def assemble_unsigned_transactions(self, chain_id: int, from_address: str,
+                                             transactions: list[dict[str, Any]],
+                                             gas_level: str = "normal") -> list[Any]:
+        """
+        assemble many unsigned transactions from one sender
+
+        Fee data is fetched once for the whole batch and gas is estimated
+        concurrently, once per distinct (to, value, data) call. Transactions
+        whose estimate failed get no nonce; the others get consecutive
+        nonces in request order.
+
+        Args:
+            chain_id: Chain ID
+            from_address: Sender address
+            transactions: Calls with 'to', 'value' and optional 'data'
+            gas_level: Gas level (slow/normal/fast)
+
+        Returns:
+            list: Unsigned transaction, or the exception raised for it, per call
+        """
+        semaphore = asyncio.Semaphore(BATCH_ESTIMATE_CONCURRENCY)
+        estimates: dict[tuple, asyncio.Future] = {}
+
+        async def estimate(call: dict[str, Any]) -> int:
+            async with semaphore:
+                return await self.estimate_gas(chain_id, call)
+
+        calls = []
+        for tx in transactions:
+            call = {'from': from_address, 'to': tx['to'], 'value': tx['value']}
+            if tx.get('data'):
+                call['data'] = tx['data']
+            shape = (call['to'], call['value'], call.get('data'))
+            if shape not in estimates:
+                estimates[shape] = asyncio.ensure_future(estimate(call))
+            calls.append((call, estimates[shape]))
+
+        with self.metrics.timer("assemble_batch"):
+            gas_price, *_ = await asyncio.gather(
+                self._timed("assemble_batch.gas_price", self.get_gas_price(chain_id, gas_level)),
+                self._timed("assemble_batch.estimate_gas",
+                            asyncio.gather(*estimates.values(), return_exceptions=True)))
+            assembled = sum(1 for _, gas in calls if gas.exception() is None)
+            nonce = await self.get_nonces(chain_id, from_address, assembled) if assembled else 0
+        self.metrics.record("assemble_batch_size", len(transactions))
+
+        results: list[Any] = []
+        for call, gas in calls:
+            if gas.exception() is not None:
+                results.append(gas.exception())
+                continue
+            transaction = {
+                'from': from_address,
+                'to': call['to'],
+                'value': call['value'],
+                'nonce': nonce,
+                'chainId': chain_id,
+            }
+            if 'data' in call:
+                transaction['data'] = call['data']
+            transaction['gas'] = gas.result()
+            transaction.update(gas_price)
+            results.append(transaction)
+            nonce += 1
+        return results
+
     async def send_raw_transaction(self, chain_id: int, raw_tx) -> str:
-        """ send a raw transaction """
-        web3 = self._get_web3_instance(chain_id)
-        tx_hash = await web3.eth.send_raw_transaction(raw_tx)
+        """
+        send a raw transaction
+
+        With the nonce manager enabled, the nonce of the transaction is
+        marked as sent, or released for reuse if the node rejected it.
+        """
+        pool = self._get_provider_pool(chain_id)
+        try:
+            # a broadcast is not retried elsewhere, its outcome may be unknown
+            tx_hash = await pool.call(lambda web3: web3.eth.send_raw_transaction(raw_tx),
+                                      failover=False)
+        except Exception as e:
+            await self._settle_nonce(chain_id, raw_tx, sent=any(
+                marker in str(e).lower() for marker in NONCE_USED_MARKERS))
+            raise
+        await self._settle_nonce(chain_id, raw_tx, sent=True)
         return tx_hash.hex()
 
+    async def _settle_nonce(self, chain_id: int, raw_tx, sent: bool) -> None:
+        """ mark the nonce of a raw transaction as sent or release it """
+        if self.nonce_manager is None:
+            return
+        try:
+            sender, nonce = transaction_sender_and_nonce(raw_tx)
+            if sent:
+                await self.nonce_manager.confirm(chain_id, sender, nonce)
+            else:
+                await self.nonce_manager.release(chain_id, sender, nonce)
+        except (ValueError, RedisError) as e:
+            logger.warning(f"Failed to settle nonce of a raw transaction: {e}")
+
     async def get_transaction_receipt(self, chain_id: int, tx_hash):
         """ get transaction receipt """
-        web3 = self._get_web3_instance(chain_id)
-        return await web3.eth.get_transaction_receipt(tx_hash)
+        pool = self._get_provider_pool(chain_id)
+        return await pool.call(lambda web3: web3.eth.get_transaction_receipt(tx_hash))
 
     async def wait_for_transaction_receipt(self, chain_id: int, tx_hash):
         """ wait for transaction receipt """
         web3 = self._get_web3_instance(chain_id)
         return await web3.eth.wait_for_transaction_receipt(tx_hash)
+
+    def provider_states(self) -> dict[int, dict[str, Any]]:
+        """ health of the rpc endpoints of every chain in use """
+        return {chain_id: pool.state() for chain_id, pool in self.provider_pools.items()}
+
+    def fee_tracker_states(self) -> dict[int, dict[str, Any]]:
+        """ summary of the fee history tracked for every chain in use """
+        return {chain_id: tracker.state() for chain_id, tracker in self.fee_trackers.items()}
+
+    async def close(self) -> None:
+        """ stop the background tasks and close the nonce manager """
+        if self._chains_refresher is not None:
+            self._chains_refresher.cancel()
+            try:
+                await self._chains_refresher
+            except asyncio.CancelledError:
+                pass
+            self._chains_refresher = None
+        for tracker in self.fee_trackers.values():
+            await tracker.close()
+        for pool in self.provider_pools.values():
+            await pool.close()
+        if self.nonce_manager is not None:
+            await self.nonce_manager.close()
@@ -0,0 +1,225 @@
+"""
+Fee Tracker Module
+
+This module keeps recent EIP-1559 fee data of a chain in memory:
+- Background polling of `eth_feeHistory` as new blocks arrive
+- Ring buffer of base fees and priority fee percentiles per block
+- Fee estimates for any percentile set computed without RPC calls
+- Polling stopped once the chain is idle, resumed on the next use
+"""
+
+import asyncio
+import logging
+from collections import deque
+from itertools import islice
+from time import monotonic
+from typing import Any, NamedTuple, Optional
+
+from web3gateway.gateway_blockchain.provider_pool import ProviderPool
+
+
+logger = logging.getLogger(__name__)
+
+# Blocks fetched per poll once the buffer is filled
+POLL_BLOCKS = 4
+# Seconds before a chain without base fees is probed again
+UNSUPPORTED_RECHECK_INTERVAL = 600
+
+# Defaults of the optional fee_* settings
+DEFAULT_POLL_INTERVAL = 2
+DEFAULT_HISTORY_BLOCKS = 20
+DEFAULT_ESTIMATE_BLOCKS = 3
+DEFAULT_MAX_AGE = 30
+DEFAULT_IDLE_TIMEOUT = 300
+
+
+class FeeBlock(NamedTuple):
+    """ fee data of one block """
+    number: int
+    base_fee: int
+    gas_used_ratio: float
+    rewards: tuple[int, ...]
+
+
+class FeeTracker:
+    """
+    Rolling fee history of one chain.
+
+    Every poll fetches the fee history of the last few blocks for the
+    tracked percentiles and appends the blocks not seen yet to a ring
+    buffer; after a gap the whole buffer is refetched. Estimates average
+    the rewards of the requested percentiles over the newest blocks.
+
+    Polling runs while the tracker is used: the loop stops once `start`
+    has not been called for `idle_timeout` seconds. A chain reporting no
+    base fees is not EIP-1559 and is probed again after
+    `UNSUPPORTED_RECHECK_INTERVAL` seconds; an empty or partial history,
+    as a lagging node may return, only fails that poll.
+
+    Attributes:
+        chain_id (int): Chain the fees belong to
+        percentiles (list[float]): Reward percentiles tracked per block
+        blocks (deque[FeeBlock]): Newest blocks, oldest first
+        next_base_fee (Optional[int]): Base fee of the next block
+        supported (bool): False while the chain reports no base fees (not EIP-1559)
+        recheck_at (float): Monotonic time an unsupported chain is probed again
+        updated_at (float): Monotonic time of the last successful poll
+        used_at (float): Monotonic time of the last `start` call
+
+    Example:
+        tracker = FeeTracker(1, pool, [10.0, 50.0, 90.0], config)
+        await tracker.refresh()
+        fees = tracker.estimate([50.0])
+    """
+
+    def __init__(self, chain_id: int, pool: ProviderPool, percentiles: list[float],
+                 config: dict[str, Any]):
+        """
+        Initialize fee tracker.
+
+        Args:
+            chain_id: Chain the fees belong to
+            pool: Provider pool of the chain
+            percentiles: Reward percentiles to track
+            config: Configuration dictionary, optionally containing:
+                - fee_poll_interval: Seconds between polls
+                - fee_history_blocks: Blocks kept in the ring buffer
+                - fee_estimate_blocks: Newest blocks averaged by estimates
+                - fee_max_age: Seconds after which the data is not trusted
+                - fee_idle_timeout: Seconds without use before polling stops
+        """
+        self.chain_id = chain_id
+        self.pool = pool
+        self.percentiles = sorted(percentiles)
+        self.poll_interval = config.get('fee_poll_interval', DEFAULT_POLL_INTERVAL)
+        self.estimate_blocks = config.get('fee_estimate_blocks', DEFAULT_ESTIMATE_BLOCKS)
+        self.max_age = config.get('fee_max_age', DEFAULT_MAX_AGE)
+        self.idle_timeout = config.get('fee_idle_timeout', DEFAULT_IDLE_TIMEOUT)
+        self.blocks: deque[FeeBlock] = deque(
+            maxlen=max(config.get('fee_history_blocks', DEFAULT_HISTORY_BLOCKS),
+                       self.estimate_blocks))
+        self.next_base_fee: Optional[int] = None
+        self.supported = True
+        self.recheck_at = 0.0
+        self.updated_at = 0.0
+        self.used_at = 0.0
+        self._columns = {percentile: i for i, percentile in enumerate(self.percentiles)}
+        self._lock = asyncio.Lock()
+        self._poller: Optional[asyncio.Task] = None
+
+    def ready(self) -> bool:
+        """ whether estimates can be served from memory """
+        return (self.supported and len(self.blocks) > 0
+                and monotonic() - self.updated_at < self.max_age)
+
+    def due(self) -> bool:
+        """ whether the fee history should be fetched: supported, or time to probe again """
+        return self.supported or monotonic() >= self.recheck_at
+
+    async def refresh(self) -> None:
+        """
+        Poll the fee history and append the new blocks.
+
+        Raises:
+            ValueError: If the history is empty or partial
+            Exception: Whatever the RPC call raised
+        """
+        async with self._lock:
+            if not self.blocks:
+                await self._fetch(self.blocks.maxlen)
+            elif not await self._fetch(POLL_BLOCKS):
+                # missed blocks since the last poll: start over
+                self.blocks.clear()
+                await self._fetch(self.blocks.maxlen)
+
+    async def _fetch(self, count: int) -> bool:
+        """ fetch the last `count` blocks; False if they do not follow the buffer """
+        history = await self.pool.call(
+            lambda web3: web3.eth.fee_history(count, 'latest', self.percentiles))
+        rewards = history.get('reward')
+        base_fees = history.get('baseFeePerGas')
+        if not base_fees or not any(base_fees):
+            self.supported = False
+            self.recheck_at = monotonic() + UNSUPPORTED_RECHECK_INTERVAL
+            self.blocks.clear()
+            return True
+        if (not rewards or len(base_fees) != len(rewards) + 1
+                or any(len(row) != len(self.percentiles) for row in rewards)):
+            raise ValueError(f"Chain {self.chain_id}: incomplete fee history")
+        self.supported = True
+        oldest = history['oldestBlock']
+        if self.blocks and oldest > self.blocks[-1].number + 1:
+            return False
+        for i, block_rewards in enumerate(rewards):
+            number = oldest + i
+            if self.blocks and number <= self.blocks[-1].number:
+                continue
+            self.blocks.append(FeeBlock(number, base_fees[i], history['gasUsedRatio'][i],
+                                        tuple(block_rewards)))
+        # the last base fee is the one of the block after the newest
+        self.next_base_fee = base_fees[-1]
+        self.updated_at = monotonic()
+        return True
+
+    def estimate(self, percentiles: list[float], blocks: Optional[int] = None) -> dict[str, int]:
+        """
+        Estimate EIP-1559 fees from memory.
+
+        Args:
+            percentiles: Reward percentiles to average, all tracked
+            blocks: Newest blocks to average over (estimate_blocks if None)
+
+        Returns:
+            dict[str, int]: maxPriorityFeePerGas and maxFeePerGas in Wei
+
+        Raises:
+            KeyError: If a percentile is not tracked
+        """
+        columns = [self._columns[percentile] for percentile in percentiles]
+        newest = list(islice(reversed(self.blocks), blocks or self.estimate_blocks))
+        rewards = [block.rewards[column] for block in newest for column in columns]
+        avg_reward = sum(rewards) // len(rewards)
+        # twice the next base fee, the difference is always refunded
+        return {"maxPriorityFeePerGas": avg_reward,
+                "maxFeePerGas": avg_reward + self.next_base_fee * 2}
+
+    def state(self) -> dict[str, Any]:
+        """
+        Get a JSON-friendly summary of the tracked history.
+
+        Returns:
+            dict[str, Any]: Newest block, next base fee, buffer size and data age
+        """
+        return {
+            "block": self.blocks[-1].number if self.blocks else None,
+            "baseFeePerGas": self.next_base_fee,
+            "blocks": len(self.blocks),
+            "age_seconds": round(monotonic() - self.updated_at, 3) if self.updated_at else None,
+        }
+
+    def start(self) -> None:
+        """ record a use and start the background poll loop if it is not running """
+        self.used_at = monotonic()
+        if self.poll_interval > 0 and (self._poller is None or self._poller.done()):
+            self._poller = asyncio.ensure_future(self._poll_loop())
+
+    async def _poll_loop(self) -> None:
+        """ refresh every poll_interval seconds until unused for idle_timeout """
+        while monotonic() - self.used_at < self.idle_timeout:
+            await asyncio.sleep(self.poll_interval)
+            if not self.due():
+                continue
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f"Chain {self.chain_id}: fee history poll failed: {e}")
+
+    async def close(self) -> None:
+        """ Stop the background poll loop. """
+        if self._poller is not None:
+            self._poller.cancel()
+            try:
+                await self._poller
+            except asyncio.CancelledError:
+                pass
+            self._poller = None
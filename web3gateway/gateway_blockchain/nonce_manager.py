@@ -0,0 +1,371 @@
+"""
+Nonce Manager Module
+
+This module hands out transaction nonces from Redis so every worker agrees:
+- Atomic reservation of the next nonce of a sender (no RPC on the hot path)
+- Initial sync from the sender's `pending` transaction count
+- Release of reserved nonces whose transaction was never sent
+- Periodic gap repair against the node's `pending` count
+- Opt-in reuse of nonces left unseen by the node for too long
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Optional
+
+import rlp
+from eth_account import Account
+from hexbytes import HexBytes
+
+
+logger = logging.getLogger(__name__)
+
+# Seconds an idle sender's nonce state is kept in Redis
+NONCE_KEY_TTL = 86400
+# Nonces checked per sender by one gap repair
+MAX_REPAIR_GAP = 1000
+# Send errors meaning the nonce is used on chain and must not be reused
+NONCE_USED_MARKERS = ("already known", "nonce too low", "already imported")
+
+# Defaults of the optional nonce_* settings (0: unseen nonces are never reused)
+DEFAULT_RESERVATION_TIMEOUT = 0
+DEFAULT_REPAIR_INTERVAL = 30
+
+# Nonce state of a sender:
+#   KEYS[1] next nonce to hand out (string)
+#   KEYS[2] reserved nonces, scored by reservation time (zset)
+#   KEYS[3] sent nonces not yet seen by the node, scored by send time (zset)
+#   KEYS[4] released nonces to hand out again, scored by nonce (zset)
+
+# Reserve the lowest released nonce, or the next one; -1 if not synced yet
+RESERVE_SCRIPT = """
+local now = tonumber(redis.call("TIME")[1])
+local nonce
+local released = redis.call("ZPOPMIN", KEYS[4])
+if #released > 0 then
+    nonce = tonumber(released[1])
+else
+    local next_nonce = redis.call("GET", KEYS[1])
+    if not next_nonce then
+        return -1
+    end
+    nonce = tonumber(next_nonce)
+    redis.call("SET", KEYS[1], nonce + 1)
+end
+redis.call("ZADD", KEYS[2], now, nonce)
+for i = 1, 4 do
+    redis.call("EXPIRE", KEYS[i], ARGV[1])
+end
+return nonce
+"""
+
+# Reserve ARGV[1] consecutive new nonces, return the first; -1 if not synced yet
+RESERVE_RANGE_SCRIPT = """
+local next_nonce = redis.call("GET", KEYS[1])
+if not next_nonce then
+    return -1
+end
+local first = tonumber(next_nonce)
+local count = tonumber(ARGV[1])
+local now = tonumber(redis.call("TIME")[1])
+redis.call("SET", KEYS[1], first + count)
+for nonce = first, first + count - 1 do
+    redis.call("ZADD", KEYS[2], now, nonce)
+end
+for i = 1, 4 do
+    redis.call("EXPIRE", KEYS[i], ARGV[2])
+end
+return first
+"""
+
+# Start handing out nonces at the pending count unless already ahead
+SYNC_SCRIPT = """
+local pending = tonumber(ARGV[1])
+local next_nonce = tonumber(redis.call("GET", KEYS[1]) or pending)
+if next_nonce < pending then
+    next_nonce = pending
+end
+redis.call("SET", KEYS[1], next_nonce, "EX", ARGV[2])
+return next_nonce
+"""
+
+# Move a reserved nonce to the sent set
+CONFIRM_SCRIPT = """
+if redis.call("ZREM", KEYS[2], ARGV[1]) == 1 then
+    redis.call("ZADD", KEYS[3], tonumber(redis.call("TIME")[1]), ARGV[1])
+    return 1
+end
+return 0
+"""
+
+# Make a reserved or sent nonce available again
+RELEASE_SCRIPT = """
+if redis.call("ZREM", KEYS[2], ARGV[1]) + redis.call("ZREM", KEYS[3], ARGV[1]) > 0 then
+    redis.call("ZADD", KEYS[4], ARGV[1], ARGV[1])
+    return 1
+end
+return 0
+"""
+
+# Drop nonces below the pending count, release stale reservations and
+# sends if ARGV[2] > 0, and release every nonce between pending and next
+# nobody tracks
+REPAIR_SCRIPT = """
+local pending = tonumber(ARGV[1])
+local timeout = tonumber(ARGV[2])
+local stale_before = nil
+if timeout > 0 then
+    stale_before = tonumber(redis.call("TIME")[1]) - timeout
+end
+local next_nonce = tonumber(redis.call("GET", KEYS[1]) or pending)
+if next_nonce < pending then
+    next_nonce = pending
+end
+redis.call("SET", KEYS[1], next_nonce, "EX", ARGV[3])
+redis.call("ZREMRANGEBYSCORE", KEYS[4], "-inf", "(" .. pending)
+local tracked = {}
+for _, key in ipairs({KEYS[2], KEYS[3]}) do
+    local entries = redis.call("ZRANGE", key, 0, -1, "WITHSCORES")
+    for i = 1, #entries, 2 do
+        local nonce = tonumber(entries[i])
+        if nonce < pending then
+            redis.call("ZREM", key, entries[i])
+        elseif stale_before and tonumber(entries[i + 1]) <= stale_before then
+            redis.call("ZREM", key, entries[i])
+            redis.call("ZADD", KEYS[4], nonce, nonce)
+        else
+            tracked[nonce] = true
+        end
+    end
+end
+local last = math.min(next_nonce, pending + tonumber(ARGV[4])) - 1
+for nonce = pending, last do
+    if not tracked[nonce] then
+        redis.call("ZADD", KEYS[4], "NX", nonce, nonce)
+    end
+end
+return redis.call("ZCARD", KEYS[4])
+"""
+
+
+def transaction_sender_and_nonce(raw_tx: Any) -> tuple[str, int]:
+    """
+    Read the sender and nonce of a signed raw transaction.
+
+    Args:
+        raw_tx: Signed transaction as hex string or bytes
+
+    Returns:
+        tuple[str, int]: Checksum sender address and nonce
+
+    Raises:
+        ValueError: If the transaction cannot be decoded
+    """
+    raw = HexBytes(raw_tx)
+    try:
+        sender = Account.recover_transaction(raw)
+        if raw[0] >= 0xc0:
+            # legacy: rlp([nonce, gasPrice, ...])
+            nonce_field = rlp.decode(raw)[0]
+        else:
+            # typed: type || rlp([chainId, nonce, ...]), blob network form
+            # wraps the fields in an outer list
+            fields = rlp.decode(raw[1:])
+            nonce_field = (fields[0] if isinstance(fields[0], list) else fields)[1]
+    except Exception as e:
+        raise ValueError(f"Cannot decode raw transaction: {e}")
+    return sender, int.from_bytes(nonce_field, "big")
+
+
+class NonceManager:
+    """
+    Redis-backed nonce allocator shared by all workers.
+
+    Every nonce between the node's pending count and the next nonce to hand
+    out is in exactly one state: reserved (assembled), sent (broadcast, not
+    yet seen by the node) or released (free to hand out again, lowest
+    first). A reserved or sent nonce leaves its state only once the node's
+    pending count passes it, or when it is released explicitly.
+
+    The node cannot tell a nonce that was never used from one whose
+    transaction it has not seen yet (slow signer, congested mempool,
+    lagging provider), so unseen nonces are never reused by default.
+    With a `reservation_timeout` the gap repair releases nonces unseen
+    for that long: a transaction broadcast later with such a nonce then
+    competes with the next one assembled, and one of them is replaced
+    or dropped.
+
+    Attributes:
+        redis: Async Redis client
+        reservation_timeout (float): Seconds before an unseen nonce is reused
+            (0 never reuses them)
+        repair_interval (float): Seconds between gap repairs (0 disables them)
+
+    Example:
+        nonces = NonceManager(redis, fetch_pending_count, config)
+        nonce = await nonces.reserve(1, address)
+        ...
+        await nonces.confirm(1, address, nonce)  # or release() if not sent
+    """
+
+    def __init__(self, redis: Any, fetch_pending: Callable[[int, str], Awaitable[int]],
+                 config: dict[str, Any]):
+        """
+        Initialize nonce manager.
+
+        Args:
+            redis: Async Redis client (decode_responses=True)
+            fetch_pending: Coroutine function returning the `pending`
+                transaction count of (chain_id, address)
+            config: Configuration dictionary, optionally containing:
+                - nonce_reservation_timeout: Seconds before an unseen nonce is
+                  reused (0, the default, never reuses them)
+                - nonce_repair_interval: Seconds between gap repairs
+        """
+        self.redis = redis
+        self.fetch_pending = fetch_pending
+        self.reservation_timeout = config.get('nonce_reservation_timeout',
+                                              DEFAULT_RESERVATION_TIMEOUT)
+        self.repair_interval = config.get('nonce_repair_interval', DEFAULT_REPAIR_INTERVAL)
+        self._reserve = redis.register_script(RESERVE_SCRIPT)
+        self._reserve_range = redis.register_script(RESERVE_RANGE_SCRIPT)
+        self._sync = redis.register_script(SYNC_SCRIPT)
+        self._confirm = redis.register_script(CONFIRM_SCRIPT)
+        self._release = redis.register_script(RELEASE_SCRIPT)
+        self._repair = redis.register_script(REPAIR_SCRIPT)
+        self._senders: set[tuple[int, str]] = set()
+        self._repairer: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _keys(chain_id: int, address: str) -> list[str]:
+        """ redis keys of a sender's nonce state """
+        prefix = f"web3gateway:nonce:{chain_id}:{address.lower()}"
+        return [prefix, f"{prefix}:reserved", f"{prefix}:sent", f"{prefix}:released"]
+
+    async def reserve(self, chain_id: int, address: str) -> int:
+        """
+        Reserve the next nonce of a sender.
+
+        Only the first reservation of a sender (or the first after its state
+        expired) queries the node for the `pending` count.
+
+        Args:
+            chain_id: Chain ID
+            address: Sender address
+
+        Returns:
+            int: Reserved nonce
+
+        Raises:
+            redis.RedisError: If Redis is unavailable
+        """
+        keys = self._keys(chain_id, address)
+        self._track(chain_id, address)
+        nonce = int(await self._reserve(keys=keys, args=[NONCE_KEY_TTL]))
+        if nonce < 0:
+            pending = await self.fetch_pending(chain_id, address)
+            await self._sync(keys=keys[:1], args=[pending, NONCE_KEY_TTL])
+            nonce = int(await self._reserve(keys=keys, args=[NONCE_KEY_TTL]))
+        return nonce
+
+    async def reserve_range(self, chain_id: int, address: str, count: int) -> int:
+        """
+        Reserve `count` consecutive new nonces of a sender.
+
+        Released nonces are left for single reservations so the range has
+        no holes.
+
+        Args:
+            chain_id: Chain ID
+            address: Sender address
+            count: Number of nonces to reserve
+
+        Returns:
+            int: First nonce of the range
+
+        Raises:
+            redis.RedisError: If Redis is unavailable
+        """
+        keys = self._keys(chain_id, address)
+        self._track(chain_id, address)
+        first = int(await self._reserve_range(keys=keys, args=[count, NONCE_KEY_TTL]))
+        if first < 0:
+            pending = await self.fetch_pending(chain_id, address)
+            await self._sync(keys=keys[:1], args=[pending, NONCE_KEY_TTL])
+            first = int(await self._reserve_range(keys=keys, args=[count, NONCE_KEY_TTL]))
+        return first
+
+    async def confirm(self, chain_id: int, address: str, nonce: int) -> bool:
+        """
+        Mark a reserved nonce as sent.
+
+        Args:
+            chain_id: Chain ID
+            address: Sender address
+            nonce: Nonce of the broadcast transaction
+
+        Returns:
+            bool: True if the nonce was reserved
+        """
+        return bool(await self._confirm(keys=self._keys(chain_id, address), args=[nonce]))
+
+    async def release(self, chain_id: int, address: str, nonce: int) -> bool:
+        """
+        Make a nonce whose transaction was not sent available again.
+
+        Args:
+            chain_id: Chain ID
+            address: Sender address
+            nonce: Nonce to hand out again
+
+        Returns:
+            bool: True if the nonce was reserved or sent
+        """
+        return bool(await self._release(keys=self._keys(chain_id, address), args=[nonce]))
+
+    async def repair(self, chain_id: int, address: str) -> int:
+        """
+        Reconcile a sender's nonce state with the node's `pending` count.
+
+        Args:
+            chain_id: Chain ID
+            address: Sender address
+
+        Returns:
+            int: Nonces released for reuse (the gaps to fill)
+        """
+        pending = await self.fetch_pending(chain_id, address)
+        return int(await self._repair(
+            keys=self._keys(chain_id, address),
+            args=[pending, self.reservation_timeout, NONCE_KEY_TTL, MAX_REPAIR_GAP]))
+
+    def _track(self, chain_id: int, address: str) -> None:
+        """ remember a sender for the repair loop and start it on first use """
+        self._senders.add((chain_id, address))
+        if self.repair_interval > 0 and (self._repairer is None or self._repairer.done()):
+            self._repairer = asyncio.ensure_future(self._repair_loop())
+
+    async def _repair_loop(self) -> None:
+        """ repair every sender seen by this process every repair_interval seconds """
+        while True:
+            await asyncio.sleep(self.repair_interval)
+            for chain_id, address in list(self._senders):
+                try:
+                    gaps = await self.repair(chain_id, address)
+                except Exception as e:
+                    logger.warning(f"Nonce repair of {address} on chain {chain_id} failed: {e}")
+                    continue
+                if gaps:
+                    logger.info(f"Nonce repair of {address} on chain {chain_id}: "
+                                f"{gaps} nonces to reuse")
+
+    async def close(self) -> None:
+        """ Stop the repair loop and close the Redis connection. """
+        if self._repairer is not None:
+            self._repairer.cancel()
+            try:
+                await self._repairer
+            except asyncio.CancelledError:
+                pass
+            self._repairer = None
+        await self.redis.aclose()
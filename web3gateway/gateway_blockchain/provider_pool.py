@@ -0,0 +1,363 @@
+"""
+RPC Provider Pool Module
+
+This module spreads the JSON-RPC calls of one chain over all its RPC urls:
+- Rolling latency and error rate per endpoint
+- Calls routed to the healthiest endpoint, failing over to the next one
+- Ejection of failing or lagging endpoints, re-admission after a backoff
+- Background probing of every endpoint with `eth_blockNumber`
+"""
+
+import asyncio
+import logging
+from collections import deque
+from time import monotonic, perf_counter
+from typing import Any, Awaitable, Callable, Optional
+
+import aiohttp
+import requests
+from web3 import AsyncHTTPProvider, AsyncWeb3
+from web3.exceptions import (
+    ContractLogicError,
+    MethodUnavailable,
+    ProviderConnectionError,
+    RequestTimedOut,
+    Web3RPCError,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Weight of the newest sample in the rolling latency average
+LATENCY_SMOOTHING = 0.3
+# Number of recent calls the error rate is computed over
+ERROR_WINDOW = 20
+# Score penalty of a 100% error rate, as a latency multiplier
+ERROR_PENALTY = 10
+# Longest ejection, in seconds, reached by doubling the configured one
+MAX_EJECT_SECONDS = 300
+# RPC error messages meaning the endpoint, not the request, is at fault
+PROVIDER_ERROR_MARKERS = ("rate limit", "limit exceeded", "too many requests",
+                          "capacity", "overloaded", "unavailable")
+# Errors of the transport to the endpoint, always blamed on the endpoint
+TRANSPORT_ERRORS = (aiohttp.ClientError, requests.ConnectionError, requests.Timeout,
+                    ConnectionError, asyncio.TimeoutError, RequestTimedOut,
+                    ProviderConnectionError, MethodUnavailable)
+
+# Defaults of the optional rpc_* settings
+DEFAULT_PROBE_INTERVAL = 30
+DEFAULT_REQUEST_TIMEOUT = 10
+DEFAULT_EJECT_AFTER_FAILURES = 3
+DEFAULT_EJECT_SECONDS = 30
+DEFAULT_MAX_BLOCK_LAG = 5
+DEFAULT_MAX_ENDPOINTS = 8
+
+
+def usable_rpc_urls(rpc_urls: list[str]) -> list[str]:
+    """ keep the http(s) urls that need no unresolved api key """
+    return [url for url in dict.fromkeys(rpc_urls)
+            if url.startswith(("http://", "https://")) and "${" not in url]
+
+
+def _http_status(e: BaseException) -> Optional[int]:
+    """ status of an HTTP error response, None for other errors """
+    if isinstance(e, aiohttp.ClientResponseError):
+        return e.status
+    if isinstance(e, requests.HTTPError) and e.response is not None:
+        return e.response.status_code
+    return None
+
+
+def is_provider_error(e: BaseException) -> bool:
+    """
+    Tell endpoint failures apart from errors about the request itself.
+
+    Connection errors, timeouts, HTTP 429 and 5xx responses and rate limit
+    JSON-RPC errors are blamed on the endpoint and trigger a failover.
+    Anything else (reverts, invalid params or addresses, validation
+    errors) would fail the same way on every endpoint and is raised as-is.
+    """
+    status = _http_status(e)
+    if status is not None:
+        return status == 429 or status >= 500
+    if isinstance(e, TRANSPORT_ERRORS):
+        return True
+    if isinstance(e, (Web3RPCError, ContractLogicError)):
+        message = str(e).lower()
+        return any(marker in message for marker in PROVIDER_ERROR_MARKERS)
+    return False
+
+
+class RpcEndpoint:
+    """
+    One RPC url with its health statistics.
+
+    Attributes:
+        url (str): RPC url
+        web3 (AsyncWeb3): Client bound to the url
+        latency (Optional[float]): Rolling average latency in seconds
+        outcomes (deque[bool]): Success flags of the most recent calls
+        consecutive_failures (int): Failures since the last success
+        ejections (int): Ejections in a row, drives the backoff
+        ejected_until (float): Monotonic time the endpoint is out until
+        block_number (int): Latest block seen by the last probe
+    """
+
+    def __init__(self, url: str):
+        """
+        Initialize endpoint.
+
+        Args:
+            url: RPC url
+        """
+        self.url = url
+        # retries are done across endpoints by the pool, not by web3; the
+        # chain id, checked by web3 around every transaction call, never changes
+        self.web3 = AsyncWeb3(AsyncHTTPProvider(
+            url, exception_retry_configuration=None,
+            cache_allowed_requests=True, cacheable_requests={"eth_chainId"},
+            request_cache_validation_threshold=None))
+        self.latency: Optional[float] = None
+        self.outcomes: deque[bool] = deque(maxlen=ERROR_WINDOW)
+        self.consecutive_failures = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+        self.block_number = 0
+
+    def error_rate(self) -> float:
+        """ share of failed calls in the rolling window """
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def ejected(self) -> bool:
+        """ whether the endpoint is temporarily out of rotation """
+        return monotonic() < self.ejected_until
+
+    def score(self) -> float:
+        """ lower is healthier; unmeasured endpoints go first so they get measured """
+        if self.latency is None:
+            return 0.0
+        return self.latency * (1 + ERROR_PENALTY * self.error_rate())
+
+    def record_success(self, seconds: float) -> None:
+        """ account a successful call and re-admit the endpoint """
+        if self.latency is None:
+            self.latency = seconds
+        else:
+            self.latency += LATENCY_SMOOTHING * (seconds - self.latency)
+        self.outcomes.append(True)
+        self.consecutive_failures = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+
+    def record_failure(self) -> None:
+        """ account a failed call """
+        self.outcomes.append(False)
+        self.consecutive_failures += 1
+
+    def eject(self, seconds: float) -> None:
+        """ take the endpoint out, doubling the time on repeated ejections """
+        self.ejected_until = monotonic() + min(seconds * 2 ** self.ejections, MAX_EJECT_SECONDS)
+        self.ejections += 1
+
+    def state(self) -> dict[str, Any]:
+        """
+        Get a JSON-friendly view of the endpoint health.
+
+        Returns:
+            dict[str, Any]: Url, latency, error rate, block and ejection state
+        """
+        return {
+            "url": self.url,
+            "latency_ms": round(self.latency * 1000, 3) if self.latency is not None else None,
+            "error_rate": round(self.error_rate(), 4),
+            "block_number": self.block_number,
+            "ejected_seconds": round(max(0.0, self.ejected_until - monotonic()), 3),
+        }
+
+
+class ProviderPool:
+    """
+    Health-scored pool of the RPC endpoints of one chain.
+
+    Calls go to the endpoint with the lowest latency weighted by its error
+    rate. Provider errors (see `is_provider_error`) fail over to the next
+    endpoint; an endpoint failing `eject_after_failures` times in a row, or
+    lagging more than `max_block_lag` blocks behind the others, is ejected
+    and re-admitted once its backoff elapsed and it answers again.
+
+    Attributes:
+        chain_id (int): Chain the endpoints serve
+        endpoints (list[RpcEndpoint]): Candidate endpoints
+        failovers (int): Calls retried on another endpoint
+
+    Example:
+        pool = ProviderPool(1, ["https://rpc-a", "https://rpc-b"], config)
+        nonce = await pool.call(lambda w3: w3.eth.get_transaction_count(address))
+    """
+
+    def __init__(self, chain_id: int, rpc_urls: list[str], config: dict[str, Any]):
+        """
+        Initialize provider pool.
+
+        Args:
+            chain_id: Chain the endpoints serve
+            rpc_urls: Candidate RPC urls, in preference order
+            config: Configuration dictionary, optionally containing:
+                - rpc_probe_interval: Seconds between background probes
+                - rpc_request_timeout: Seconds before a call fails over
+                - rpc_eject_after_failures: Consecutive failures before ejection
+                - rpc_eject_seconds: First ejection time, doubled on repeats
+                - rpc_max_block_lag: Blocks an endpoint may lag behind
+                - rpc_max_endpoints: Maximum urls kept per chain
+
+        Raises:
+            ValueError: If none of the urls is usable
+        """
+        urls = usable_rpc_urls(rpc_urls)[:config.get('rpc_max_endpoints', DEFAULT_MAX_ENDPOINTS)]
+        if not urls:
+            raise ValueError(f"No usable rpc url found for Chain {chain_id}")
+        self.chain_id = chain_id
+        self.endpoints = [RpcEndpoint(url) for url in urls]
+        self.probe_interval = config.get('rpc_probe_interval', DEFAULT_PROBE_INTERVAL)
+        self.request_timeout = config.get('rpc_request_timeout', DEFAULT_REQUEST_TIMEOUT)
+        self.eject_after_failures = config.get('rpc_eject_after_failures',
+                                               DEFAULT_EJECT_AFTER_FAILURES)
+        self.eject_seconds = config.get('rpc_eject_seconds', DEFAULT_EJECT_SECONDS)
+        self.max_block_lag = config.get('rpc_max_block_lag', DEFAULT_MAX_BLOCK_LAG)
+        self.failovers = 0
+        self._prober: Optional[asyncio.Task] = None
+
+    def ranked(self) -> list[RpcEndpoint]:
+        """
+        Order endpoints from healthiest to least healthy.
+
+        Endpoints in rotation come first, by score. Ejected endpoints follow,
+        soonest re-admission first, so a call still has somewhere to go when
+        every endpoint is ejected.
+
+        Returns:
+            list[RpcEndpoint]: Endpoints in the order calls try them
+        """
+        admitted = [e for e in self.endpoints if not e.ejected()]
+        ejected = [e for e in self.endpoints if e.ejected()]
+        return (sorted(admitted, key=RpcEndpoint.score)
+                + sorted(ejected, key=lambda e: e.ejected_until))
+
+    def best(self) -> RpcEndpoint:
+        """ healthiest endpoint """
+        self._ensure_prober()
+        return self.ranked()[0]
+
+    async def call(self, fn: Callable[[AsyncWeb3], Awaitable[Any]], failover: bool = True) -> Any:
+        """
+        Run a JSON-RPC call on the healthiest endpoint.
+
+        Args:
+            fn: Function taking the endpoint's AsyncWeb3 and returning the call
+            failover: Retry provider errors on the other endpoints
+
+        Returns:
+            Any: Result of the call
+
+        Raises:
+            Exception: The request error, or the last provider error if
+                every endpoint tried failed
+        """
+        self._ensure_prober()
+        candidates = self.ranked() if failover else self.ranked()[:1]
+        last_error: Optional[BaseException] = None
+        for attempt, endpoint in enumerate(candidates):
+            if attempt:
+                self.failovers += 1
+                logger.warning(f"Chain {self.chain_id}: failing over to {endpoint.url} "
+                               f"after {type(last_error).__name__}")
+            start = perf_counter()
+            try:
+                result = await asyncio.wait_for(fn(endpoint.web3), self.request_timeout)
+            except Exception as e:
+                if not is_provider_error(e):
+                    # the endpoint answered, the request itself is wrong
+                    endpoint.record_success(perf_counter() - start)
+                    raise
+                self._record_failure(endpoint)
+                last_error = e
+                continue
+            endpoint.record_success(perf_counter() - start)
+            return result
+        if last_error is None:
+            raise ValueError(f"No rpc endpoint to call for Chain {self.chain_id}")
+        raise last_error
+
+    def _record_failure(self, endpoint: RpcEndpoint) -> None:
+        """ account a provider error and eject the endpoint if needed """
+        endpoint.record_failure()
+        if endpoint.consecutive_failures >= self.eject_after_failures and not endpoint.ejected():
+            endpoint.eject(self.eject_seconds)
+            logger.warning(f"Chain {self.chain_id}: ejected {endpoint.url} "
+                           f"after {endpoint.consecutive_failures} failures")
+
+    async def probe(self) -> None:
+        """
+        Measure every endpoint once with `eth_blockNumber`.
+
+        Ejected endpoints whose backoff elapsed are re-admitted when they
+        answer; endpoints lagging behind the highest block are ejected.
+        """
+        async def probe_one(endpoint: RpcEndpoint) -> None:
+            if endpoint.ejected():
+                return
+            start = perf_counter()
+            try:
+                endpoint.block_number = await asyncio.wait_for(
+                    endpoint.web3.eth.block_number, self.request_timeout)
+            except Exception:
+                self._record_failure(endpoint)
+                return
+            endpoint.record_success(perf_counter() - start)
+
+        await asyncio.gather(*(probe_one(e) for e in self.endpoints))
+        head = max(e.block_number for e in self.endpoints)
+        for endpoint in self.endpoints:
+            if (not endpoint.ejected() and endpoint.block_number
+                    and head - endpoint.block_number > self.max_block_lag):
+                logger.warning(f"Chain {self.chain_id}: ejected {endpoint.url}, "
+                               f"{head - endpoint.block_number} blocks behind")
+                endpoint.eject(self.eject_seconds)
+
+    def _ensure_prober(self) -> None:
+        """ start the background probe loop on first use """
+        if self.probe_interval > 0 and (self._prober is None or self._prober.done()):
+            self._prober = asyncio.ensure_future(self._probe_loop())
+
+    async def _probe_loop(self) -> None:
+        """ probe all endpoints every probe_interval seconds """
+        while True:
+            try:
+                await self.probe()
+            except Exception:
+                logger.exception(f"Chain {self.chain_id}: rpc probe failed")
+            await asyncio.sleep(self.probe_interval)
+
+    def state(self) -> dict[str, Any]:
+        """
+        Get the health of every endpoint.
+
+        Returns:
+            dict[str, Any]: Failover count and one entry per endpoint, healthiest first
+        """
+        return {"failovers": self.failovers,
+                "endpoints": [endpoint.state() for endpoint in self.ranked()]}
+
+    async def close(self) -> None:
+        """ Stop the background probe loop and close the endpoint sessions. """
+        if self._prober is not None:
+            self._prober.cancel()
+            try:
+                await self._prober
+            except asyncio.CancelledError:
+                pass
+            self._prober = None
+        for endpoint in self.endpoints:
+            await endpoint.web3.provider.disconnect()
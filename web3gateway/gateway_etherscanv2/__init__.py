@@ -4,25 +4,92 @@ Etherscan API V2 Client Module
 This module provides a comprehensive wrapper for the Etherscan V2 API with:
 - Multi-chain support via chainlist API
 - Rate limiting for API calls
-- Redis-based caching
+- Redis-based caching, "latest" results keyed by the chain head block
+- Stale-while-revalidate serving of expired entries
+- Raw JSON results, taken from the cache without decoding them
+- Auto-paginated list actions, prefetching the next page within the rate limit
+- Non-blocking pooled HTTP transport
 - Modular organization of API endpoints
 """
 
+import asyncio
 import json
+import logging
+import time
+from functools import partial
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
 from urllib.parse import urlencode
 
-import requests
-
+from web3gateway.config import data_folder
+from web3gateway.exceptions import CacheException
 from web3gateway.utils.cache import CacheService
-from web3gateway.utils.rate_limiter import RateLimiter
-
+from web3gateway.utils.cache_codec import CacheCodec
+from web3gateway.utils.cached_json_file import CachedJsonFile
+from web3gateway.utils.http_client import HttpClient
+from web3gateway.utils.metrics import Metrics
+from web3gateway.utils.single_flight import SingleFlight
+
+from .batching import MAX_BALANCEMULTI_ADDRESSES, BalanceBatcher
+from .head_watcher import HeadWatcher
+from .key_pool import ApiKey, ApiKeyPool
 from .metadata import valid_params
+from .pagination import DEFAULT_PAGE_SIZE, paginate
+from .ttl_policy import TtlPolicy
 
 
 CHAINLIST_URL = "https://api.etherscan.io/v2/chainlist"
+# Default of the optional chains_refresh_interval setting (a day)
+CHAINS_REFRESH_INTERVAL = 86400
+# Lower-cased fragment of Etherscan's "Max rate limit reached" errors
+RATE_LIMIT_ERROR = "rate limit reached"
+# Default seconds an entry lives in the in-process cache tier
+LOCAL_CACHE_TTL = 5
+# Seconds a distributed single-flight lock is held at most
+SINGLE_FLIGHT_LOCK_TIMEOUT = 10
+# Seconds between cache checks while another worker holds the lock
+SINGLE_FLIGHT_POLL_INTERVAL = 0.05
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_chainlist(document: Any) -> list[dict]:
+    """ validate a chainlist response and extract its chains """
+    if not isinstance(document, dict) or 'totalcount' not in document:
+        raise ValueError("Failed to fetch supported chains.")
+    return document['result']
+
+
+class _ApiModules:
+    """ API module instances shared by the client and its chain views """
+
+    def _init_api_modules(self) -> None:
+        """ create API module instances bound to this object """
+        from .accounts import Accounts
+        from .blocks import Blocks
+        from .chainspecific import ChainSpecific
+        from .contracts import Contracts
+        from .gastracker import GasTracker
+        from .geth_proxy import Proxy
+        from .logs import Logs
+        from .stats import Stats
+        from .tokens import Tokens
+        from .transaction import Transaction
+        from .usage import Usage
+
+        self.account = Accounts(self)
+        self.contract = Contracts(self)
+        self.transaction = Transaction(self)
+        self.block = Blocks(self)
+        self.logs = Logs(self)
+        self.proxy = Proxy(self)
+        self.tokens = Tokens(self)
+        self.gas_tracker = GasTracker(self)
+        self.stats = Stats(self)
+        self.chain_specific = ChainSpecific(self)
+        self.usage = Usage(self)
 
 
-class EtherScanV2:
+class EtherScanV2(_ApiModules):
     """
     Etherscan V2 API client with multi-chain support.
 
@@ -32,14 +99,22 @@ class EtherScanV2:
     Attributes:
         config (dict): Configuration parameters
         cache (CacheService): Redis cache instance
-        rate_limiter (RateLimiter): Rate limiting service
+        codec (CacheCodec): Encoding of cached values, shared with the cache
+        http (HttpClient): Shared pooled HTTP transport
+        metrics (Metrics): Request pipeline counters and stage timings
+        single_flight (SingleFlight): Coalesces concurrent identical requests
+        balance_batcher (Optional[BalanceBatcher]): Merges concurrent balance
+            lookups into balancemulti calls, None when disabled
+        key_pool (ApiKeyPool): API keys with per-key rate limiters and quotas
+        ttl_policy (TtlPolicy): Cache expiration per action
+        head_watcher (HeadWatcher): Head block per chain, the epoch of the
+            cache keys of "latest" queries
         chain_id (int): Currently selected chain ID
         chain_name (str): Currently selected chain name
 
     Example:
         client = await EtherScanV2.create(config)
-        client.set_chain_id(1)  # Select Ethereum mainnet
-        balance = await client.account.balance("0x...")
+        balance = await client.for_chain(1).account.balance("0x...")
     """
 
     def __init__(self, config: dict) -> None:
@@ -49,148 +124,718 @@ class EtherScanV2:
         Args:
             config: Configuration dictionary containing:
                 - redis_url: Redis connection string
-                - etherscan_api_key: Etherscan API key
-                - rate_limit settings
-                - cache_expiration settings
+                - etherscan_api_key: Etherscan API key, or a list of keys
+                - rate_limit settings applied per key (rate_limit_backend
+                  "redis" shares the budget across workers through the cache
+                  connection)
+                - etherscan_daily_quota, etherscan_key_cooldown (optional)
+                - cache_expiration settings (cache_expiration, and optionally
+                  cache_*_expiration per TTL class, cache_action_expiration,
+                  cache_finality_blocks and the cache_stale_window settings,
+                  see TtlPolicy)
+                - http_* connection pool settings (optional)
+                - etherscan_chainlist_url: Chainlist endpoint (optional)
+                - chains_refresh_interval: Seconds between background
+                  chainlist revalidations (optional, 0 disables them)
+                - cache_serializer, cache_compression, cache_compress_min_size:
+                  Encoding of cached values (optional, see CacheCodec)
+                - local_cache_size: In-process cache entries (optional, 0 disables)
+                - local_cache_ttl: In-process cache TTL in seconds (optional)
+                - local_cache_invalidation: Cross-worker invalidation via
+                  Redis pub/sub (optional, default True)
+                - balance_batch_window_ms: Window for merging balance lookups
+                  into balancemulti (optional, 0 disables)
+                - balance_batch_max_size: Addresses per balancemulti (optional)
+                - single_flight_distributed: Coalesce misses across workers
+                  with a Redis lock (optional, default False)
+                - single_flight_lock_timeout: Lock expiry in seconds (optional)
+                - head_poll_interval, head_max_age, head_idle_timeout: Chain
+                  head watching (optional, see HeadWatcher)
         """
-        self._supported_chains: list[dict] = []
-        self.update_supported_chains()
-
         self.config = config
-        self.rate_limiter = RateLimiter(config)
-        self.cache = CacheService(self.config['redis_url'])
-
+        # the chainlist is read from disk, or downloaded, on first use
+        self.chainlist_file = CachedJsonFile(
+            config.get('etherscan_chainlist_url', CHAINLIST_URL),
+            data_folder.joinpath("etherscan_chainlist.json"), _parse_chainlist)
+        self._supported_chains: list[dict] = []
+        self._chains_loaded = False
+        self._chains_refresher: Optional[asyncio.Task] = None
+        # chainlist entries by chain id, rebuilt whenever _supported_chains changes
         self.cached_chain_info: dict[int, dict] = {}
+        self._indexed_chains: Optional[list[dict]] = None
+
+        self.codec = CacheCodec.from_config(config)
+        self.cache = CacheService(
+            self.config['redis_url'],
+            local_cache_size=config.get('local_cache_size', 0),
+            local_cache_ttl=config.get('local_cache_ttl', LOCAL_CACHE_TTL),
+            local_cache_invalidation=config.get('local_cache_invalidation', True),
+            codec=self.codec)
+        self.key_pool = ApiKeyPool(config, self.cache.redis)
+        self.http = HttpClient(config)
+        self.metrics = Metrics()
+        self.ttl_policy = TtlPolicy(config)
+        self.head_watcher = HeadWatcher(self.cache.redis, self._fetch_head, config, self.metrics)
+        self.single_flight = SingleFlight()
+        self.balance_batcher: Optional[BalanceBatcher] = None
+        if config.get('balance_batch_window_ms', 0) > 0:
+            self.balance_batcher = BalanceBatcher(
+                self, config['balance_batch_window_ms'] / 1000,
+                config.get('balance_batch_max_size', MAX_BALANCEMULTI_ADDRESSES))
+
         self._base_url_with_chainid: str = ""
         self.chain_name: str = ""
         self.chain_id: int = 0
 
-        # Initialize API modules
-        from .accounts import Accounts
-        from .blocks import Blocks
-        from .chainspecific import ChainSpecific
-        from .contracts import Contracts
-        from .gastracker import GasTracker
-        from .geth_proxy import Proxy
-        from .logs import Logs
-        from .stats import Stats
-        from .tokens import Tokens
-        from .transaction import Transaction
-        from .usage import Usage
+        self._chain_views: dict[int, EtherScanV2Chain] = {}
 
-        # Create API module instances
-        self.account = Accounts(self)
-        self.contract = Contracts(self)
-        self.transaction = Transaction(self)
-        self.block = Blocks(self)
-        self.logs = Logs(self)
-        self.proxy = Proxy(self)
-        self.tokens = Tokens(self)
-        self.gas_tracker = GasTracker(self)
-        self.stats = Stats(self)
-        self.chain_specific = ChainSpecific(self)
-        self.usage = Usage(self)
+        # Create API module instances bound to the currently selected chain
+        self._init_api_modules()
+
+    def get_chain_info(self, chainid: int) -> dict:
+        """
+        Look up Etherscan chainlist information for a chain.
+
+        Args:
+            chainid: Chain ID to look up
+
+        Returns:
+            dict: Chainlist entry containing chainname, apiurl, etc.
+
+        Raises:
+            ValueError: If chain ID is not supported
+        """
+        self._ensure_chain_index()
+        chain_info = self.cached_chain_info.get(chainid)
+        if chain_info is None:
+            raise ValueError(f"Chain id {chainid} is not supported.")
+        return chain_info
+
+    def preload(self) -> None:
+        """
+        Load and index the chainlist now instead of on first use, e.g. once
+        in a parent process before workers are forked.
+
+        Raises:
+            OSError: If there is no saved chainlist and the download fails
+            ValueError: If the downloaded chainlist is invalid
+        """
+        self._ensure_chain_index()
+
+    def _ensure_chain_index(self) -> None:
+        """ load the chainlist on first use and index it whenever it changed """
+        if not self._chains_loaded:
+            self._chains_loaded = True
+            if not self.load_supported_chains():
+                self.update_supported_chains()
+        if self._indexed_chains is not self._supported_chains:
+            self._index_supported_chains()
+
+    def _index_supported_chains(self) -> None:
+        """ index the chainlist by chain id, first entry wins """
+        index: dict[int, dict] = {}
+        for chain in self._supported_chains:
+            try:
+                index.setdefault(int(chain['chainid']), chain)
+            except (KeyError, TypeError, ValueError):
+                continue
+        self.cached_chain_info = index
+        self._indexed_chains = self._supported_chains
+
+    def for_chain(self, chainid: int) -> "EtherScanV2Chain":
+        """
+        Get a chain-scoped view of this client.
+
+        The view carries its own chain id and API url and never touches the
+        client's selected chain, so concurrent requests for different chains
+        can share one client safely.
+
+        Args:
+            chainid: Chain ID to use (e.g., 1 for Ethereum mainnet)
+
+        Returns:
+            EtherScanV2Chain: Chain-scoped client view
+
+        Raises:
+            ValueError: If chain ID is not supported
+
+        Example:
+            balance = await client.for_chain(8453).account.balance("0x...")
+        """
+        view = self._chain_views.get(chainid)
+        if view is None:
+            chain_info = self.get_chain_info(chainid)
+            view = EtherScanV2Chain(self, chainid, chain_info['chainname'],
+                                    chain_info['apiurl'])
+            self._chain_views[chainid] = view
+        return view
 
     def set_chain_id(self, chainid: int):
         """
         Set active chain for subsequent API calls.
 
+        Prefer `for_chain` when serving concurrent requests, as this mutates
+        state shared by every caller of this client.
+
         Args:
             chainid: Chain ID to use (e.g., 1 for Ethereum mainnet)
 
         Raises:
             ValueError: If chain ID is not supported
         """
-        # Look up chain info in cache first
-        if chainid not in self.cached_chain_info:
-            chain_info = next(
-                (chain for chain in self._supported_chains if chain['chainid'] == str(chainid)),
-                None)
-            if chain_info is None:
-                raise ValueError(f"Chain id {chainid} is not supported.")
-            self.cached_chain_info[chainid] = chain_info
-        else:
-            chain_info = self.cached_chain_info[chainid]
+        chain_info = self.get_chain_info(chainid)
 
         # Update instance attributes for selected chain
         self._base_url_with_chainid = chain_info['apiurl']
         self.chain_name = chain_info['chainname']
         self.chain_id = chainid
 
-        print(f"{self.chain_name} (id: {self.chain_id}) "
-              f"etherscan api url: {self._base_url_with_chainid}")
+        logger.debug(f"{self.chain_name} (id: {self.chain_id}) "
+                     f"etherscan api url: {self._base_url_with_chainid}")
 
-    async def request(self, module: str, action: str, params: dict):
+    async def request(self, module: str, action: str, params: dict, raw: bool = False):
         """
-        Make an API request with caching and rate limiting.
+        Make an API request on the currently selected chain.
 
         Args:
             module: API module name
             action: API action name
             params: Request parameters
+            raw: Return the JSON text of the result (see `request_for_chain`)
 
         Returns:
             API response data
+        """
+        return await self.request_for_chain(
+            self.chain_id, self._base_url_with_chainid, module, action, params, raw)
+
+    async def balances(self, addresses: list[str], tag: str = "latest") -> dict[str, Any]:
+        """
+        Get native balances of many addresses on the currently selected chain.
+
+        See `balances_for_chain`.
+        """
+        return await self.balances_for_chain(
+            self.chain_id, self._base_url_with_chainid, addresses, tag)
+
+    def pages(self, module: str, action: str, params: dict,
+              page_size: int = DEFAULT_PAGE_SIZE) -> AsyncIterator[list[dict]]:
+        """
+        Iterate over the pages of a list action on the currently selected chain.
+
+        See `pages_for_chain`.
+        """
+        return self.pages_for_chain(
+            self.chain_id, self._base_url_with_chainid, module, action, params, page_size)
+
+    def pages_for_chain(self, chain_id: int, base_url: str, module: str, action: str,
+                        params: dict, page_size: int = DEFAULT_PAGE_SIZE
+                        ) -> AsyncIterator[list[dict]]:
+        """
+        Iterate over the pages of a block range list action (txlist, tokentx, ...).
+
+        Every page is an ordinary cached request with page and offset
+        parameters; the next page is prefetched while the rate limiter has
+        budget to spare (see `pagination.paginate`).
+
+        Args:
+            chain_id: Chain ID the request is made for
+            base_url: Etherscan API url of the chain (with chainid query)
+            module: API module name
+            action: API action name
+            params: Request parameters, without page and offset
+            page_size: Rows per page (at most 10,000)
+
+        Returns:
+            AsyncIterator[list[dict]]: Rows of each page, in query order
+        """
+        async def fetch(page_params: dict) -> Any:
+            return await self.request_for_chain(chain_id, base_url, module, action, page_params)
+
+        return paginate(fetch, params, page_size, self.key_pool.has_slack, self.metrics)
+
+    async def balances_for_chain(self, chain_id: int, base_url: str, addresses: list[str],
+                                 tag: str = "latest") -> dict[str, Any]:
+        """
+        Get native balances of many addresses with as few upstream calls as possible.
+
+        Each address is first looked up in the cache under its own `balance`
+        key, all of them in one Redis round trip; the misses are fetched
+        with concurrent `balancemulti` calls of up to 20 addresses, and
+        every fetched balance is cached under its own key with the expiry
+        and stale window of a single balance lookup. Stale balances are
+        returned while they are refreshed, as `request_for_chain` does.
+
+        Args:
+            chain_id: Chain ID the request is made for
+            base_url: Etherscan API url of the chain (with chainid query)
+            addresses: Account addresses to query
+            tag: Block parameter (latest/pending/earliest)
+
+        Returns:
+            dict[str, Any]: Address -> balance in Wei, or the exception raised
+            while fetching that address
+        """
+        epoch = self._epoch(chain_id, "balance", {"tag": tag})
+        stale = self.ttl_policy.stale_for("balance")
+        cache_keys = {
+            address: self.build_cache_key(
+                chain_id, "account", "balance", {"address": address, "tag": tag}, epoch)
+            for address in dict.fromkeys(addresses)}
+        results = await self._cached_balances(chain_id, base_url, tag, cache_keys, epoch)
+        for address in results:
+            del cache_keys[address]
+
+        async def fetch_chunk(chunk: list[str]) -> None:
+            try:
+                balances = await self._call_upstream(
+                    base_url, "account", "balancemulti", {"address": ",".join(chunk), "tag": tag})
+            except Exception as e:
+                for address in chunk:
+                    results[address] = e
+                return
+            by_address = {entry["account"].lower(): entry["balance"] for entry in balances}
+            for address in chunk:
+                balance = by_address.get(address.lower())
+                if balance is None:
+                    results[address] = ValueError(f"No balance returned for {address}")
+                    continue
+                results[address] = balance
+                try:
+                    expire = await self._expiration(
+                        chain_id, base_url, "balance", {"address": address, "tag": tag},
+                        balance, epoch)
+                    if expire is not None:
+                        await self.cache.set(cache_keys[address], balance, expire=expire,
+                                             stale=stale)
+                except CacheException:
+                    logger.warning(f"Failed to cache balance of {address}")
+
+        misses = list(cache_keys)
+        await asyncio.gather(*(
+            fetch_chunk(misses[i:i + MAX_BALANCEMULTI_ADDRESSES])
+            for i in range(0, len(misses), MAX_BALANCEMULTI_ADDRESSES)))
+        return results
+
+    async def _cached_balances(self, chain_id: int, base_url: str, tag: str,
+                               cache_keys: dict[str, str],
+                               epoch: Optional[int]) -> dict[str, Any]:
+        """ cached balances of addresses by address, revalidating the stale ones """
+        metrics = self.metrics
+        results: dict[str, Any] = {}
+        remote = []
+        for address, cache_key in cache_keys.items():
+            cached_result = self.cache.get_local(cache_key)
+            if cached_result is not None:
+                metrics.incr("cache_hit")
+                results[address] = cached_result
+            else:
+                remote.append(address)
+
+        stale = self.ttl_policy.stale_for("balance")
+        try:
+            entries = await self.cache.get_remote_many_with_ttl(
+                [cache_keys[address] for address in remote], stale)
+        except CacheException:
+            entries = [(None, None)] * len(remote)
+        for address, (cached_result, fresh_for) in zip(remote, entries, strict=True):
+            if cached_result is None:
+                metrics.incr("cache_miss")
+                continue
+            if fresh_for is not None and fresh_for <= 0:
+                self._revalidate(cache_keys[address], -fresh_for, partial(
+                    self._refresh, cache_keys[address], chain_id, base_url, "account",
+                    "balance", {"address": address, "tag": tag}, epoch))
+            else:
+                metrics.incr("cache_hit")
+            results[address] = cached_result
+        return results
+
+    async def request_for_chain(self, chain_id: int, base_url: str,
+                                module: str, action: str, params: dict, raw: bool = False):
+        """
+        Make an API request with caching and rate limiting.
+
+        The request runs through ordered stages, each timed in `metrics`:
+        key build -> local cache -> redis -> in-flight dedup -> rate limit ->
+        upstream -> cache store. Cache hits return before the rate limiter, so they
+        never consume Etherscan quota, and concurrent misses for the same
+        key share a single upstream call.
+
+        Keys of results that only change with a new block carry the chain
+        head block while it is known, and `eth_blockNumber` is answered from
+        the head watcher directly.
+
+        An entry past its expiration but within its action's stale window
+        is returned at once while one background refresh, made only when an
+        API key has rate limit budget to spare, replaces it.
+
+        A raw request returns the JSON text of the result: a Redis hit on a
+        value stored as JSON is passed through without being decoded, for
+        responses that embed it as it is.
+
+        Args:
+            chain_id: Chain ID the request is made for
+            base_url: Etherscan API url of the chain (with chainid query)
+            module: API module name
+            action: API action name
+            params: Request parameters
+            raw: Return the result as JSON bytes
+
+        Returns:
+            API response data, or its JSON text as bytes if raw
 
         Raises:
             OSError: If API request fails
             ValueError: If API returns error response
         """
-        # Apply rate limiting
-        await self.rate_limiter.acquire()
-
-        # Generate cache key
-        cache_key = f"etherscanv2:{self.chain_id}:{module}:{action}:" + \
-            f"{json.dumps(params, sort_keys=True)}"
+        metrics = self.metrics
+        if not self.ttl_policy.cacheable(action):
+            return self._output(await self._call_upstream(base_url, module, action, params), raw)
+
+        # Stage: key build
+        with metrics.timer("key_build"):
+            epoch = self._epoch(chain_id, action, params)
+            if epoch is not None and action == "eth_blockNumber":
+                metrics.incr("head_hit")
+                return self._output(hex(epoch), raw)
+            cache_key = self.build_cache_key(chain_id, module, action, params, epoch)
+
+        # Stage: local cache
+        with metrics.timer("local_cache"):
+            cached_result = self.cache.get_local(cache_key)
+        if cached_result is not None:
+            metrics.incr("local_cache_hit")
+            return self._output(cached_result, raw)
 
-        # Try cache first
-        cached_result = await self.cache.get(cache_key)
+        # Stage: redis
+        with metrics.timer("redis"):
+            cached_result, fresh_for = await self.cache.get_remote_with_ttl(
+                cache_key, self.ttl_policy.stale_for(action), raw=raw)
         if cached_result is not None:
+            if fresh_for is not None and fresh_for <= 0:
+                self._revalidate(cache_key, -fresh_for,
+                                 lambda: self._refresh(cache_key, chain_id, base_url, module,
+                                                       action, params, epoch))
+            else:
+                metrics.incr("cache_hit")
             return cached_result
+        metrics.incr("cache_miss")
+
+        # Stage: in-flight dedup
+        if self.single_flight.in_flight(cache_key):
+            metrics.incr("coalesced")
+        result = await self.single_flight.do(
+            cache_key,
+            lambda: self._load(cache_key, chain_id, base_url, module, action, params, epoch))
+        return self._output(result, raw)
+
+    def _output(self, result: Any, raw: bool) -> Any:
+        """ a result as returned by request_for_chain: as is, or as JSON bytes if raw """
+        return self.codec.dumps_json(result) if raw else result
+
+    async def _load(self, cache_key: str, chain_id: int, base_url: str, module: str,
+                    action: str, params: dict, epoch: Optional[int] = None):
+        """ fetch a missed key from Etherscan and store it (run once per key) """
+        metrics = self.metrics
+        lock_token = None
+        if self.config.get('single_flight_distributed', False):
+            lock_token, cached_result = await self._lock_or_wait(cache_key)
+            if cached_result is not None:
+                metrics.incr("coalesced_distributed")
+                return cached_result
+        try:
+            if action == "balance" and self.balance_batcher is not None:
+                # Stage: balance batch (rate limit and upstream run per batch)
+                with metrics.timer("balance_batch"):
+                    result = await self.balance_batcher.balance(base_url, params)
+            else:
+                result = await self._call_upstream(base_url, module, action, params)
+
+            # Stage: cache store
+            expire = await self._expiration(chain_id, base_url, action, params, result, epoch)
+            if expire is not None:
+                with metrics.timer("cache_store"):
+                    await self.cache.set(cache_key, result, expire=expire,
+                                         stale=self.ttl_policy.stale_for(action))
+            return result
+        finally:
+            if lock_token is not None:
+                await self._release_lock(cache_key, lock_token)
+
+    def _revalidate(self, cache_key: str, age: float,
+                    refresh: Callable[[], Awaitable[None]]) -> None:
+        """ count a stale hit and start its refresh unless running or out of budget """
+        metrics = self.metrics
+        metrics.incr("cache_stale")
+        metrics.observe("stale_age", age)
+        # refreshes return nothing, so misses of the key must not join them
+        refresh_key = f"refresh:{cache_key}"
+        if self.single_flight.in_flight(refresh_key):
+            metrics.incr("revalidate_coalesced")
+        elif not self.key_pool.has_slack():
+            # a later stale hit retries; past the stale window it is a miss
+            metrics.incr("revalidate_deferred")
+        else:
+            self.single_flight.start(refresh_key, refresh)
+
+    async def _refresh(self, cache_key: str, chain_id: int, base_url: str, module: str,
+                       action: str, params: dict, epoch: Optional[int]) -> None:
+        """ refetch a stale entry in the background, once across workers if distributed """
+        metrics = self.metrics
+        lock_token = None
+        if self.config.get('single_flight_distributed', False):
+            timeout = self.config.get('single_flight_lock_timeout', SINGLE_FLIGHT_LOCK_TIMEOUT)
+            try:
+                lock_token = await self.cache.acquire_lock(f"lock:{cache_key}", timeout)
+            except CacheException:
+                logger.warning(f"Distributed single-flight unavailable for {cache_key}")
+            else:
+                if lock_token is None:
+                    metrics.incr("revalidate_coalesced")
+                    return
+        try:
+            result = await self._call_upstream(base_url, module, action, params)
+            expire = await self._expiration(chain_id, base_url, action, params, result, epoch)
+            if expire is not None:
+                await self.cache.set(cache_key, result, expire=expire,
+                                     stale=self.ttl_policy.stale_for(action))
+            metrics.incr("revalidated")
+        except Exception as e:
+            logger.warning(f"Background refresh of {cache_key} failed: {e}")
+            metrics.incr("revalidate_error")
+        finally:
+            if lock_token is not None:
+                await self._release_lock(cache_key, lock_token)
+
+    def _epoch(self, chain_id: int, action: str, params: dict) -> Optional[int]:
+        """ head block scoping the cache key of a request, None to use a plain TTL """
+        if not self.head_watcher.enabled or not self.ttl_policy.follows_head(action, params):
+            return None
+        return self.head_watcher.epoch(chain_id)
+
+    async def _expiration(self, chain_id: int, base_url: str, action: str, params: dict,
+                          result: Any, epoch: Optional[int] = None) -> Optional[int]:
+        """ cache expiration of a result, looking up the chain head if it may be final """
+        if epoch is not None:
+            self.metrics.incr("ttl_epoch")
+            return self.ttl_policy.epoch_expiration
+        final_block = None
+        if self.ttl_policy.head_block(action, params, result) is not None:
+            final_block = await self._final_block(chain_id, base_url)
+        ttl_class = self.ttl_policy.ttl_class(action, params, result, final_block)
+        self.metrics.incr(f"ttl_{ttl_class}")
+        return self.ttl_policy.expiration(action, ttl_class)
+
+    async def _final_block(self, chain_id: int, base_url: str) -> Optional[int]:
+        """ newest finalized block of a chain, None if the head is unavailable """
+        try:
+            head = await self.request_for_chain(chain_id, base_url, "proxy", "eth_blockNumber", {})
+            return int(head, 16) - self.ttl_policy.finality_blocks
+        except (OSError, ValueError, TypeError, CacheException) as e:
+            logger.warning(f"Chain {chain_id}: head unavailable for cache TTL: {e}")
+            return None
+
+    async def _fetch_head(self, chain_id: int) -> int:
+        """ head block of a chain straight from Etherscan, for the head watcher """
+        base_url = self.get_chain_info(chain_id)['apiurl']
+        head = await self._call_upstream(base_url, "proxy", "eth_blockNumber", {})
+        return int(head, 16)
+
+    async def _call_upstream(self, base_url: str, module: str, action: str, params: dict):
+        """
+        Call Etherscan with the least-loaded API key.
+
+        A key answered with a rate limit error is put in cooldown and the
+        call is retried once with each other key.
+        """
+        metrics = self.metrics
+        for attempt in range(len(self.key_pool.keys)):
+            # Stage: rate limit
+            with metrics.timer("rate_limit"):
+                api_key = await self.key_pool.acquire()
+
+            # Stage: upstream
+            try:
+                with metrics.timer("upstream"):
+                    return await self._fetch(base_url, module, action, params, api_key.key)
+            except ValueError as e:
+                if RATE_LIMIT_ERROR not in str(e).lower() or \
+                        attempt == len(self.key_pool.keys) - 1:
+                    raise
+                logger.warning(f"Etherscan key {api_key.masked} rate limited, rotating")
+                metrics.incr("key_rate_limited")
+                self.key_pool.report_rate_limited(api_key)
+
+    async def api_key_states(self, base_url: Optional[str] = None) -> list[dict[str, Any]]:
+        """
+        Report the budget of every API key with its upstream usage.
+
+        Each key's local state (limiter, daily quota, cooldown) is combined
+        with a `getapilimit` call made with that key. These calls bypass the
+        cache but still go through the key's rate limiter.
+
+        Args:
+            base_url: Etherscan API url to query (defaults to the selected
+                chain, or Ethereum mainnet)
+
+        Returns:
+            list[dict[str, Any]]: One entry per key
+        """
+        if base_url is None:
+            base_url = self._base_url_with_chainid or self.get_chain_info(1)['apiurl']
+
+        async def key_state(api_key: ApiKey) -> dict[str, Any]:
+            state = api_key.state()
+            try:
+                await api_key.limiter.acquire()
+                state['limit'] = await self._fetch(
+                    base_url, "getapilimit", "getapilimit", {}, api_key.key)
+            except (OSError, ValueError) as e:
+                state['limit'] = None
+                state['error'] = str(e)
+            return state
+
+        return list(await asyncio.gather(*(key_state(k) for k in self.key_pool.keys)))
+
+    async def _lock_or_wait(self, cache_key: str) -> tuple[Optional[str], Any]:
+        """
+        Coalesce a miss across worker processes with a Redis lock.
+
+        Returns (token, None) when this process should fetch, or
+        (None, result) when another process filled the cache meanwhile.
+        Lock errors degrade to fetching without a lock.
+        """
+        timeout = self.config.get('single_flight_lock_timeout', SINGLE_FLIGHT_LOCK_TIMEOUT)
+        lock_key = f"lock:{cache_key}"
+        deadline = time.monotonic() + timeout
+        with self.metrics.timer("dedup_lock"):
+            try:
+                while True:
+                    token = await self.cache.acquire_lock(lock_key, timeout)
+                    if token is not None:
+                        return token, None
+                    await asyncio.sleep(SINGLE_FLIGHT_POLL_INTERVAL)
+                    cached_result = await self.cache.get(cache_key)
+                    if cached_result is not None:
+                        return None, cached_result
+                    if time.monotonic() > deadline:
+                        return None, None
+            except CacheException:
+                logger.warning(f"Distributed single-flight unavailable for {cache_key}")
+                return None, None
+
+    async def _release_lock(self, cache_key: str, token: str) -> None:
+        """ release the distributed single-flight lock, ignoring cache errors """
+        try:
+            await self.cache.release_lock(f"lock:{cache_key}", token)
+        except CacheException:
+            logger.warning(f"Failed to release single-flight lock for {cache_key}")
+
+    @staticmethod
+    def build_cache_key(chain_id: int, module: str, action: str, params: dict,
+                        epoch: Optional[int] = None) -> str:
+        """
+        Build the cache key of an API request.
+
+        Args:
+            chain_id: Chain ID the request is made for
+            module: API module name
+            action: API action name
+            params: Request parameters
+            epoch: Head block the result is valid for (optional)
+
+        Returns:
+            str: Cache key in the form etherscanv2:{chain}:{module}:{action}:{params},
+            followed by @{epoch} when given
+        """
+        key = f"etherscanv2:{chain_id}:{module}:{action}:" + \
+            f"{json.dumps(params, sort_keys=True)}"
+        return key if epoch is None else f"{key}@{epoch}"
 
+    async def _fetch(self, base_url: str, module: str, action: str, params: dict,
+                     api_key: str):
+        """ call Etherscan and return the validated `result` of the response """
         # Build API request URL with validated parameters
         api_params = {k: v for k, v in params.items() if k in valid_params[action]}
-        url = f"{self._base_url_with_chainid}&" + \
-            f"apikey={self.config['etherscan_api_key']}&" + \
-            f"module={module}&action={action}&{urlencode(api_params)}"
+        query = f"module={module}&action={action}&{urlencode(api_params)}"
+        url = f"{base_url}&apikey={api_key}&{query}"
 
         # Make API request
-        print(f"Requesting Etherscan url: {url}")
-        res = requests.get(url, timeout=10)
+        logger.debug(f"Requesting Etherscan: {base_url}&{query}")
+        self.metrics.incr("upstream_call")
+        res = await self.http.get(url)
         if res.status_code != 200:
-            raise OSError(f"Failed to get Etherscan url: {url}")
+            self.metrics.incr("upstream_error")
+            raise OSError(f"Failed to get Etherscan url: {base_url}&{query}")
 
         # Parse and validate response
         res_dict = res.json()
         if 'status' in res_dict:
             if res_dict['status'] == '0' or res_dict['message'] == 'NOTOK':
-                print(res_dict)
+                logger.info(f"Etherscan error response: {res_dict}")
+                self.metrics.incr("upstream_error")
                 raise ValueError(res_dict['result'])
         elif 'jsonrpc' in res_dict:
             if res_dict['jsonrpc'] != '2.0':
+                self.metrics.incr("upstream_error")
                 raise ValueError("Unknown jsonrpc version")
-
-        # Cache successful response
-        await self.cache.set(cache_key, res_dict['result'],
-                             expire=self.config['cache_expiration'])
         return res_dict['result']
 
+    def load_supported_chains(self) -> bool:
+        """
+        Load the list of supported chains saved by a previous update.
+
+        Returns:
+            bool: True if a saved chainlist was loaded
+        """
+        chains = self.chainlist_file.load()
+        if chains is None:
+            return False
+        self._set_supported_chains(chains)
+        return True
+
     def update_supported_chains(self):
         """
         Update list of supported chains from Etherscan API.
 
+        The saved chainlist is revalidated with ETag/If-Modified-Since and
+        only downloaded again if it changed.
+
         Raises:
             OSError: If chainlist request fails
             ValueError: If response format is invalid
         """
-        res = requests.get(CHAINLIST_URL, timeout=10)
-        if res.status_code != 200:
-            raise OSError("Failed to fetch supported chains.")
-        res_dict = res.json()
-        if 'totalcount' not in res_dict:
-            raise ValueError("Failed to fetch supported chains.")
-        print(f"Etherscan V2 supported chains: {res_dict['totalcount']}")
-        self._supported_chains = res_dict['result']
+        chains = self.chainlist_file.fetch()
+        if chains is not None:
+            self._set_supported_chains(chains)
+        elif not self._supported_chains:
+            self.load_supported_chains()
+        self._chains_loaded = True
+        print(f"Etherscan V2 supported chains: {len(self._supported_chains)}")
+
+    def _set_supported_chains(self, chains: list[dict]) -> None:
+        """ replace the chainlist and drop the chain views built from the old one """
+        self._supported_chains = chains
+        self._chains_loaded = True
+        self._chain_views.clear()
+
+    async def start(self) -> None:
+        """
+        Load the chainlist and start revalidating it in the background.
+
+        Without a saved chainlist the first download is awaited off the
+        event loop; if it fails the gateway starts anyway and keeps retrying.
+        """
+        if not self._chains_loaded and not self.load_supported_chains():
+            try:
+                await asyncio.to_thread(self.update_supported_chains)
+            except Exception as e:
+                logger.warning(f"Etherscan chainlist unavailable: {e}")
+        interval = self.config.get('chains_refresh_interval', CHAINS_REFRESH_INTERVAL)
+        if interval > 0 and (self._chains_refresher is None or self._chains_refresher.done()):
+            self._chains_refresher = asyncio.ensure_future(
+                self.chainlist_file.refresh_loop(interval, self._set_supported_chains))
 
     @classmethod
     async def create(cls, config: dict):
@@ -206,3 +851,96 @@ class EtherScanV2:
         instance = cls(config)
         await instance.cache.initialize()
         return instance
+
+    async def close(self) -> None:
+        """
+        Stop the background tasks and release pooled HTTP connections and
+        cache resources.
+        """
+        await self.head_watcher.close()
+        if self._chains_refresher is not None:
+            self._chains_refresher.cancel()
+            try:
+                await self._chains_refresher
+            except asyncio.CancelledError:
+                pass
+            self._chains_refresher = None
+        await self.http.close()
+        await self.cache.close()
+
+
+class EtherScanV2Chain(_ApiModules):
+    """
+    Chain-scoped view of an EtherScanV2 client.
+
+    Exposes the same API modules as EtherScanV2 (account, tokens, block, ...)
+    but every call is made for a fixed chain. The view holds no mutable
+    state and shares the cache, rate limiter and HTTP pool of its client.
+
+    Attributes:
+        client (EtherScanV2): Parent client
+        chain_id (int): Chain ID of this view
+        chain_name (str): Chain name of this view
+        base_url (str): Etherscan API url of this chain
+    """
+
+    def __init__(self, client: EtherScanV2, chain_id: int, chain_name: str,
+                 base_url: str) -> None:
+        """
+        Initialize chain-scoped view.
+
+        Args:
+            client: Parent EtherScanV2 client
+            chain_id: Chain ID
+            chain_name: Chain name
+            base_url: Etherscan API url with chainid query
+        """
+        self.client = client
+        self.chain_id = chain_id
+        self.chain_name = chain_name
+        self.base_url = base_url
+        self._init_api_modules()
+
+    async def request(self, module: str, action: str, params: dict, raw: bool = False):
+        """
+        Make an API request for this chain.
+
+        Args:
+            module: API module name
+            action: API action name
+            params: Request parameters
+            raw: Return the JSON text of the result (see `request_for_chain`)
+
+        Returns:
+            API response data
+        """
+        return await self.client.request_for_chain(
+            self.chain_id, self.base_url, module, action, params, raw)
+
+    async def balances(self, addresses: list[str], tag: str = "latest") -> dict[str, Any]:
+        """
+        Get native balances of many addresses on this chain.
+
+        See `EtherScanV2.balances_for_chain`.
+        """
+        return await self.client.balances_for_chain(
+            self.chain_id, self.base_url, addresses, tag)
+
+    def pages(self, module: str, action: str, params: dict,
+              page_size: int = DEFAULT_PAGE_SIZE) -> AsyncIterator[list[dict]]:
+        """
+        Iterate over the pages of a list action on this chain.
+
+        See `EtherScanV2.pages_for_chain`.
+        """
+        return self.client.pages_for_chain(
+            self.chain_id, self.base_url, module, action, params, page_size)
+
+    async def api_key_states(self) -> list[dict[str, Any]]:
+        """
+        Report the budget of every API key, queried on this chain.
+
+        Returns:
+            list[dict[str, Any]]: One entry per key
+        """
+        return await self.client.api_key_states(self.base_url)
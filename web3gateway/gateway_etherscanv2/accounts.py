@@ -4,10 +4,14 @@ Etherscan Accounts Module
 This module provides functionality for account-related operations:
 - Balance queries
 - Transaction history
-- Token transfers
+- Token transfers, also as auto-paginated async iterators over a block range
 - Mining history
 """
 
+from typing import AsyncIterator, Optional
+
+from .pagination import DEFAULT_PAGE_SIZE
+
 
 class Accounts:
     """
@@ -57,33 +61,106 @@ class Accounts:
         params = {"address": ",".join(addresses), "tag": tag}
         return await self.client.request("account", "balancemulti", params)
 
+    async def balances(self, addresses: list, tag: str = "latest"):
+        """
+        Get native token balances of any number of addresses.
+
+        Cached balances are served from the cache and the rest are fetched
+        with as few `balancemulti` calls as possible.
+
+        Args:
+            addresses: List of account addresses to query
+            tag: Block parameter (latest/pending/earliest)
+
+        Returns:
+            dict: Address -> balance in Wei, or the exception raised for it
+        """
+        return await self.client.balances(addresses, tag)
+
     async def txlist(self, address: str, startblock: int = 0, endblock: int = 99999999,
-                     sort: str = 'asc'):
-        """ Returns the list of transactions performed by an address. """
+                     sort: str = 'asc', raw: bool = False):
+        """ Returns the list of transactions performed by an address (JSON bytes if raw). """
         params = {'address': address, 'startblock': startblock, 'endblock': endblock,
                   'sort': sort}
-        return await self.client.request("account", "txlist", params)
+        return await self.client.request("account", "txlist", params, raw)
 
     async def tokentx(self, address: str, contractaddress: str,
-                      startblock: int = 0, endblock: int = 99999999, sort: str = 'asc'):
-        """ Returns the list of ERC-20 token transfer events. """
+                      startblock: int = 0, endblock: int = 99999999, sort: str = 'asc',
+                      raw: bool = False):
+        """ Returns the list of ERC-20 token transfer events (JSON bytes if raw). """
         params = {'address': address, 'contractaddress': contractaddress,
                   'startblock': startblock, 'endblock': endblock, 'sort': sort}
-        return await self.client.request("account", "tokentx", params)
+        return await self.client.request("account", "tokentx", params, raw)
 
     async def tokennfttx(self, address: str, contractaddress: str,
-                         startblock: int = 0, endblock: int = 99999999, sort: str = 'asc'):
-        """ Returns the list of ERC-721 token transfer events. """
+                         startblock: int = 0, endblock: int = 99999999, sort: str = 'asc',
+                         raw: bool = False):
+        """ Returns the list of ERC-721 token transfer events (JSON bytes if raw). """
         params = {'address': address, 'contractaddress': contractaddress,
                   'startblock': startblock, 'endblock': endblock, 'sort': sort}
-        return await self.client.request("account", "tokennfttx", params)
+        return await self.client.request("account", "tokennfttx", params, raw)
 
     async def token1155tx(self, address: str, contractaddress: str,
-                          startblock: int = 0, endblock: int = 99999999, sort: str = 'asc'):
-        """ Returns the list of ERC-1155 token transfer events. """
+                          startblock: int = 0, endblock: int = 99999999, sort: str = 'asc',
+                          raw: bool = False):
+        """ Returns the list of ERC-1155 token transfer events (JSON bytes if raw). """
         params = {'address': address, 'contractaddress': contractaddress,
                   'startblock': startblock, 'endblock': endblock, 'sort': sort}
-        return await self.client.request("account", "token1155tx", params)
+        return await self.client.request("account", "token1155tx", params, raw)
+
+    def txlist_pages(self, address: str, startblock: int = 0, endblock: int = 99999999,
+                     sort: str = 'asc', page_size: int = DEFAULT_PAGE_SIZE
+                     ) -> AsyncIterator[list[dict]]:
+        """
+        Iterate over all transactions performed by an address, page by page.
+
+        Unlike `txlist`, the history is not cut at Etherscan's 10,000 results
+        and is never held in memory as a whole.
+
+        Args:
+            address: Account address
+            startblock: Starting block number
+            endblock: Ending block number
+            sort: Sort order (asc/desc)
+            page_size: Transactions per page
+
+        Returns:
+            AsyncIterator[list[dict]]: Transactions of each page
+        """
+        params = {'address': address, 'startblock': startblock, 'endblock': endblock,
+                  'sort': sort}
+        return self.client.pages("account", "txlist", params, page_size)
+
+    def tokentx_pages(self, address: str, contractaddress: Optional[str] = None,
+                      startblock: int = 0, endblock: int = 99999999, sort: str = 'asc',
+                      page_size: int = DEFAULT_PAGE_SIZE) -> AsyncIterator[list[dict]]:
+        """ Iterate over the ERC-20 token transfer events page by page (see `txlist_pages`). """
+        return self._transfer_pages("tokentx", address, contractaddress,
+                                    startblock, endblock, sort, page_size)
+
+    def tokennfttx_pages(self, address: str, contractaddress: Optional[str] = None,
+                         startblock: int = 0, endblock: int = 99999999, sort: str = 'asc',
+                         page_size: int = DEFAULT_PAGE_SIZE) -> AsyncIterator[list[dict]]:
+        """ Iterate over the ERC-721 token transfer events page by page (see `txlist_pages`). """
+        return self._transfer_pages("tokennfttx", address, contractaddress,
+                                    startblock, endblock, sort, page_size)
+
+    def token1155tx_pages(self, address: str, contractaddress: Optional[str] = None,
+                          startblock: int = 0, endblock: int = 99999999, sort: str = 'asc',
+                          page_size: int = DEFAULT_PAGE_SIZE) -> AsyncIterator[list[dict]]:
+        """ Iterate over the ERC-1155 token transfer events page by page (see `txlist_pages`). """
+        return self._transfer_pages("token1155tx", address, contractaddress,
+                                    startblock, endblock, sort, page_size)
+
+    def _transfer_pages(self, action: str, address: str, contractaddress: Optional[str],
+                        startblock: int, endblock: int, sort: str,
+                        page_size: int) -> AsyncIterator[list[dict]]:
+        """ pages of a token transfer action, of every token without contract address """
+        params = {'address': address, 'startblock': startblock, 'endblock': endblock,
+                  'sort': sort}
+        if contractaddress:
+            params['contractaddress'] = contractaddress
+        return self.client.pages("account", action, params, page_size)
 
     async def txlistinternal(self, address: str, startblock: int = 0,
                              endblock: int = 99999999, page: int = 1,
@@ -0,0 +1,123 @@
+"""
+Etherscan Balance Batching Module
+
+This module merges concurrent native balance lookups into `balancemulti`:
+- Lookups for the same chain and tag within a short window share a batch
+- A batch is sent early once it reaches the maximum size
+- Results (or the batch error) are fanned back out to every caller
+"""
+
+import asyncio
+from typing import Any
+
+
+# Etherscan accepts at most 20 addresses per balancemulti call
+MAX_BALANCEMULTI_ADDRESSES = 20
+
+
+class _Batch:
+    """ addresses waiting for one balancemulti call """
+
+    def __init__(self) -> None:
+        self.waiters: dict[str, list[asyncio.Future]] = {}
+        self.timer: asyncio.TimerHandle | None = None
+
+
+class BalanceBatcher:
+    """
+    Micro-batcher turning concurrent `balance` calls into `balancemulti`.
+
+    Batches are keyed by chain API url and block tag. The first lookup of a
+    batch starts a `window` second timer; the batch is sent when the timer
+    fires or when it holds `max_size` addresses, whichever comes first.
+    Batch sizes are recorded in the client's `balance_batch_size` histogram.
+
+    Attributes:
+        client: EtherScanV2 client used for the upstream calls
+        window (float): Seconds a batch stays open
+        max_size (int): Addresses per batch (at most 20)
+
+    Example:
+        batcher = BalanceBatcher(client, window=0.01, max_size=20)
+        balance = await batcher.balance(base_url, {"address": "0x...", "tag": "latest"})
+    """
+
+    def __init__(self, client, window: float, max_size: int = MAX_BALANCEMULTI_ADDRESSES):
+        """
+        Initialize balance batcher.
+
+        Args:
+            client: EtherScanV2 client
+            window: Seconds to wait for more lookups before sending a batch
+            max_size: Maximum addresses per batch
+        """
+        self.client = client
+        self.window = window
+        self.max_size = max(1, min(max_size, MAX_BALANCEMULTI_ADDRESSES))
+        self._batches: dict[tuple[str, str], _Batch] = {}
+        self._flushes: set[asyncio.Task] = set()
+
+    async def balance(self, base_url: str, params: dict) -> Any:
+        """
+        Queue a balance lookup and wait for its batch.
+
+        Args:
+            base_url: Etherscan API url of the chain (with chainid query)
+            params: `balance` request parameters (address, tag)
+
+        Returns:
+            Balance in Wei as returned by Etherscan
+
+        Raises:
+            OSError: If the batch request fails
+            ValueError: If Etherscan returns an error for the batch
+        """
+        key = (base_url, params.get("tag", "latest"))
+        batch = self._batches.get(key)
+        if batch is None:
+            batch = self._batches[key] = _Batch()
+            batch.timer = asyncio.get_running_loop().call_later(
+                self.window, self._start_flush, key, batch)
+
+        future = asyncio.get_running_loop().create_future()
+        batch.waiters.setdefault(params["address"].lower(), []).append(future)
+        if len(batch.waiters) >= self.max_size:
+            self._start_flush(key, batch)
+        return await future
+
+    def _start_flush(self, key: tuple[str, str], batch: _Batch) -> None:
+        """ close a batch and send it in the background """
+        if self._batches.get(key) is not batch:
+            return  # already flushed
+        del self._batches[key]
+        if batch.timer is not None:
+            batch.timer.cancel()
+        task = asyncio.ensure_future(self._flush(key, batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, key: tuple[str, str], batch: _Batch) -> None:
+        """ send one balancemulti call and resolve the waiters """
+        base_url, tag = key
+        addresses = list(batch.waiters)
+        self.client.metrics.record("balance_batch_size", len(addresses))
+        try:
+            result = await self.client._call_upstream(
+                base_url, "account", "balancemulti",
+                {"address": ",".join(addresses), "tag": tag})
+        except Exception as e:
+            for futures in batch.waiters.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        balances = {entry["account"].lower(): entry["balance"] for entry in result}
+        for address, futures in batch.waiters.items():
+            for future in futures:
+                if future.done():
+                    continue
+                if address in balances:
+                    future.set_result(balances[address])
+                else:
+                    future.set_exception(ValueError(f"No balance returned for {address}"))
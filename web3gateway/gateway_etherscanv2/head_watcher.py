@@ -0,0 +1,183 @@
+"""
+Etherscan Chain Head Watcher Module
+
+This module follows the head block of the chains being queried:
+- One background `eth_blockNumber` poll per chain and interval, shared by
+  all workers through a Redis lock and a Redis head key
+- The head block is the epoch of the chain: cache keys of "latest"
+  queries carry it, so their entries stay valid exactly until the next block
+- Watchers start on first use and stop once their chain is idle
+"""
+
+import asyncio
+import logging
+import math
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from web3gateway.utils.metrics import Metrics
+
+
+# Defaults of the optional head_* settings (watching is off unless an
+# interval is set)
+DEFAULT_POLL_INTERVAL = 0
+DEFAULT_MAX_AGE = 30
+DEFAULT_IDLE_TIMEOUT = 300
+
+logger = logging.getLogger(__name__)
+
+
+class HeadWatcher:
+    """
+    Per-chain head block epochs, shared across worker processes.
+
+    Every `poll_interval` seconds each worker watching a chain tries to
+    take the chain's Redis poll lock, which expires on its own after the
+    interval. The worker holding it asks Etherscan for the head block and
+    stores it in the chain's Redis head key; the others read that key. A
+    chain thus costs one upstream call per interval whatever the number of
+    workers. Without Redis every worker polls for itself.
+
+    A head not confirmed for `max_age` seconds is not used, so cache keys
+    fall back to plain TTLs while the head is unknown.
+
+    Attributes:
+        redis: Async Redis client shared with the cache
+        fetch_head (Callable[[int], Awaitable[int]]): Upstream head lookup
+        metrics (Metrics): Poll and epoch counters
+        poll_interval (float): Seconds between polls (0 disables watching)
+        max_age (float): Seconds after which an unconfirmed head is unused
+        idle_timeout (float): Seconds without lookups after which a chain
+            is no longer watched
+        heads (dict[int, int]): Latest head block per chain id
+
+    Example:
+        watcher = HeadWatcher(cache.redis, fetch_head, config, metrics)
+        epoch = watcher.epoch(1)  # None until the first poll completed
+    """
+
+    def __init__(self, redis: Any, fetch_head: Callable[[int], Awaitable[int]],
+                 config: dict, metrics: Optional[Metrics] = None) -> None:
+        """
+        Initialize head watcher.
+
+        Args:
+            redis: Async Redis client
+            fetch_head: Coroutine function returning the head block of a chain
+            config: Configuration dictionary containing (all optional):
+                - head_poll_interval: Seconds between polls (0 disables watching)
+                - head_max_age: Seconds after which an unconfirmed head is unused
+                - head_idle_timeout: Seconds without lookups before a watcher stops
+            metrics: Counters to report to (optional)
+        """
+        self.redis = redis
+        self.fetch_head = fetch_head
+        self.metrics = metrics or Metrics()
+        self.poll_interval = config.get('head_poll_interval', DEFAULT_POLL_INTERVAL)
+        self.max_age = config.get('head_max_age', DEFAULT_MAX_AGE)
+        self.idle_timeout = config.get('head_idle_timeout', DEFAULT_IDLE_TIMEOUT)
+        self.heads: dict[int, int] = {}
+        self._confirmed_at: dict[int, float] = {}
+        self._used_at: dict[int, float] = {}
+        self._watchers: dict[int, asyncio.Task] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """ whether heads are watched at all """
+        return self.poll_interval > 0
+
+    def epoch(self, chain_id: int) -> Optional[int]:
+        """
+        Get the current head block of a chain, watching it from now on.
+
+        Args:
+            chain_id: Chain ID
+
+        Returns:
+            Optional[int]: Head block, or None if disabled, not known yet or
+            not confirmed recently
+        """
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        self._used_at[chain_id] = now
+        watcher = self._watchers.get(chain_id)
+        if watcher is None or watcher.done():
+            self._watchers[chain_id] = asyncio.ensure_future(self._watch(chain_id))
+        if now - self._confirmed_at.get(chain_id, -math.inf) > self.max_age:
+            return None
+        return self.heads.get(chain_id)
+
+    async def refresh(self, chain_id: int) -> Optional[int]:
+        """
+        Poll the head of a chain once, or read the head polled by another worker.
+
+        Args:
+            chain_id: Chain ID
+
+        Returns:
+            Optional[int]: Head block, or None if no worker published one yet
+
+        Raises:
+            Exception: Whatever the upstream head lookup raised
+        """
+        key = f"etherscanv2:{chain_id}:head"
+        try:
+            polling = await self.redis.set(f"lock:{key}", 1, nx=True,
+                                           px=max(1, int(self.poll_interval * 1000)))
+        except Exception as e:
+            logger.debug(f"Chain {chain_id}: head lock unavailable, polling locally: {e}")
+            polling = True
+
+        if polling:
+            self.metrics.incr("head_poll")
+            head = await self.fetch_head(chain_id)
+            try:
+                await self.redis.set(key, head, ex=max(1, math.ceil(self.max_age)))
+            except Exception as e:
+                logger.debug(f"Chain {chain_id}: failed to share head: {e}")
+        else:
+            try:
+                value = await self.redis.get(key)
+            except Exception as e:
+                logger.debug(f"Chain {chain_id}: shared head unavailable: {e}")
+                return None
+            if value is None:
+                return None
+            head = int(value)
+
+        self._observe(chain_id, head)
+        return head
+
+    def _observe(self, chain_id: int, head: int) -> None:
+        """ move the epoch of a chain forward, ignoring heads behind it """
+        current = self.heads.get(chain_id)
+        if current is not None and head < current:
+            return
+        if head != current:
+            self.metrics.incr("head_block")
+            self.heads[chain_id] = head
+        self._confirmed_at[chain_id] = time.monotonic()
+
+    async def _watch(self, chain_id: int) -> None:
+        """ refresh the head of a chain until it has not been used for idle_timeout """
+        while time.monotonic() - self._used_at.get(chain_id, 0) < self.idle_timeout:
+            try:
+                await self.refresh(chain_id)
+            except Exception as e:
+                logger.warning(f"Chain {chain_id}: head poll failed: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def close(self) -> None:
+        """
+        Stop watching every chain.
+        """
+        watchers = list(self._watchers.values())
+        self._watchers.clear()
+        for watcher in watchers:
+            watcher.cancel()
+        for watcher in watchers:
+            try:
+                await watcher
+            except asyncio.CancelledError:
+                pass
@@ -0,0 +1,223 @@
+"""
+Etherscan API Key Pool Module
+
+This module spreads Etherscan calls over several API keys:
+- One rate limiter and daily quota per key
+- Least-loaded dispatch to the key with the most remaining budget
+- Temporary cooldown of keys that hit the upstream rate limit
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from time import monotonic
+from typing import Any, Optional
+
+from web3gateway.exceptions import RateLimitException
+from web3gateway.utils.rate_limiter import RateLimiter, create_rate_limiter
+
+
+# Free tier daily call limit of an Etherscan API key
+DEFAULT_DAILY_QUOTA = 100000
+# Seconds a key stays out of rotation after "Max rate limit reached"
+DEFAULT_KEY_COOLDOWN = 60
+
+
+def mask_api_key(key: str) -> str:
+    """ hide most of an API key for logs and reports """
+    if len(key) <= 8:
+        return "*" * len(key)
+    return f"{key[:4]}...{key[-4:]}"
+
+
+def _fingerprint(key: str) -> str:
+    """ stable, non-reversible id of an API key for shared budget names """
+    return hashlib.sha256(key.encode()).hexdigest()[:16]
+
+
+class ApiKey:
+    """
+    One Etherscan API key with its own budget.
+
+    Attributes:
+        key (str): API key
+        limiter (RateLimiter): Per-key call rate limiter
+        daily_quota (int): Calls allowed per UTC day
+        used_today (int): Calls made by this process on the current UTC day
+        cooldown_until (float): Monotonic time the key is out of rotation until
+        rate_limited (int): Number of upstream rate limit responses
+    """
+
+    def __init__(self, key: str, limiter: RateLimiter, daily_quota: int):
+        """
+        Initialize API key state.
+
+        Args:
+            key: API key
+            limiter: Rate limiter dedicated to this key
+            daily_quota: Calls allowed per UTC day
+        """
+        self.key = key
+        self.limiter = limiter
+        self.daily_quota = daily_quota
+        self.used_today = 0
+        self.cooldown_until = 0.0
+        self.rate_limited = 0
+        self._day = self._today()
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    @property
+    def masked(self) -> str:
+        """ masked API key """
+        return mask_api_key(self.key)
+
+    def daily_remaining(self) -> int:
+        """
+        Calls left in today's quota.
+
+        Returns:
+            int: Remaining calls, reset at UTC midnight
+        """
+        today = self._today()
+        if today != self._day:
+            self._day = today
+            self.used_today = 0
+        return max(0, self.daily_quota - self.used_today)
+
+    def cooling_down(self) -> bool:
+        """ whether the key is temporarily out of rotation """
+        return monotonic() < self.cooldown_until
+
+    def state(self) -> dict[str, Any]:
+        """
+        Get a JSON-friendly view of the key's budget.
+
+        Returns:
+            dict[str, Any]: Masked key, limiter, quota and cooldown state
+        """
+        return {
+            "key": self.masked,
+            "available_now": self.limiter.available(),
+            "daily_quota": self.daily_quota,
+            "used_today": self.used_today,
+            "daily_remaining": self.daily_remaining(),
+            "cooldown_seconds": round(max(0.0, self.cooldown_until - monotonic()), 3),
+            "rate_limited": self.rate_limited,
+        }
+
+
+class ApiKeyPool:
+    """
+    Least-loaded dispatcher over several Etherscan API keys.
+
+    Attributes:
+        keys (list[ApiKey]): Keys in rotation order
+        cooldown (float): Seconds a rate-limited key is left out
+
+    Example:
+        pool = ApiKeyPool({"etherscan_api_key": ["key1", "key2"], ...})
+        api_key = await pool.acquire()
+        ...
+        pool.report_rate_limited(api_key)
+    """
+
+    def __init__(self, config: dict, redis: Any = None):
+        """
+        Initialize API key pool.
+
+        Args:
+            config: Configuration dictionary containing:
+                - etherscan_api_key: One key or a list of keys
+                - rate_limit settings applied to each key
+                - etherscan_daily_quota: Calls per key per UTC day (optional)
+                - etherscan_key_cooldown: Cooldown seconds (optional)
+            redis: Async Redis client for the "redis" rate limit backend
+
+        Raises:
+            ValueError: If no API key is configured
+        """
+        api_keys = config['etherscan_api_key']
+        if isinstance(api_keys, str):
+            api_keys = [api_keys]
+        if not api_keys:
+            raise ValueError("At least one etherscan_api_key is required")
+
+        daily_quota = config.get('etherscan_daily_quota', DEFAULT_DAILY_QUOTA)
+        self.cooldown = config.get('etherscan_key_cooldown', DEFAULT_KEY_COOLDOWN)
+        self.keys = [
+            ApiKey(key, create_rate_limiter(config, redis, name=f"etherscan:{_fingerprint(key)}"),
+                   daily_quota)
+            for key in api_keys]
+
+    def select(self) -> ApiKey:
+        """
+        Pick the key with the most remaining budget.
+
+        Keys in cooldown or out of daily quota are skipped. Ties on the
+        immediately available budget are broken by remaining daily quota.
+
+        Returns:
+            ApiKey: Selected key
+
+        Raises:
+            RateLimitException: If every key is cooling down or out of quota
+        """
+        best: Optional[ApiKey] = None
+        best_score: tuple[int, int] = (-1, -1)
+        for api_key in self.keys:
+            daily_remaining = api_key.daily_remaining()
+            if daily_remaining <= 0 or api_key.cooling_down():
+                continue
+            score = (api_key.limiter.available(), daily_remaining)
+            if score > best_score:
+                best, best_score = api_key, score
+        if best is None:
+            raise RateLimitException("All Etherscan API keys are rate limited or out of quota")
+        return best
+
+    async def acquire(self) -> ApiKey:
+        """
+        Select a key and wait for its rate limiter.
+
+        Returns:
+            ApiKey: Key to use for the next upstream call
+
+        Raises:
+            RateLimitException: If every key is cooling down or out of quota
+        """
+        api_key = self.select()
+        # count before waiting so concurrent callers see the reservation
+        api_key.used_today += 1
+        await api_key.limiter.acquire()
+        return api_key
+
+    def has_slack(self) -> bool:
+        """
+        Tell whether a call could be made right now without waiting.
+
+        Returns:
+            bool: True if a usable key has budget left in its rate limiter
+        """
+        return any(api_key.daily_remaining() > 0 and not api_key.cooling_down()
+                   and api_key.limiter.available() > 0 for api_key in self.keys)
+
+    def report_rate_limited(self, api_key: ApiKey) -> None:
+        """
+        Take a key out of rotation after an upstream rate limit response.
+
+        Args:
+            api_key: Key that was rate limited
+        """
+        api_key.rate_limited += 1
+        api_key.cooldown_until = monotonic() + self.cooldown
+
+    def state(self) -> list[dict[str, Any]]:
+        """
+        Get the budget state of every key.
+
+        Returns:
+            list[dict[str, Any]]: One entry per key
+        """
+        return [api_key.state() for api_key in self.keys]
@@ -5,8 +5,12 @@ This module defines valid parameters and metadata for all API endpoints:
 - Parameter validation maps
 - Base URLs
 - Endpoint definitions
+- Cache TTL policies
 """
 
+from typing import NamedTuple
+
+
 # Base API URL for all requests
 base_url: str = "https://api.etherscan.io/v2/api"
 
@@ -68,7 +72,7 @@ valid_params = {
     'eth_getTransactionReceipt': ['txhash'],
     'eth_call': ['to', 'data', 'tag'],
     'eth_getCode': ['address', 'tag'],
-    'eth_getStorageAt': ['address', 'position'],
+    'eth_getStorageAt': ['address', 'position', 'tag'],
     'eth_gasPrice': [],
     'eth_estimateGas': ['data', 'to', 'value', 'gas', 'gasPrice'],
 
@@ -112,6 +116,119 @@ valid_params = {
     'getapilimit': [],
 }
 
+# TTL classes of cached results, mapped to seconds by the cache_*_expiration settings
+TTL_IMMUTABLE = "immutable"  # never changes once final
+TTL_STATIC = "static"        # changes rarely (contract metadata)
+TTL_BLOCK = "block"          # changes with every new block
+TTL_SHORT = "short"          # live off-chain data (prices)
+TTL_DEFAULT = "default"      # cache_expiration
+TTL_NONE = "none"            # never cached (writes, verification jobs, quotas)
+
+
+class CachePolicy(NamedTuple):
+    """
+    How long the result of an action may be cached.
+
+    The result is immutable, whatever `ttl` says, when every parameter in
+    `block_params` is an explicit block number at or below the finalized
+    block, when every parameter in `date_params` is a date before today
+    (UTC), or, with `result_block`, when the result was mined in a
+    finalized block. A missing parameter means "latest" and never counts.
+
+    Attributes:
+        ttl: TTL class otherwise
+        block_params: Parameters holding the newest block the result covers
+        date_params: Parameters holding the newest date the result covers
+        result_block: Result carries the `blockNumber` it was mined in
+    """
+    ttl: str = TTL_DEFAULT
+    block_params: tuple[str, ...] = ()
+    date_params: tuple[str, ...] = ()
+    result_block: bool = False
+
+
+_DAILY = CachePolicy(TTL_DEFAULT, date_params=('enddate',))
+_AT_BLOCK = CachePolicy(TTL_BLOCK, block_params=('tag',))
+
+# Cache policy of each action in valid_params; actions not listed use the default
+cache_policies = {
+    # Account
+    'balance': CachePolicy(TTL_BLOCK),
+    'balancemulti': CachePolicy(TTL_BLOCK),
+    'txlist': CachePolicy(TTL_DEFAULT, block_params=('endblock',)),
+    'txlistinternal': CachePolicy(TTL_DEFAULT, block_params=('endblock',)),
+    'tokentx': CachePolicy(TTL_DEFAULT, block_params=('endblock',)),
+    'tokennfttx': CachePolicy(TTL_DEFAULT, block_params=('endblock',)),
+    'token1155tx': CachePolicy(TTL_DEFAULT, block_params=('endblock',)),
+    'txsBeaconWithdrawal': CachePolicy(TTL_DEFAULT, block_params=('endblock',)),
+    'balancehistory': CachePolicy(TTL_DEFAULT, block_params=('blockno',)),
+
+    # Contracts
+    'getabi': CachePolicy(TTL_IMMUTABLE),
+    'getsourcecode': CachePolicy(TTL_STATIC),
+    'getcontractcreation': CachePolicy(TTL_IMMUTABLE),
+    'verifysourcecode': CachePolicy(TTL_NONE),
+    'checkverifystatus': CachePolicy(TTL_NONE),
+    'verifyproxycontract': CachePolicy(TTL_NONE),
+    'checkproxyverification': CachePolicy(TTL_NONE),
+
+    # Block
+    'getblockreward': CachePolicy(TTL_BLOCK, block_params=('blockno',)),
+    'getblockcountdown': CachePolicy(TTL_BLOCK),
+    'getblocknobytime': CachePolicy(TTL_BLOCK),
+    'dailyavgblocksize': _DAILY,
+    'dailyblkcount': _DAILY,
+    'dailyblockrewards': _DAILY,
+    'dailyavgblocktime': _DAILY,
+    'dailyuncleblkcount': _DAILY,
+
+    # Logs
+    'getLogs': CachePolicy(TTL_DEFAULT, block_params=('toBlock',)),
+
+    # Geth/Parity Proxy
+    'eth_blockNumber': CachePolicy(TTL_BLOCK),
+    'eth_getBlockByNumber': _AT_BLOCK,
+    'eth_getUncleByBlockNumberAndIndex': _AT_BLOCK,
+    'eth_getBlockTransactionCountByNumber': _AT_BLOCK,
+    'eth_getTransactionByHash': CachePolicy(TTL_BLOCK, result_block=True),
+    'eth_getTransactionByBlockNumberAndIndex': _AT_BLOCK,
+    'eth_getTransactionCount': _AT_BLOCK,
+    'eth_sendRawTransaction': CachePolicy(TTL_NONE),
+    'eth_getTransactionReceipt': CachePolicy(TTL_BLOCK, result_block=True),
+    'eth_call': _AT_BLOCK,
+    'eth_getCode': _AT_BLOCK,
+    'eth_getStorageAt': _AT_BLOCK,
+    'eth_gasPrice': CachePolicy(TTL_BLOCK),
+    'eth_estimateGas': CachePolicy(TTL_BLOCK),
+
+    # Token
+    'tokensupplyhistory': CachePolicy(TTL_DEFAULT, block_params=('blockno',)),
+    'tokenbalancehistory': CachePolicy(TTL_DEFAULT, block_params=('blockno',)),
+    'tokeninfo': CachePolicy(TTL_STATIC),
+
+    # Gas Tracker
+    'gasestimate': CachePolicy(TTL_BLOCK),
+    'gasoracle': CachePolicy(TTL_BLOCK),
+    'dailyavggaslimit': _DAILY,
+    'dailygasused': _DAILY,
+    'dailyavggasprice': _DAILY,
+
+    # Stats
+    'ethprice': CachePolicy(TTL_SHORT),
+    'chainsize': _DAILY,
+    'dailytxnfee': _DAILY,
+    'dailynewaddress': _DAILY,
+    'dailynetutilization': _DAILY,
+    'dailyavghashrate': _DAILY,
+    'dailytx': _DAILY,
+    'dailyavgnetdifficulty': _DAILY,
+    'ethdailymarketcap': _DAILY,
+    'ethdailyprice': _DAILY,
+
+    # Usage
+    'getapilimit': CachePolicy(TTL_NONE),
+}
+
 # Parameter descriptions for documentation
 param_descriptions = {
     "address": "Ethereum address (42 characters beginning with 0x)",
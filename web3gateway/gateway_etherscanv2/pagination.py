@@ -0,0 +1,142 @@
+"""
+Etherscan Pagination Module
+
+This module walks list actions (txlist, tokentx, ...) page by page with:
+- page/offset pages of a block range, fetched through the client cache
+- The next page prefetched while the current one is consumed, when the
+  rate limiter has budget to spare
+- Block range windows past Etherscan's 10,000 results per query, resumed
+  at the last block seen without repeating its rows
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+from web3gateway.utils.metrics import Metrics
+
+
+# Etherscan returns at most page * offset = 10,000 results per query
+MAX_RESULT_WINDOW = 10000
+DEFAULT_PAGE_SIZE = 1000
+DEFAULT_STARTBLOCK = 0
+DEFAULT_ENDBLOCK = 99999999
+
+
+def _block(row: dict) -> int:
+    """ block number of a result row (decimal, or hex for logs) """
+    return int(row["blockNumber"], 0)
+
+
+def _trailing_run(rows: list[dict], block: Optional[int], count: int) -> tuple[int, int]:
+    """ block of the last row and the rows of that block seen so far """
+    last = _block(rows[-1])
+    run = 0
+    for row in reversed(rows):
+        if _block(row) != last:
+            break
+        run += 1
+    if run == len(rows) and last == block:
+        run += count
+    return last, run
+
+
+async def _fetch_page(fetch: Callable[[dict], Awaitable[Any]], params: dict) -> list[dict]:
+    """ one page of results, empty when Etherscan finds none """
+    try:
+        return await fetch(params) or []
+    except ValueError as e:
+        # "No transactions found" comes back as an error status with an empty result
+        if e.args != ([],):
+            raise
+        return []
+
+
+def _spawn(fetch: Callable[[dict], Awaitable[Any]], params: dict) -> asyncio.Task:
+    """ start fetching a page """
+    return asyncio.ensure_future(_fetch_page(fetch, params))
+
+
+def _discard(task: asyncio.Task) -> None:
+    """ cancel a prefetch nobody will await, retrieving its outcome """
+    task.cancel()
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+
+async def paginate(fetch: Callable[[dict], Awaitable[Any]], params: dict,
+                   page_size: int = DEFAULT_PAGE_SIZE,
+                   has_slack: Callable[[], bool] = lambda: True,
+                   metrics: Optional[Metrics] = None) -> AsyncIterator[list[dict]]:
+    """
+    Iterate over the pages of a block range query.
+
+    Pages of `page_size` rows are requested until a short page ends the
+    range. Once a query reaches 10,000 results, the next one starts at the
+    block of the last row (`startblock`, or `endblock` when sorted desc)
+    and skips the rows of that block already returned. While a page is
+    consumed the next one is fetched if `has_slack()` tells that the rate
+    limiter can afford it; otherwise it is fetched when asked for.
+
+    Args:
+        fetch: Request of one page, called with the query parameters
+        params: Query parameters (startblock, endblock, sort, ...)
+        page_size: Rows per page (at most 10,000)
+        has_slack: Whether a call could be made right now without waiting
+        metrics: Recorder of the page and page_prefetch counters
+
+    Yields:
+        list[dict]: Rows of each page, in query order
+
+    Raises:
+        OSError: If a page request fails
+        ValueError: If Etherscan returns an error, or more than 10,000
+            rows share a single block
+    """
+    page_size = max(1, min(page_size, MAX_RESULT_WINDOW))
+    pages_per_window = MAX_RESULT_WINDOW // page_size
+    bound = "endblock" if params.get("sort", "asc") == "desc" else "startblock"
+    window = {"startblock": DEFAULT_STARTBLOCK, "endblock": DEFAULT_ENDBLOCK,
+              **params, "offset": page_size}
+    page = 1
+    # block of the last rows of the window, their count, and rows to skip
+    run_block: Optional[int] = None
+    run_count = skip = 0
+    pending: Optional[asyncio.Task] = _spawn(fetch, {**window, "page": page})
+    try:
+        while pending is not None:
+            rows = await pending
+            pending = None
+            if metrics is not None:
+                metrics.incr("page")
+
+            if skip:
+                dropped = min(skip, len(rows))
+                returned, skip = rows[dropped:], skip - dropped
+            else:
+                returned = rows
+
+            next_params = None
+            if len(rows) == page_size:
+                run_block, run_count = _trailing_run(rows, run_block, run_count)
+                if page < pages_per_window:
+                    page += 1
+                elif run_block == int(window[bound]):
+                    raise ValueError(f"More than {MAX_RESULT_WINDOW} results in block "
+                                     f"{run_block}, they cannot be paginated")
+                else:
+                    # resume at the last block, past the rows of it already returned
+                    window[bound] = run_block
+                    page, skip = 1, run_count
+                    run_block, run_count = None, 0
+                next_params = {**window, "page": page}
+                if has_slack():
+                    pending = _spawn(fetch, next_params)
+                    if metrics is not None:
+                        metrics.incr("page_prefetch")
+
+            if returned:
+                yield returned
+            if next_params is not None and pending is None:
+                pending = _spawn(fetch, next_params)
+    finally:
+        if pending is not None:
+            _discard(pending)
@@ -0,0 +1,223 @@
+"""
+Etherscan Cache TTL Policy Module
+
+This module decides how long an Etherscan result may be cached:
+- A TTL class per action from the `cache_policies` metadata table
+- Immutable results (finalized blocks, past dates) kept until evicted
+- Per-action overrides from the configuration
+- Results of "latest" queries scoped to the chain head instead of a TTL
+- Stale windows past the expiration, per action, for stale-while-revalidate
+"""
+
+from datetime import date, datetime, timezone
+from typing import Any, Optional
+
+from .metadata import (
+    TTL_BLOCK,
+    TTL_DEFAULT,
+    TTL_IMMUTABLE,
+    TTL_NONE,
+    TTL_SHORT,
+    TTL_STATIC,
+    CachePolicy,
+    cache_policies,
+)
+
+
+# Defaults of the optional cache_*_expiration settings (0 never expires)
+DEFAULT_IMMUTABLE_EXPIRATION = 0
+DEFAULT_STATIC_EXPIRATION = 86400
+DEFAULT_BLOCK_EXPIRATION = 2
+DEFAULT_SHORT_EXPIRATION = 5
+# Default of the optional cache_finality_blocks setting
+DEFAULT_FINALITY_BLOCKS = 64
+# Default of the optional cache_epoch_expiration setting
+DEFAULT_EPOCH_EXPIRATION = 60
+# Default of the optional cache_stale_window setting (serving stale is off)
+DEFAULT_STALE_WINDOW = 0
+
+# End block used by the account actions to mean "up to the latest block"
+LATEST_BLOCK_PLACEHOLDER = 99999999
+
+_DEFAULT_POLICY = CachePolicy()
+
+
+def _block_number(value: Any) -> Optional[int]:
+    """ explicit block number of a parameter, None for tags like latest """
+    if isinstance(value, str):
+        try:
+            value = int(value, 16) if value.lower().startswith("0x") else int(value)
+        except ValueError:
+            return None
+    if not isinstance(value, int) or value == LATEST_BLOCK_PLACEHOLDER:
+        return None
+    return value
+
+
+def _date(value: Any) -> Optional[date]:
+    """ date of a yyyy-mm-dd parameter """
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class TtlPolicy:
+    """
+    Cache expiration of Etherscan results.
+
+    Each action has a TTL class (see `metadata.cache_policies`) whose
+    seconds come from the configuration. A result covering only finalized
+    blocks or past days never changes, so it is cached with the immutable
+    expiration instead; finding out whether a block is final needs the
+    chain head, which the caller looks up only when `head_block` says so.
+
+    A result that `follows_head` (a block TTL query at `latest`) only
+    changes with a new block; when the chain head is known it is cached
+    under a key carrying the head block, for `epoch_expiration` seconds.
+
+    An expiring result may be kept for its action's stale window past its
+    expiration (the soft TTL), up to the hard TTL; in between it is served
+    stale while being refreshed.
+
+    Attributes:
+        expirations (dict[str, int]): Seconds per TTL class (0 never expires)
+        overrides (dict[str, int]): Seconds per action, replacing its TTL class
+        finality_blocks (int): Blocks below the head considered final
+        epoch_expiration (int): Seconds to cache a result keyed by head block
+        stale_window (int): Seconds a result may be served stale
+        stale_overrides (dict[str, int]): Stale window per action
+
+    Example:
+        policy = TtlPolicy(config)
+        final_block = None
+        if policy.head_block(action, params, result) is not None:
+            final_block = head - policy.finality_blocks
+        expire = policy.expiration(action, policy.ttl_class(action, params, result, final_block))
+    """
+
+    def __init__(self, config: dict[str, Any]):
+        """
+        Initialize TTL policy.
+
+        Args:
+            config: Configuration dictionary containing:
+                - cache_expiration: Seconds of the default TTL class
+                - cache_immutable_expiration, cache_static_expiration,
+                  cache_block_expiration, cache_short_expiration: Seconds
+                  of the other TTL classes (optional)
+                - cache_action_expiration: Seconds per action (optional)
+                - cache_finality_blocks: Confirmations making a block final (optional)
+                - cache_epoch_expiration: Seconds to cache results keyed by
+                  head block (optional)
+                - cache_stale_window: Seconds results may be served stale
+                  while refreshed (optional, 0 disables it)
+                - cache_action_stale_window: Stale window per action (optional)
+        """
+        self.expirations = {
+            TTL_IMMUTABLE: config.get('cache_immutable_expiration',
+                                      DEFAULT_IMMUTABLE_EXPIRATION),
+            TTL_STATIC: config.get('cache_static_expiration', DEFAULT_STATIC_EXPIRATION),
+            TTL_BLOCK: config.get('cache_block_expiration', DEFAULT_BLOCK_EXPIRATION),
+            TTL_SHORT: config.get('cache_short_expiration', DEFAULT_SHORT_EXPIRATION),
+            TTL_DEFAULT: config['cache_expiration'],
+        }
+        self.overrides: dict[str, int] = config.get('cache_action_expiration', {})
+        self.finality_blocks = config.get('cache_finality_blocks', DEFAULT_FINALITY_BLOCKS)
+        self.epoch_expiration = config.get('cache_epoch_expiration', DEFAULT_EPOCH_EXPIRATION)
+        self.stale_window = config.get('cache_stale_window', DEFAULT_STALE_WINDOW)
+        self.stale_overrides: dict[str, int] = config.get('cache_action_stale_window', {})
+
+    def cacheable(self, action: str) -> bool:
+        """ whether results of an action are cached at all """
+        return action in self.overrides or \
+            cache_policies.get(action, _DEFAULT_POLICY).ttl != TTL_NONE
+
+    def follows_head(self, action: str, params: dict) -> bool:
+        """
+        Tell whether a result changes only when a new block arrives.
+
+        True for block TTL actions queried at `latest` (no explicit block,
+        no `pending` tag) whose result is not tied to a block of its own.
+
+        Args:
+            action: API action name
+            params: Request parameters
+
+        Returns:
+            bool: True if the result may be cached until the next block
+        """
+        policy = cache_policies.get(action, _DEFAULT_POLICY)
+        if action in self.overrides or policy.ttl != TTL_BLOCK or policy.result_block:
+            return False
+        if "pending" in params.values():
+            return False
+        return self.head_block(action, params, None) is None
+
+    def head_block(self, action: str, params: dict, result: Any) -> Optional[int]:
+        """
+        Get the newest block a result covers, if it may be final.
+
+        Args:
+            action: API action name
+            params: Request parameters
+            result: API result
+
+        Returns:
+            Optional[int]: Block to compare with the finalized block, or None
+            if the result is not tied to explicit blocks
+        """
+        policy = cache_policies.get(action, _DEFAULT_POLICY)
+        if action in self.overrides:
+            return None
+        if policy.block_params:
+            blocks = [_block_number(params.get(param)) for param in policy.block_params]
+            if None not in blocks:
+                return max(blocks)
+        if policy.result_block and isinstance(result, dict):
+            return _block_number(result.get('blockNumber'))
+        return None
+
+    def ttl_class(self, action: str, params: dict, result: Any,
+                  final_block: Optional[int] = None) -> str:
+        """
+        Classify a result.
+
+        Args:
+            action: API action name
+            params: Request parameters
+            result: API result
+            final_block: Newest finalized block, if `head_block` asked for it
+
+        Returns:
+            str: TTL class of the result
+        """
+        policy = cache_policies.get(action, _DEFAULT_POLICY)
+        block = self.head_block(action, params, result)
+        if block is not None and final_block is not None and block <= final_block:
+            return TTL_IMMUTABLE
+        if policy.date_params:
+            today = datetime.now(timezone.utc).date()
+            dates = [_date(params.get(param)) for param in policy.date_params]
+            if None not in dates and max(dates) < today:
+                return TTL_IMMUTABLE
+        return policy.ttl
+
+    def expiration(self, action: str, ttl_class: str) -> Optional[int]:
+        """
+        Get the cache expiration of a classified result.
+
+        Args:
+            action: API action name
+            ttl_class: TTL class from `ttl_class`
+
+        Returns:
+            Optional[int]: Seconds (0 never expires), or None if not cached
+        """
+        if action in self.overrides:
+            return self.overrides[action]
+        return self.expirations.get(ttl_class)
+
+    def stale_for(self, action: str) -> int:
+        """ seconds a result of an action may be served stale (0 never) """
+        return self.stale_overrides.get(action, self.stale_window)
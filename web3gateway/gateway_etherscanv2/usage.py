@@ -30,10 +30,13 @@ class Usage:
         """
         self.client = client
 
-    def getapilimit(self):
+    def getapilimit(self, per_key: bool = False):
         """
         Get current API usage and limit information.
 
+        Args:
+            per_key: Report every configured API key instead of one
+
         Returns:
             dict: API limit details containing:
             - creditsUsed: Number of API calls used
@@ -41,7 +44,12 @@ class Usage:
             - creditLimit: Total API call limit
             - limitInterval: Reset interval (e.g., "daily")
             - intervalExpiryTimespan: Time until limit reset
+
+            With per_key, a list with one entry per key containing its
+            masked key, local budget state and the details above in 'limit'.
         """
+        if per_key:
+            return self.client.api_key_states()
         return self.client.request("getapilimit", "getapilimit", {})
 
     def chainlist(self):
@@ -6,40 +6,55 @@ This module implements a FastAPI-based gateway service that provides:
 - Account balance and transaction queries
 - Transaction assembly and submission
 - Basic authentication and CORS support
+- An app factory (`create_app`) for embedding and multi-worker serving
+- Declared response schemas, fast JSON rendering and optional compression
+- Full transaction and transfer histories streamed as NDJSON or chunked JSON
 """
 
+import asyncio
+import json
 import logging
+from collections import defaultdict
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Any
+from typing import Any, AsyncIterator, Generic, Literal, Optional, TypeVar
 
-from fastapi import Depends, FastAPI, HTTPException
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from web3 import Web3
 
-from web3gateway.config import get_config
+from web3gateway.config import get_config, parse_args
 from web3gateway.gateway_blockchain import Blockchain
 from web3gateway.gateway_etherscanv2 import EtherScanV2
+from web3gateway.responses import CompressionMiddleware, FastJSONResponse, dumps
+from web3gateway.server import serve
 
 
-# Initialize gateway instances with configuration
-config = get_config()
-gw_etherscan = EtherScanV2(config)  # Etherscan API gateway for blockchain queries
-gw_blockchain = Blockchain(config)   # Direct blockchain interaction gateway
+router = APIRouter()  # Gateway routes, mounted by create_app
 
-app = FastAPI(title="Web3 Restful API Gateway")
+security = HTTPBasic()  # Basic HTTP authentication handler
 
-# Enable CORS middleware for cross-origin requests
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+MAX_BATCH_ITEMS = 1000  # Maximum items accepted by the batch endpoints
+
+# Media types of the streamed list formats
+STREAM_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "json": "application/json"}
+
+DataT = TypeVar("DataT")
 
-security = HTTPBasic()  # Basic HTTP authentication handler
+
+class Timestamped(BaseModel, Generic[DataT]):
+    """
+    Response schema of every route, see `with_timestamp`
+
+    Attributes:
+        timestamp (int): Response time in milliseconds since the epoch
+        data (DataT): Response data
+    """
+    timestamp: int
+    data: DataT
 
 
 def with_timestamp(data: dict[str, Any]) -> dict[str, Any]:
@@ -58,16 +73,97 @@ def with_timestamp(data: dict[str, Any]) -> dict[str, Any]:
     }
 
 
-def authenticate(credentials: HTTPBasicCredentials = Depends(security)):
+def raw_with_timestamp(field: str, raw: bytes) -> Response:
+    """
+    Wrap JSON text in the with_timestamp envelope without parsing it
+
+    Args:
+        field (str): Key of the data object holding the JSON text
+        raw (bytes): JSON text, e.g. a cached Etherscan result
+
+    Returns:
+        Response: JSON response spliced around the text
+    """
+    body = b'{"timestamp":%d,"data":{%s:%s}}' % (
+        int(datetime.now().timestamp() * 1000), json.dumps(field).encode(), raw)
+    return Response(body, media_type="application/json")
+
+
+async def stream_pages(field: str, pages: AsyncIterator[list[dict]],
+                       stream_format: str) -> StreamingResponse:
+    """
+    Stream the rows of paginated results while the next pages are fetched
+
+    As "ndjson" every row is one line; as "json" the rows are written into
+    the with_timestamp envelope under `field` as they arrive. The first page
+    is fetched before answering, so its errors are raised here. A later
+    error ends the stream with an {"error": ...} line (ndjson) or an
+    "error" key next to the rows (json).
+
+    Args:
+        field (str): Key of the data object holding the rows (json)
+        pages (AsyncIterator[list[dict]]): Pages of rows
+        stream_format (str): "ndjson" or "json"
+
+    Returns:
+        StreamingResponse: Response writing one chunk per page
+
+    Raises:
+        Exception: If the first page cannot be fetched
+    """
+    first = await anext(pages, None)
+    ndjson = stream_format == "ndjson"
+
+    async def chunks() -> AsyncIterator[bytes]:
+        if not ndjson:
+            yield b'{"timestamp":%d,"data":{%s:[' % (
+                int(datetime.now().timestamp() * 1000), dumps(field))
+        separator = b""
+        page = first
+        try:
+            while page is not None:
+                if ndjson:
+                    yield b"".join(dumps(row) + b"\n" for row in page)
+                else:
+                    yield separator + b",".join(dumps(row) for row in page)
+                    separator = b","
+                page = await anext(pages, None)
+        except Exception as e:
+            logging.exception(f"Error streaming {field}")
+            error = dumps(str(e) or type(e).__name__)
+            yield b'{"error":%s}\n' % error if ndjson else b'],"error":%s}}' % error
+            return
+        finally:
+            await pages.aclose()
+        if not ndjson:
+            yield b"]}}"
+
+    return StreamingResponse(chunks(), media_type=STREAM_MEDIA_TYPES[stream_format])
+
+
+def etherscan(http_request: Request) -> EtherScanV2:
+    """ Etherscan gateway of the serving app """
+    return http_request.app.state.gw_etherscan
+
+
+def blockchain(http_request: Request) -> Blockchain:
+    """ Blockchain gateway of the serving app """
+    return http_request.app.state.gw_blockchain
+
+
+def authenticate(http_request: Request,
+                 credentials: HTTPBasicCredentials = Depends(security)):
     """
     Verify HTTP basic authentication credentials
 
     Args:
+        http_request: Incoming request, giving access to the app config
         credentials: HTTP basic auth credentials
 
     Raises:
         HTTPException: If authentication fails
     """
+    config = http_request.app.state.config
     username = config['auth_username']
     password = config['auth_password']
     if credentials.username != username or credentials.password != password:
@@ -78,12 +174,54 @@ def authenticate(credentials: HTTPBasicCredentials = Depends(security)):
         )
 
 
-@app.get("/ping")
+class Pong(BaseModel):
+    """ Health check response schema """
+    message: str
+
+
+@router.get("/ping", response_model=Timestamped[Pong])
 async def ping():
     """Health check endpoint"""
     return with_timestamp({"message": "pong"})
 
 
+class Metrics(BaseModel):
+    """
+    Metrics response schema
+
+    Attributes:
+        etherscan (dict[str, Any]): Etherscan gateway counters and stages
+        cache (dict[str, Any]): Cache tier statistics
+        blockchain (dict[str, Any]): Blockchain gateway counters and stages
+        rpc (dict[int, dict[str, Any]]): RPC provider states per chain
+    """
+    etherscan: dict[str, Any]
+    cache: dict[str, Any]
+    blockchain: dict[str, Any]
+    rpc: dict[int, dict[str, Any]]
+
+
+@router.get("/metrics", response_model=Timestamped[Metrics])
+async def get_metrics(credentials: HTTPBasicCredentials = Depends(authenticate),
+                      gw_etherscan: EtherScanV2 = Depends(etherscan),
+                      gw_blockchain: Blockchain = Depends(blockchain)):
+    """
+    Get gateway counters and per-stage latency
+
+    Args:
+        credentials: Auth credentials
+        gw_etherscan: Etherscan gateway
+        gw_blockchain: Blockchain gateway
+
+    Returns:
+        dict: Metrics snapshot per gateway
+    """
+    return with_timestamp({"etherscan": gw_etherscan.metrics.snapshot(),
+                           "cache": gw_etherscan.cache.stats(),
+                           "blockchain": gw_blockchain.metrics.snapshot(),
+                           "rpc": gw_blockchain.provider_states()})
+
+
 class AssembleTranactionRequest(BaseModel):
     """
     Transaction assembly request schema
@@ -98,15 +236,17 @@ class AssembleTranactionRequest(BaseModel):
     gas_level: str
 
 
-@app.post("/transaction/assemble")
+@router.post("/transaction/assemble", response_model=Timestamped[dict[str, Any]])
 async def assemble_tx(request: AssembleTranactionRequest,
-                      credentials: HTTPBasicCredentials = Depends(authenticate)):
+                      credentials: HTTPBasicCredentials = Depends(authenticate),
+                      gw_blockchain: Blockchain = Depends(blockchain)):
     """
     Assemble an unsigned transaction with proper gas settings
 
     Args:
         request: Transaction assembly parameters
         credentials: Auth credentials
+        gw_blockchain: Blockchain gateway
 
     Returns:
         dict: Assembled transaction data
@@ -131,6 +271,113 @@ async def assemble_tx(request: AssembleTranactionRequest,
         raise HTTPException(status_code=400, detail=str(e))
 
 
+class AssembleTransactionsBatchRequest(BaseModel):
+    """
+    Batch transaction assembly request schema
+
+    Attributes:
+        chain_id (int): Target blockchain network ID
+        from_address (str): Sender of every transaction
+        tx_params (list[dict[str, Any]]): Parameters ('to', 'value', optional
+            'data') of each transaction, in nonce order
+        gas_level (str): Desired gas price level (slow/normal/fast)
+    """
+    chain_id: int
+    from_address: str
+    tx_params: list[dict[str, Any]] = Field(max_length=MAX_BATCH_ITEMS)
+    gas_level: str = "normal"
+
+
+class AssembledTransactions(BaseModel):
+    """
+    Batch transaction assembly response schema
+
+    Attributes:
+        transactions (list[dict[str, Any]]): Unsigned transaction or error per item
+    """
+    transactions: list[dict[str, Any]]
+
+
+@router.post("/transaction/assemble:batch", response_model=Timestamped[AssembledTransactions])
+async def assemble_tx_batch(request: AssembleTransactionsBatchRequest,
+                            credentials: HTTPBasicCredentials = Depends(authenticate),
+                            gw_blockchain: Blockchain = Depends(blockchain)):
+    """
+    Assemble many unsigned transactions from one sender with consecutive nonces
+
+    Fee data and the base nonce are fetched once for the whole batch. A
+    transaction that cannot be assembled gets an "error" entry and no
+    nonce; it does not fail the batch.
+
+    Args:
+        request: Sender and transaction parameters
+        credentials: Auth credentials
+        gw_blockchain: Blockchain gateway
+
+    Returns:
+        dict: One unsigned transaction or error per item, in request order
+
+    Raises:
+        HTTPException: If the batch cannot be assembled
+    """
+    try:
+        from_address = Web3.to_checksum_address(request.from_address.lower())
+        results: list[Any] = [None] * len(request.tx_params)
+        valid: list[tuple[int, dict[str, Any]]] = []
+        for index, tx_params in enumerate(request.tx_params):
+            try:
+                valid.append((index, {
+                    'to': Web3.to_checksum_address(tx_params['to'].lower()),
+                    'value': tx_params['value'],
+                    'data': tx_params.get('data', '')}))
+            except Exception as e:
+                results[index] = {"error": str(e) or type(e).__name__}
+
+        assembled = await gw_blockchain.assemble_unsigned_transactions(
+            request.chain_id, from_address, [tx for _, tx in valid], request.gas_level)
+        for (index, _), tx in zip(valid, assembled, strict=True):
+            results[index] = {"error": str(tx) or type(tx).__name__} \
+                if isinstance(tx, BaseException) else tx
+        return with_timestamp({"transactions": results})
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+class GasEstimateRequest(BaseModel):
+    """
+    Gas fee estimate request schema
+
+    Attributes:
+        chain_id (int): Target blockchain network ID
+    """
+    chain_id: int
+
+
+@router.post("/gas/estimate", response_model=Timestamped[dict[str, Any]])
+async def estimate_gas_fees(request: GasEstimateRequest,
+                            credentials: HTTPBasicCredentials = Depends(authenticate),
+                            gw_blockchain: Blockchain = Depends(blockchain)):
+    """
+    Get slow/normal/fast fee estimates of a chain
+
+    Args:
+        request: Chain to estimate fees for
+        credentials: Auth credentials
+        gw_blockchain: Blockchain gateway
+
+    Returns:
+        dict: Fees per gas level, with the tracked block and base fee
+
+    Raises:
+        HTTPException: If the fees cannot be estimated
+    """
+    try:
+        fees = await gw_blockchain.estimate_fees(request.chain_id)
+        return with_timestamp(fees)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 class SendTransactionRequest(BaseModel):
     """
     Send transaction request schema
@@ -143,15 +390,22 @@ class SendTransactionRequest(BaseModel):
     raw_tx: str
 
 
-@app.post("/transaction/send")
+class TransactionHash(BaseModel):
+    """ Send transaction response schema """
+    transaction_hash: str
+
+
+@router.post("/transaction/send", response_model=Timestamped[TransactionHash])
 async def send_transaction(request: SendTransactionRequest,
-                           credentials: HTTPBasicCredentials = Depends(authenticate)):
+                           credentials: HTTPBasicCredentials = Depends(authenticate),
+                           gw_blockchain: Blockchain = Depends(blockchain)):
     """
     Send a raw transaction to the blockchain
 
     Args:
         request: Send transaction parameters
         credentials: Auth credentials
+        gw_blockchain: Blockchain gateway
 
     Returns:
         dict: Transaction hash
@@ -179,15 +433,22 @@ class GetTransactionReceiptRequest(BaseModel):
     tx_hash: str
 
 
-@app.post("/transaction/get_receipt")
+class ReceiptStatus(BaseModel):
+    """ Transaction receipt response schema (status None while pending) """
+    status: Optional[int]
+
+
+@router.post("/transaction/get_receipt", response_model=Timestamped[ReceiptStatus])
 async def get_transaction_receipt(request: GetTransactionReceiptRequest,
-                                  credentials: HTTPBasicCredentials = Depends(authenticate)):
+                                  credentials: HTTPBasicCredentials = Depends(authenticate),
+                                  gw_blockchain: Blockchain = Depends(blockchain)):
     """
     Get the receipt of a transaction
 
     Args:
         request: Get receipt parameters
         credentials: Auth credentials
+        gw_blockchain: Blockchain gateway
 
     Returns:
         dict: Transaction receipt status
@@ -215,15 +476,22 @@ class AccountBalanceRequest(BaseModel):
     address: str
 
 
-@app.post("/account/balance")
+class AccountBalance(BaseModel):
+    """ Account balance response schema (balance in Wei) """
+    balance: str
+
+
+@router.post("/account/balance", response_model=Timestamped[AccountBalance])
 async def get_account_balance(request: AccountBalanceRequest,
-                              credentials: HTTPBasicCredentials = Depends(authenticate)):
+                              credentials: HTTPBasicCredentials = Depends(authenticate),
+                              gw_etherscan: EtherScanV2 = Depends(etherscan)):
     """
     Get the balance of an account
 
     Args:
         request: Account balance parameters
         credentials: Auth credentials
+        gw_etherscan: Etherscan gateway
 
     Returns:
         dict: Account balance
@@ -232,9 +500,8 @@ async def get_account_balance(request: AccountBalanceRequest,
         HTTPException: If retrieval fails
     """
     try:
-        gw_etherscan.set_chain_id(request.chain_id)
         address = Web3.to_checksum_address(request.address)
-        balance = await gw_etherscan.account.balance(address)
+        balance = await gw_etherscan.for_chain(request.chain_id).account.balance(address)
         return with_timestamp({"balance": balance if balance is not None else "0"})
     except Exception as e:
         logging.exception(f"Error getting balance for {request.chain_id}:{request.address}")
@@ -255,15 +522,31 @@ class AccountTokenBalanceRequest(BaseModel):
     address: str
 
 
-@app.post("/account/token_balance")
+class AccountTokenBalance(BaseModel):
+    """
+    Account token balance response schema
+
+    Attributes:
+        contract_address (str): Token contract address ("contract address")
+        address (str): Account address
+        token_balance (str): Balance in the token's smallest unit ("token balance")
+    """
+    contract_address: str = Field(alias="contract address")
+    address: str
+    token_balance: str = Field(alias="token balance")
+
+
+@router.post("/account/token_balance", response_model=Timestamped[AccountTokenBalance])
 async def get_account_token_balance(request: AccountTokenBalanceRequest,
-                                    credentials: HTTPBasicCredentials = Depends(authenticate)):
+                                    credentials: HTTPBasicCredentials = Depends(authenticate),
+                                    gw_etherscan: EtherScanV2 = Depends(etherscan)):
     """
     Get the token balance of an account
 
     Args:
         request: Token balance parameters
         credentials: Auth credentials
+        gw_etherscan: Etherscan gateway
 
     Returns:
         dict: Token balance
@@ -272,10 +555,9 @@ async def get_account_token_balance(request: AccountTokenBalanceRequest,
         HTTPException: If retrieval fails
     """
     try:
-        gw_etherscan.set_chain_id(request.chain_id)
         contract_address = Web3.to_checksum_address(request.contractaddress)
         address = Web3.to_checksum_address(request.address)
-        response = await gw_etherscan.tokens.tokenbalance(
+        response = await gw_etherscan.for_chain(request.chain_id).tokens.tokenbalance(
             contract_address, address)
         # {
         #    "status":"1",
@@ -291,6 +573,168 @@ async def get_account_token_balance(request: AccountTokenBalanceRequest,
         raise HTTPException(status_code=500, detail=str(e))
 
 
+class BalanceItem(BaseModel):
+    """
+    One balance lookup of a batch
+
+    Attributes:
+        chain_id (int): Target blockchain network ID
+        address (str): Account address
+    """
+    chain_id: int
+    address: str
+
+
+class AccountBalancesBatchRequest(BaseModel):
+    """
+    Batch account balance request schema
+
+    Attributes:
+        items (list[BalanceItem]): Balance lookups, possibly across chains
+    """
+    items: list[BalanceItem] = Field(max_length=MAX_BATCH_ITEMS)
+
+
+def batch_error(item: BaseModel, e: BaseException) -> dict[str, Any]:
+    """
+    Build the per-item error entry of a batch response
+
+    Args:
+        item: Batch request item
+        e: Error raised for the item
+
+    Returns:
+        dict[str, Any]: Item fields with the error message
+    """
+    return {**item.model_dump(), "error": str(e) or type(e).__name__}
+
+
+class AccountBalances(BaseModel):
+    """
+    Batch account balance response schema
+
+    Attributes:
+        balances (list[dict[str, Any]]): Balance or error per item
+    """
+    balances: list[dict[str, Any]]
+
+
+@router.post("/account/balances:batch", response_model=Timestamped[AccountBalances])
+async def get_account_balances_batch(request: AccountBalancesBatchRequest,
+                                     credentials: HTTPBasicCredentials = Depends(authenticate),
+                                     gw_etherscan: EtherScanV2 = Depends(etherscan)):
+    """
+    Get the balances of many accounts across chains in one call
+
+    Lookups are grouped per chain, served from the cache where possible
+    and fetched with balancemulti otherwise. A failing item does not fail
+    the batch; it gets an "error" entry instead of a "balance".
+
+    Args:
+        request: Balance lookups
+        credentials: Auth credentials
+        gw_etherscan: Etherscan gateway
+
+    Returns:
+        dict: One result per item, in request order
+    """
+    results: list[dict[str, Any]] = [{} for _ in request.items]
+    by_chain: dict[int, list[tuple[int, str]]] = defaultdict(list)
+    for index, item in enumerate(request.items):
+        try:
+            by_chain[item.chain_id].append((index, Web3.to_checksum_address(item.address)))
+        except Exception as e:
+            results[index] = batch_error(item, e)
+
+    async def chain_balances(chain_id: int, entries: list[tuple[int, str]]) -> None:
+        try:
+            balances = await gw_etherscan.for_chain(chain_id).account.balances(
+                [address for _, address in entries])
+        except Exception as e:
+            balances = {address: e for _, address in entries}
+        for index, address in entries:
+            balance = balances[address]
+            if isinstance(balance, BaseException):
+                results[index] = batch_error(request.items[index], balance)
+            else:
+                results[index] = {"chain_id": chain_id, "address": address, "balance": balance}
+
+    await asyncio.gather(*(chain_balances(c, e) for c, e in by_chain.items()))
+    return with_timestamp({"balances": results})
+
+
+class TokenBalanceItem(BaseModel):
+    """
+    One token balance lookup of a batch
+
+    Attributes:
+        chain_id (int): Target blockchain network ID
+        contractaddress (str): Token contract address
+        address (str): Account address
+    """
+    chain_id: int
+    contractaddress: str
+    address: str
+
+
+class AccountTokenBalancesBatchRequest(BaseModel):
+    """
+    Batch account token balance request schema
+
+    Attributes:
+        items (list[TokenBalanceItem]): Token balance lookups, possibly across chains
+    """
+    items: list[TokenBalanceItem] = Field(max_length=MAX_BATCH_ITEMS)
+
+
+class AccountTokenBalances(BaseModel):
+    """
+    Batch account token balance response schema
+
+    Attributes:
+        token_balances (list[dict[str, Any]]): Token balance or error per
+            item ("token balances")
+    """
+    token_balances: list[dict[str, Any]] = Field(alias="token balances")
+
+
+@router.post("/account/token_balances:batch", response_model=Timestamped[AccountTokenBalances])
+async def get_account_token_balances_batch(
+        request: AccountTokenBalancesBatchRequest,
+        credentials: HTTPBasicCredentials = Depends(authenticate),
+        gw_etherscan: EtherScanV2 = Depends(etherscan)):
+    """
+    Get many token balances across chains in one call
+
+    Lookups run concurrently through the cache and the rate limiter. A
+    failing item does not fail the batch; it gets an "error" entry instead
+    of a "token balance".
+
+    Args:
+        request: Token balance lookups
+        credentials: Auth credentials
+        gw_etherscan: Etherscan gateway
+
+    Returns:
+        dict: One result per item, in request order
+    """
+    async def token_balance(item: TokenBalanceItem) -> dict[str, Any]:
+        try:
+            contract_address = Web3.to_checksum_address(item.contractaddress)
+            address = Web3.to_checksum_address(item.address)
+            balance = await gw_etherscan.for_chain(item.chain_id).tokens.tokenbalance(
+                contract_address, address)
+            return {"chain_id": item.chain_id,
+                    "contract address": contract_address,
+                    "address": address,
+                    "token balance": balance}
+        except Exception as e:
+            return batch_error(item, e)
+
+    results = await asyncio.gather(*(token_balance(item) for item in request.items))
+    return with_timestamp({"token balances": list(results)})
+
+
 class AccountTransactionsRequest(BaseModel):
     """
     Account transactions request schema
@@ -298,40 +742,188 @@ class AccountTransactionsRequest(BaseModel):
     Attributes:
         chain_id (int): Target blockchain network ID
         address (str): Account address
+        startblock (int): Starting block number
+        endblock (int): Ending block number
+        sort (str): Sort order (asc/desc)
+        stream (Optional[str]): "ndjson" or "json" to stream the whole history
+            page by page, None for Etherscan's first 10,000 results at once
     """
     chain_id: int
     address: str
+    startblock: int = 0
+    endblock: int = 99999999
+    sort: Literal["asc", "desc"] = "asc"
+    stream: Optional[Literal["ndjson", "json"]] = None
 
 
-@app.post("/account/txlist")
+class AccountTransactions(BaseModel):
+    """
+    Account transactions response schema
+
+    Attributes:
+        last_transactions (list[dict[str, Any]]): Transactions as returned
+            by Etherscan ("last transactions")
+    """
+    last_transactions: list[dict[str, Any]] = Field(alias="last transactions")
+
+
+@router.post("/account/txlist", response_model=Timestamped[AccountTransactions])
 async def get_account_transactions(request: AccountTransactionsRequest,
-                                   credentials: HTTPBasicCredentials = Depends(authenticate)):
+                                   credentials: HTTPBasicCredentials = Depends(authenticate),
+                                   gw_etherscan: EtherScanV2 = Depends(etherscan)):
     """
     Get the list of transactions for an account
 
     Args:
         request: Account transactions parameters
         credentials: Auth credentials
+        gw_etherscan: Etherscan gateway
 
     Returns:
-        dict: List of transactions
+        Response: List of transactions, passed through from the cache as JSON
+        text, or streamed as NDJSON or chunked JSON
 
     Raises:
         HTTPException: If retrieval fails
     """
     try:
-        gw_etherscan.set_chain_id(request.chain_id)
-        txs = await gw_etherscan.account.txlist(request.address)
-        return with_timestamp({"last transactions": txs})
+        account = gw_etherscan.for_chain(request.chain_id).account
+        if request.stream is not None:
+            pages = account.txlist_pages(request.address, request.startblock,
+                                         request.endblock, request.sort)
+            return await stream_pages("last transactions", pages, request.stream)
+        txs = await account.txlist(request.address, request.startblock, request.endblock,
+                                   request.sort, raw=True)
+        return raw_with_timestamp("last transactions", txs)
     except Exception as e:
         logging.exception(f"Error getting transactions for {request.chain_id}:{request.address}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Account actions of the token standards
+TOKEN_TRANSFER_PAGES = {"erc20": "tokentx_pages", "erc721": "tokennfttx_pages",
+                        "erc1155": "token1155tx_pages"}
+
+
+class AccountTokenTransfersRequest(BaseModel):
+    """
+    Account token transfers request schema
+
+    Attributes:
+        chain_id (int): Target blockchain network ID
+        address (str): Account address
+        contractaddress (Optional[str]): Token contract address, None for every token
+        standard (str): Token standard (erc20/erc721/erc1155)
+        startblock (int): Starting block number
+        endblock (int): Ending block number
+        sort (str): Sort order (asc/desc)
+        stream (str): "ndjson" or "json"
+    """
+    chain_id: int
+    address: str
+    contractaddress: Optional[str] = None
+    standard: Literal["erc20", "erc721", "erc1155"] = "erc20"
+    startblock: int = 0
+    endblock: int = 99999999
+    sort: Literal["asc", "desc"] = "asc"
+    stream: Literal["ndjson", "json"] = "json"
+
+
+class AccountTokenTransfers(BaseModel):
+    """
+    Account token transfers response schema (stream "json")
+
+    Attributes:
+        token_transfers (list[dict[str, Any]]): Transfer events as returned
+            by Etherscan ("token transfers")
+    """
+    token_transfers: list[dict[str, Any]] = Field(alias="token transfers")
+
+
+@router.post("/account/token_transfers", response_model=Timestamped[AccountTokenTransfers])
+async def get_account_token_transfers(request: AccountTokenTransfersRequest,
+                                      credentials: HTTPBasicCredentials = Depends(authenticate),
+                                      gw_etherscan: EtherScanV2 = Depends(etherscan)):
+    """
+    Stream every token transfer event of an account, page by page
+
+    Args:
+        request: Account token transfers parameters
+        credentials: Auth credentials
+        gw_etherscan: Etherscan gateway
+
+    Returns:
+        StreamingResponse: Transfer events as NDJSON or chunked JSON
+
+    Raises:
+        HTTPException: If the first page cannot be retrieved
+    """
+    try:
+        account = gw_etherscan.for_chain(request.chain_id).account
+        pages = getattr(account, TOKEN_TRANSFER_PAGES[request.standard])(
+            request.address, request.contractaddress, request.startblock,
+            request.endblock, request.sort)
+        return await stream_pages("token transfers", pages, request.stream)
+    except Exception as e:
+        logging.exception("Error getting token transfers for "
+                          f"{request.chain_id}:{request.address}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Load the chain lists (from disk when possible) before serving and keep
+    them revalidated in the background; release the gateways on shutdown.
+    """
+    gateways = (app.state.gw_etherscan, app.state.gw_blockchain)
+    await asyncio.gather(*(gateway.start() for gateway in gateways))
+    yield
+    await asyncio.gather(*(gateway.close() for gateway in gateways))
+
+
+def create_app(config: dict[str, Any]) -> FastAPI:
+    """
+    Build the gateway application for a configuration
+
+    The gateways are created here but open no connections until the app
+    starts, so the app can be built (and preloaded) before forking workers.
+
+    Args:
+        config: Configuration dictionary (see config.json.example)
+
+    Returns:
+        FastAPI: Application with the gateway routes
+    """
+    app = FastAPI(title="Web3 Restful API Gateway", lifespan=lifespan,
+                  default_response_class=FastJSONResponse)
+    app.state.config = config
+    # Etherscan API gateway for blockchain queries
+    app.state.gw_etherscan = EtherScanV2(config)
+    # Direct blockchain interaction gateway
+    app.state.gw_blockchain = Blockchain(config)
+
+    # Enable CORS middleware for cross-origin requests
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    # Compress large responses when enabled
+    compression = CompressionMiddleware.options(config)
+    if compression is not None:
+        app.add_middleware(CompressionMiddleware, **compression)
+    app.include_router(router)
+    return app
+
+
 def main():
     """
     Application entry point - starts the FastAPI server
-    Using uvicorn with hot reload for development
     """
-    import uvicorn
-    uvicorn.run(app, host="localhost", port=8000)
+    args = parse_args()
+    app = create_app(get_config(args))
+    serve(app, host=args.host, port=args.port, workers=args.workers,
+          loop=args.loop, http=args.http, backlog=args.backlog)
@@ -0,0 +1,249 @@
+"""
+Gateway Responses Module
+
+This module renders and compresses the gateway responses with:
+- A default JSON response class writing compact JSON with orjson when the
+  optional package is installed, and stdlib json otherwise
+- Opt-in gzip and brotli (with the optional `brotli` package) compression
+  of responses above a size threshold, negotiated from Accept-Encoding
+- Streamed responses compressed chunk by chunk, each chunk flushed so
+  clients read it without waiting for the end of the stream
+"""
+
+import asyncio
+import json
+import logging
+import zlib
+from importlib import import_module
+from importlib.util import find_spec
+from typing import Any, Optional
+
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+logger = logging.getLogger(__name__)
+
+# Defaults of the optional response_compression and response_compress_min_size settings
+DEFAULT_COMPRESSION: list[str] = []
+DEFAULT_COMPRESS_MIN_SIZE = 1024
+# Levels trading ratio for speed on dynamic responses
+GZIP_LEVEL = 1
+BROTLI_QUALITY = 4
+# Bodies from which compression runs in a worker thread, off the event loop
+THREAD_MIN_SIZE = 128 * 1024
+
+_orjson = import_module("orjson") if find_spec("orjson") is not None else None
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serialize content as compact JSON, with orjson when installed.
+
+    Args:
+        content: JSON-compatible content
+
+    Returns:
+        bytes: JSON text
+
+    Raises:
+        TypeError: If the content is not JSON-compatible
+    """
+    if _orjson is not None:
+        try:
+            return _orjson.dumps(content, option=_orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # orjson rejects integers above 64 bits, stdlib json takes over
+            pass
+    return json.dumps(content, ensure_ascii=False, allow_nan=False,
+                      separators=(",", ":")).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    """ JSON response rendered by `dumps` """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class _GzipStream:
+    """ gzip compressor of one response """
+
+    def __init__(self):
+        self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        flush = zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+        return self._compressor.compress(data) + self._compressor.flush(flush)
+
+
+class _BrotliStream:
+    """ brotli compressor of one response """
+
+    def __init__(self):
+        self._compressor = import_module("brotli").Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        compressed = self._compressor.process(data)
+        return compressed + (self._compressor.finish() if final else self._compressor.flush())
+
+
+# Compressors by content coding
+ENCODINGS = {"br": _BrotliStream, "gzip": _GzipStream}
+
+
+def _available(encodings: list[str]) -> list[str]:
+    """ the known, installed encodings of a setting, warning about the others """
+    available = []
+    for encoding in encodings:
+        if encoding not in ENCODINGS:
+            logger.warning(f"Unknown response compression {encoding}, ignored")
+        elif encoding == "br" and find_spec("brotli") is None:
+            logger.warning("Response compression br needs the brotli package, ignored")
+        else:
+            available.append(encoding)
+    return available
+
+
+def accepted_encodings(accept_encoding: str) -> set[str]:
+    """
+    Content codings an Accept-Encoding header allows.
+
+    Args:
+        accept_encoding: Header value, e.g. "gzip, br;q=0.8, *;q=0"
+
+    Returns:
+        set[str]: Codings with a non-zero quality ("*" included as is)
+    """
+    accepted = set()
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding.strip() and quality > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses of at least `min_size` bytes.
+
+    The first configured encoding the client accepts is used. Responses
+    already encoded, partial responses and small complete bodies are sent
+    unchanged; a streamed body is compressed whatever its size.
+
+    Attributes:
+        app (ASGIApp): Wrapped application
+        encodings (list[str]): Installed content codings, in preference order
+        min_size (int): Body bytes from which responses are compressed
+
+    Example:
+        app.add_middleware(CompressionMiddleware, encodings=["br", "gzip"], min_size=1024)
+    """
+
+    def __init__(self, app: ASGIApp, encodings: list[str],
+                 min_size: int = DEFAULT_COMPRESS_MIN_SIZE):
+        """
+        Initialize middleware.
+
+        Args:
+            app: Wrapped application
+            encodings: Content codings (br, gzip), in preference order
+            min_size: Body bytes from which responses are compressed
+        """
+        self.app = app
+        self.encodings = _available(encodings)
+        self.min_size = min_size
+
+    @classmethod
+    def options(cls, config: dict) -> Optional[dict[str, Any]]:
+        """
+        Middleware options of the optional response_compression and
+        response_compress_min_size settings.
+
+        Args:
+            config: Configuration dictionary
+
+        Returns:
+            Optional[dict[str, Any]]: Keyword arguments of the middleware,
+            None when compression is off
+        """
+        encodings = config.get('response_compression', DEFAULT_COMPRESSION)
+        if isinstance(encodings, str):
+            encodings = [encodings]
+        if not encodings:
+            return None
+        return {"encodings": list(encodings),
+                "min_size": config.get('response_compress_min_size', DEFAULT_COMPRESS_MIN_SIZE)}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        encoding = next((e for e in self.encodings if e in accepted or "*" in accepted), None)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSender(send, encoding, self.min_size).send)
+
+
+class _CompressingSender:
+    """ send callable of one response, compressing its body messages """
+
+    def __init__(self, send: Send, encoding: str, min_size: int):
+        self._send = send
+        self.encoding = encoding
+        self.min_size = min_size
+        self.start: Optional[Message] = None
+        self.stream: Any = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            self.passthrough = "content-encoding" in headers or message["status"] == 206
+            if self.passthrough:
+                await self._send(message)
+            else:
+                self.start = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start is not None:
+            start, self.start = self.start, None
+            headers = MutableHeaders(raw=start["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            if len(body) < self.min_size and not more_body:
+                self.passthrough = True
+                await self._send(start)
+                await self._send(message)
+                return
+            self.stream = ENCODINGS[self.encoding]()
+            headers["Content-Encoding"] = self.encoding
+            del headers["Content-Length"]
+            body = await self._compress(body, not more_body)
+            if not more_body:
+                headers["Content-Length"] = str(len(body))
+            await self._send(start)
+        else:
+            body = await self._compress(body, not more_body)
+        await self._send({**message, "body": body})
+
+    async def _compress(self, data: bytes, final: bool) -> bytes:
+        """ compress a body chunk, off the event loop if large """
+        if len(data) >= THREAD_MIN_SIZE:
+            return await asyncio.to_thread(self.stream.compress, data, final)
+        return self.stream.compress(data, final)
@@ -0,0 +1,141 @@
+"""
+Gateway Server Module
+
+This module runs the gateway application under uvicorn with:
+- A single in-process worker, or several pre-forked worker processes
+  accepting connections from one shared listening socket
+- Chain lists and registries loaded once in the parent before forking, so
+  workers start immediately and share those pages copy-on-write
+- Selectable event loop (uvloop), HTTP parser (httptools) and listen backlog
+"""
+
+import gc
+import logging
+import os
+import signal
+import socket
+import time
+from typing import Any
+
+import uvicorn
+from fastapi import FastAPI
+
+
+logger = logging.getLogger(__name__)
+
+# Seconds a worker must stay up to be restarted when it exits
+MIN_WORKER_UPTIME = 5
+
+
+def preload(app: FastAPI) -> None:
+    """
+    Load the shared, read-only data of the gateways.
+
+    Failures are logged only: the workers retry in the background.
+
+    Args:
+        app: Application built by `create_app`
+    """
+    for gateway in (app.state.gw_etherscan, app.state.gw_blockchain):
+        try:
+            gateway.preload()
+        except Exception as e:
+            logger.warning(f"Preloading {type(gateway).__name__} failed: {e}")
+
+
+def serve(app: FastAPI, host: str = "localhost", port: int = 8000, workers: int = 1,
+          loop: str = "auto", http: str = "auto", backlog: int = 2048) -> None:
+    """
+    Serve the application until interrupted.
+
+    With more than one worker the parent preloads the app, binds the socket
+    and forks the workers, restarting any that exits unexpectedly. SIGINT
+    or SIGTERM stops every worker gracefully.
+
+    Args:
+        app: Application built by `create_app`
+        host: Bind address
+        port: Bind port
+        workers: Worker processes
+        loop: Event loop: auto, asyncio or uvloop
+        http: HTTP parser: auto, h11 or httptools
+        backlog: Pending connections queued by the listening socket
+    """
+    config = uvicorn.Config(app, host=host, port=port, loop=loop, http=http, backlog=backlog)
+    preload(app)
+    if workers <= 1 or not hasattr(os, "fork"):
+        uvicorn.Server(config).run()
+        return
+
+    # import the loop and protocol implementations once, before forking
+    config.load()
+    sock = config.bind_socket()
+    # keep the preloaded objects out of the collector, so the workers'
+    # garbage collections do not copy the pages holding them
+    gc.freeze()
+
+    pool = _WorkerPool(config, sock)
+    signal.signal(signal.SIGINT, pool.stop)
+    signal.signal(signal.SIGTERM, pool.stop)
+    for _ in range(workers):
+        pool.spawn()
+    logger.info(f"Started {workers} workers on {host}:{port}")
+    pool.supervise()
+    sock.close()
+
+
+class _WorkerPool:
+    """ forked workers serving one shared socket, restarted when they exit """
+
+    def __init__(self, config: uvicorn.Config, sock: socket.socket):
+        self.config = config
+        self.sock = sock
+        # start time of each running worker, by pid
+        self.started: dict[int, float] = {}
+        self.stopping = False
+
+    def spawn(self) -> None:
+        """ fork one worker serving the shared socket """
+        pid = os.fork()
+        if pid == 0:
+            self._run_worker()
+        self.started[pid] = time.monotonic()
+
+    def _run_worker(self) -> None:
+        """ serve in the forked child until stopped, then exit it """
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        code = 0
+        try:
+            uvicorn.Server(self.config).run(sockets=[self.sock])
+        except BaseException:
+            logger.exception("Worker failed")
+            code = 1
+        finally:
+            os._exit(code)
+
+    def stop(self, signum: int, frame: Any) -> None:
+        """ forward a stop signal to the workers """
+        self.stopping = True
+        for pid in self.started:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def supervise(self) -> None:
+        """ reap exited workers until none is left, restarting unexpected exits """
+        while self.started:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            started = self.started.pop(pid, None)
+            if self.stopping or started is None:
+                continue
+            if time.monotonic() - started < MIN_WORKER_UPTIME:
+                logger.error(f"Worker {pid} exited right after starting, stopping")
+                self.stop(signal.SIGTERM, None)
+                continue
+            logger.warning(f"Worker {pid} exited with status {status}, restarting")
+            self.spawn()
@@ -2,52 +2,102 @@
 Redis Cache Service Module
 
 This module provides a wrapper around Redis for caching operations with:
-- JSON serialization/deserialization
+- Pluggable serialization and compression with versioned value headers
 - Error handling and custom exceptions
 - Prefix-based cache management
+- Short-lived distributed locks
+- Optional in-process LRU/TTL tier with cross-worker invalidation
+- Stale windows past the expiration for stale-while-revalidate reads
+- Raw JSON reads of cached values, spliced into responses undecoded
+- Many-key reads in a single round trip
 - Asynchronous operations
 """
 
+import asyncio
 import json
+import logging
+import uuid
 from typing import Any, Optional
 
 from redis.asyncio import Redis  # type: ignore
 
 from web3gateway.exceptions import CacheException
+from web3gateway.utils.cache_codec import CacheCodec
+from web3gateway.utils.local_cache import LocalCache
+
+
+logger = logging.getLogger(__name__)
+
+# Pub/sub channel used to drop local tier entries in every worker
+INVALIDATION_CHANNEL = "web3gateway:cache:invalidate"
+# Seconds to wait before resubscribing after an invalidation listener error
+INVALIDATION_RETRY_INTERVAL = 1.0
+
+# Delete a lock only if it is still held by the caller's token
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
 
 
 class CacheService:
     """
-    Asynchronous Redis cache service with JSON serialization.
+    Asynchronous Redis cache service with pluggable serialization.
 
     This class provides a high-level interface for cache operations with automatic
-    JSON serialization and comprehensive error handling.
+    serialization (see CacheCodec) and comprehensive error handling.
+
+    When `local_cache_size` is set, an in-process LRU/TTL tier answers
+    repeated lookups without a Redis round trip. Writes and deletes are
+    published on a Redis channel so other workers drop their local copy.
+
+    An entry set with a `stale` window stays in Redis that many seconds
+    past its expiration; `get_remote_with_ttl` tells how long ago such an
+    entry went stale, and stale entries never enter the in-process tier.
 
     Attributes:
-        redis: Async Redis client instance
+        redis: Async Redis client instance (values are bytes)
+        codec (CacheCodec): Encoder and decoder of cached values
+        local (Optional[LocalCache]): In-process tier, None when disabled
         _connected: Connection status flag
 
     Example:
-        cache = CacheService("redis://localhost:6379/0")
+        cache = CacheService("redis://localhost:6379/0", local_cache_size=10000)
         await cache.initialize()
         await cache.set("key", {"value": 123}, expire=300)
     """
 
-    def __init__(self, redis_url: str):
+    def __init__(self, redis_url: str, local_cache_size: int = 0,
+                 local_cache_ttl: float = 5, local_cache_invalidation: bool = True,
+                 codec: Optional[CacheCodec] = None):
         """
         Initialize cache service with Redis connection URL.
 
         Args:
             redis_url: Redis connection string (e.g., "redis://localhost:6379/0")
+            local_cache_size: Entries kept in the in-process tier (0 disables it)
+            local_cache_ttl: Maximum seconds an entry lives in the in-process tier
+            local_cache_invalidation: Subscribe to cross-worker invalidations
+            codec: Value codec (defaults to CacheCodec())
 
         Raises:
             CacheException: If Redis connection fails
         """
         try:
-            self.redis = Redis.from_url(redis_url, decode_responses=True)
+            self.redis = Redis.from_url(redis_url)
             self._connected = False
         except Exception as e:
             raise CacheException(f"Redis connection failed: {str(e)}") from e
+        self.codec = codec or CacheCodec()
+
+        self.local: Optional[LocalCache] = None
+        if local_cache_size > 0:
+            self.local = LocalCache(local_cache_size, local_cache_ttl)
+        self._invalidation = self.local is not None and local_cache_invalidation
+        self._instance_id = uuid.uuid4().hex
+        self._listener: Optional[asyncio.Task] = None
 
     async def initialize(self) -> None:
         """
@@ -61,10 +111,26 @@ class CacheService:
         except Exception as e:
             raise CacheException(f"Redis initialization failed: {str(e)}") from e
 
+    def get_local(self, key: str) -> Optional[Any]:
+        """
+        Retrieve a value from the in-process tier only.
+
+        Args:
+            key: Cache key to retrieve
+
+        Returns:
+            Optional[Any]: Cached value or None if absent or tier disabled
+        """
+        if self.local is None:
+            return None
+        return self.local.get(key)
+
     async def get(self, key: str) -> Optional[Any]:
         """
         Retrieve and deserialize a value from cache.
 
+        Looks in the in-process tier first, then in Redis.
+
         Args:
             key: Cache key to retrieve
 
@@ -74,26 +140,143 @@ class CacheService:
         Raises:
             CacheException: If retrieval or deserialization fails
         """
+        value = self.get_local(key)
+        if value is not None:
+            return value
+        return await self.get_remote(key)
+
+    async def get_remote(self, key: str, stale: float = 0) -> Optional[Any]:
+        """
+        Retrieve and deserialize a value from Redis.
+
+        A fresh hit is copied into the in-process tier for at most its
+        remaining fresh time. Entries within their stale window are returned
+        too; use `get_remote_with_ttl` to tell them apart.
+
+        Args:
+            key: Cache key to retrieve
+            stale: Stale window the entry was set with
+
+        Returns:
+            Optional[Any]: Deserialized value or None if not found
+
+        Raises:
+            CacheException: If retrieval or deserialization fails
+        """
+        if self.local is not None:
+            return (await self.get_remote_with_ttl(key, stale))[0]
         try:
             value = await self.redis.get(key)
-            if value:
-                return json.loads(value)
-            return None
-        except json.JSONDecodeError as e:
+            return self.codec.decode(value) if value else None
+        except ValueError as e:
+            # Auto-cleanup corrupted cache entries
+            await self.delete(key)
+            raise CacheException(f"Cache value decode error for key: {key}") from e
+        except Exception as e:
+            raise CacheException(f"Cache get error: {str(e)}") from e
+
+    async def get_remote_with_ttl(self, key: str, stale: float = 0,
+                                  raw: bool = False) -> tuple[Optional[Any], Optional[float]]:
+        """
+        Retrieve and deserialize a value from Redis with its remaining fresh time.
+
+        A fresh hit is copied into the in-process tier for at most its
+        remaining fresh time. A raw read returns the JSON text of the value
+        instead (see `CacheCodec.to_json`) and leaves the in-process tier alone.
+
+        Args:
+            key: Cache key to retrieve
+            stale: Stale window the entry was set with
+            raw: Return JSON text instead of the deserialized value
+
+        Returns:
+            tuple[Optional[Any], Optional[float]]: Deserialized value (or
+            JSON bytes if raw) or None if not found, and seconds until it
+            goes stale (negative once stale, None if it never expires)
+
+        Raises:
+            CacheException: If retrieval or deserialization fails
+        """
+        try:
+            if self.local is not None:
+                self._ensure_listener()
+            async with self.redis.pipeline(transaction=False) as pipe:
+                value, pttl = await pipe.get(key).pttl(key).execute()
+            return self._entry(key, value, pttl, stale, raw)
+        except ValueError as e:
             # Auto-cleanup corrupted cache entries
             await self.delete(key)
             raise CacheException(f"Cache value decode error for key: {key}") from e
         except Exception as e:
             raise CacheException(f"Cache get error: {str(e)}") from e
 
-    async def set(self, key: str, value: Any, expire: int = 0) -> bool:
+    async def get_remote_many_with_ttl(
+            self, keys: list[str], stale: float = 0) -> list[tuple[Optional[Any], Optional[float]]]:
+        """
+        Retrieve many values from Redis in one round trip, as `get_remote_with_ttl` does.
+
+        Corrupted entries are deleted and reported as missing rather than
+        failing the other keys.
+
+        Args:
+            keys: Cache keys to retrieve
+            stale: Stale window the entries were set with
+
+        Returns:
+            list[tuple[Optional[Any], Optional[float]]]: Deserialized value
+            or None, and seconds until it goes stale, for each key in order
+
+        Raises:
+            CacheException: If retrieval fails
+        """
+        if not keys:
+            return []
+        try:
+            if self.local is not None:
+                self._ensure_listener()
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.get(key).pttl(key)
+                replies = await pipe.execute()
+        except Exception as e:
+            raise CacheException(f"Cache get error: {str(e)}") from e
+        entries = []
+        for i, key in enumerate(keys):
+            try:
+                entries.append(self._entry(key, replies[2 * i], replies[2 * i + 1], stale))
+            except ValueError:
+                logger.warning(f"Cache value decode error for key: {key}")
+                await self.delete(key)
+                entries.append((None, None))
+        return entries
+
+    def _entry(self, key: str, value: Optional[bytes], pttl: int, stale: float,
+               raw: bool = False) -> tuple[Optional[Any], Optional[float]]:
+        """ decode a Redis value and its TTL, copying a fresh hit into the local tier """
+        if not value:
+            return None, None
+        fresh_for = pttl / 1000 - stale if pttl > 0 else None
+        if raw:
+            return self.codec.to_json(value), fresh_for
+        result = self.codec.decode(value)
+        if self.local is not None and (fresh_for is None or fresh_for > 0):
+            ttl = self.local.default_ttl
+            if fresh_for is not None:
+                ttl = min(ttl, fresh_for)
+            self.local.set(key, result, ttl)
+        return result, fresh_for
+
+    async def set(self, key: str, value: Any, expire: int = 0, stale: int = 0) -> bool:
         """
         Serialize and store a value in cache.
 
         Args:
             key: Cache key
-            value: Value to cache (must be JSON serializable)
+            value: Value to cache (must be JSON-compatible)
             expire: Expiration time in seconds (0 for no expiration)
+            stale: Seconds the value is kept in Redis past its expiration,
+                to be served stale while it is refreshed (ignored without
+                expiration)
 
         Returns:
             bool: True if successful
@@ -102,16 +285,25 @@ class CacheService:
             CacheException: If serialization or storage fails
         """
         try:
-            serialized = json.dumps(value)
-            if expire != 0:
-                result = await self.redis.set(key, serialized, ex=expire)
-                if not result:
-                    raise CacheException(f"Cache set error: {key}")
-                return result
-            result = await self.redis.set(key, serialized)
+            serialized = self.codec.encode(value)
+            redis_expire = expire + stale if expire else None
+            if self.local is None:
+                result = await self.redis.set(key, serialized, ex=redis_expire)
+            else:
+                self._ensure_listener()
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    pipe.set(key, serialized, ex=redis_expire)
+                    self._publish_invalidation(pipe, keys=[key])
+                    result = (await pipe.execute())[0]
+                ttl = self.local.default_ttl
+                if expire != 0:
+                    ttl = min(ttl, expire)
+                self.local.set(key, value, ttl)
             if not result:
                 raise CacheException(f"Cache set error: {key}")
             return result
+        except CacheException:
+            raise
         except (TypeError, ValueError) as e:
             raise CacheException(f"Cache serialization error: {str(e)}") from e
         except Exception as e:
@@ -131,7 +323,13 @@ class CacheService:
             CacheException: If deletion fails
         """
         try:
-            return await self.redis.delete(key) > 0
+            if self.local is None:
+                return await self.redis.delete(key) > 0
+            self.local.delete(key)
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.delete(key)
+                self._publish_invalidation(pipe, keys=[key])
+                return (await pipe.execute())[0] > 0
         except Exception as e:
             raise CacheException(f"Cache delete error: {str(e)}") from e
 
@@ -158,6 +356,116 @@ class CacheService:
                     deleted_count += await self.redis.delete(*keys)
                 if cursor == 0:
                     break
+            if self.local is not None:
+                self.local.clear_prefix(prefix)
+                await self.redis.publish(INVALIDATION_CHANNEL, self._invalidation_message(
+                    prefix=prefix))
             return deleted_count
         except Exception as e:
             raise CacheException(f"Cache clear error: {str(e)}") from e
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Get in-process tier statistics.
+
+        Returns:
+            dict[str, Any]: LocalCache stats, or {"enabled": False}
+        """
+        if self.local is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.local.stats()}
+
+    def _invalidation_message(self, keys: Optional[list[str]] = None,
+                              prefix: Optional[str] = None) -> str:
+        """ serialize an invalidation notice tagged with this instance """
+        return json.dumps({"origin": self._instance_id, "keys": keys or [], "prefix": prefix})
+
+    def _publish_invalidation(self, pipe, keys: list[str]) -> None:
+        """ queue an invalidation notice on a Redis pipeline """
+        if self._invalidation:
+            pipe.publish(INVALIDATION_CHANNEL, self._invalidation_message(keys=keys))
+
+    def _ensure_listener(self) -> None:
+        """ start the invalidation listener in the running loop if needed """
+        if self._invalidation and (self._listener is None or self._listener.done()):
+            self._listener = asyncio.ensure_future(self._listen_invalidations())
+
+    async def _listen_invalidations(self) -> None:
+        """ drop local entries written or deleted by other workers """
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    notice = json.loads(message["data"])
+                    if notice.get("origin") == self._instance_id or self.local is None:
+                        continue
+                    for key in notice.get("keys", []):
+                        self.local.delete(key)
+                    if notice.get("prefix"):
+                        self.local.clear_prefix(notice["prefix"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Entries may be stale while disconnected; start from scratch
+                logger.warning(f"Cache invalidation listener error: {str(e)}")
+                if self.local is not None:
+                    self.local.clear_prefix("")
+                await asyncio.sleep(INVALIDATION_RETRY_INTERVAL)
+            finally:
+                await pubsub.aclose()
+
+    async def close(self) -> None:
+        """
+        Stop the invalidation listener and close the Redis connection.
+        """
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        await self.redis.aclose()
+
+    async def acquire_lock(self, key: str, timeout: float) -> Optional[str]:
+        """
+        Try to take a short-lived lock shared by all processes.
+
+        Args:
+            key: Lock key
+            timeout: Seconds after which the lock expires on its own
+
+        Returns:
+            Optional[str]: Lock token if acquired, None if held by someone else
+
+        Raises:
+            CacheException: If the lock operation fails
+        """
+        token = uuid.uuid4().hex
+        try:
+            acquired = await self.redis.set(key, token, nx=True, px=int(timeout * 1000))
+        except Exception as e:
+            raise CacheException(f"Cache lock error: {str(e)}") from e
+        return token if acquired else None
+
+    async def release_lock(self, key: str, token: str) -> bool:
+        """
+        Release a lock taken with `acquire_lock`.
+
+        Args:
+            key: Lock key
+            token: Token returned by `acquire_lock`
+
+        Returns:
+            bool: True if the lock was still held and has been released
+
+        Raises:
+            CacheException: If the lock operation fails
+        """
+        try:
+            return await self.redis.eval(RELEASE_LOCK_SCRIPT, 1, key, token) == 1
+        except Exception as e:
+            raise CacheException(f"Cache unlock error: {str(e)}") from e
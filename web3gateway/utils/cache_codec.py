@@ -0,0 +1,277 @@
+"""
+Cache Codec Module
+
+This module turns cached values into Redis bytes and back with:
+- Pluggable serializers: json (stdlib), orjson and msgpack when installed
+- Compression of values above a size threshold: zlib (stdlib), zstd and
+  lz4 when installed
+- A versioned header naming the serializer and compression of each value,
+  so values written with other settings, and plain JSON values written
+  before the header existed, still decode
+- JSON text of JSON-serialized values extracted without decoding them
+"""
+
+import json
+import logging
+from importlib import import_module
+from typing import Any, Callable, NamedTuple
+
+
+logger = logging.getLogger(__name__)
+
+# First header byte; never the first byte of JSON text
+HEADER_MARKER = 0x00
+# Layout of the header following the marker byte
+HEADER_VERSION = 1
+HEADER_SIZE = 4
+# Defaults of the optional cache_serializer, cache_compression and
+# cache_compress_min_size settings
+DEFAULT_SERIALIZER = "orjson"
+DEFAULT_COMPRESSION = "zlib"
+DEFAULT_COMPRESS_MIN_SIZE = 16384
+
+
+class Format(NamedTuple):
+    """ a serializer or compression: its name and header id, and its two functions """
+    name: str
+    id: int
+    encode: Callable[[Any], bytes]
+    decode: Callable[[bytes], Any]
+    # whether the serializer writes JSON text
+    json: bool = False
+
+
+def _json() -> Format:
+    """ stdlib json serializer """
+    return Format("json", 0, lambda value: json.dumps(value, separators=(",", ":")).encode(),
+                  json.loads, json=True)
+
+
+def _orjson() -> Format:
+    """ orjson serializer """
+    orjson = import_module("orjson")
+    return Format("orjson", 1, orjson.dumps, orjson.loads, json=True)
+
+
+def _msgpack() -> Format:
+    """ msgpack serializer """
+    msgpack = import_module("msgpack")
+    return Format("msgpack", 2, lambda value: msgpack.packb(value, use_bin_type=True),
+                  lambda data: msgpack.unpackb(data, raw=False))
+
+
+def _none() -> Format:
+    """ no compression """
+    return Format("none", 0, lambda data: data, lambda data: data)
+
+
+def _zlib() -> Format:
+    """ stdlib zlib compression at its fastest level """
+    zlib = import_module("zlib")
+    return Format("zlib", 1, lambda data: zlib.compress(data, 1), zlib.decompress)
+
+
+def _zstd() -> Format:
+    """ zstandard compression """
+    zstandard = import_module("zstandard")
+    compressor, decompressor = zstandard.ZstdCompressor(level=3), zstandard.ZstdDecompressor()
+    return Format("zstd", 2, compressor.compress, decompressor.decompress)
+
+
+def _lz4() -> Format:
+    """ lz4 frame compression """
+    frame = import_module("lz4.frame")
+    return Format("lz4", 3, frame.compress, frame.decompress)
+
+
+# Loaders of the formats by name, in header id order
+SERIALIZERS: dict[str, Callable[[], Format]] = {
+    "json": _json, "orjson": _orjson, "msgpack": _msgpack}
+COMPRESSIONS: dict[str, Callable[[], Format]] = {
+    "none": _none, "zlib": _zlib, "zstd": _zstd, "lz4": _lz4}
+
+_NO_COMPRESSION = _none()
+
+
+def _load(loaders: dict[str, Callable[[], Format]], name: str, fallback: str) -> Format:
+    """ load a format by name, falling back when it is unknown or not installed """
+    try:
+        return loaders[name]()
+    except (KeyError, ImportError) as e:
+        logger.warning(f"Cache format {name} unavailable ({e!r}), using {fallback}")
+        return loaders[fallback]()
+
+
+class CacheCodec:
+    """
+    Encoder and decoder of cached values.
+
+    Every encoded value starts with a 4-byte header: a zero marker byte,
+    the header version, the serializer id and the compression id. Values
+    of at least `compress_min_size` serialized bytes are compressed. A
+    value the serializer cannot encode (orjson and msgpack reject integers
+    above 64 bits) is written with stdlib json instead. Decoding follows
+    the header, so any installed serializer or compression decodes, and a
+    value without header is read as plain JSON.
+
+    Attributes:
+        serializer (Format): Serializer of new values
+        compression (Format): Compression of large new values
+        compress_min_size (int): Serialized bytes from which values are compressed
+
+    Example:
+        codec = CacheCodec("orjson", "zstd", compress_min_size=16384)
+        assert codec.decode(codec.encode({"result": []})) == {"result": []}
+    """
+
+    def __init__(self, serializer: str = DEFAULT_SERIALIZER,
+                 compression: str = DEFAULT_COMPRESSION,
+                 compress_min_size: int = DEFAULT_COMPRESS_MIN_SIZE) -> None:
+        """
+        Initialize codec.
+
+        Args:
+            serializer: json, orjson or msgpack (json if not installed)
+            compression: none, zlib, zstd or lz4 (none if not installed)
+            compress_min_size: Serialized bytes from which values are compressed
+        """
+        self.serializer = _load(SERIALIZERS, serializer, "json")
+        self.compression = _load(COMPRESSIONS, compression, "none")
+        self.compress_min_size = compress_min_size
+        self._json = _json()
+        # writer of JSON text for to_json, orjson when installed
+        self._json_writer = self.serializer if self.serializer.json else \
+            _load(SERIALIZERS, "orjson", "json")
+        self._decoders: dict[tuple[int, int], tuple[Format, Format]] = {}
+
+    @classmethod
+    def from_config(cls, config: dict) -> "CacheCodec":
+        """
+        Create a codec from the optional cache_serializer, cache_compression
+        and cache_compress_min_size settings.
+
+        Args:
+            config: Configuration dictionary
+
+        Returns:
+            CacheCodec: Configured codec
+        """
+        return cls(config.get('cache_serializer', DEFAULT_SERIALIZER),
+                   config.get('cache_compression', DEFAULT_COMPRESSION),
+                   config.get('cache_compress_min_size', DEFAULT_COMPRESS_MIN_SIZE))
+
+    def encode(self, value: Any) -> bytes:
+        """
+        Serialize, and compress if large, a value.
+
+        Args:
+            value: JSON-compatible value
+
+        Returns:
+            bytes: Header followed by the payload
+
+        Raises:
+            TypeError: If the value is not JSON-compatible
+            ValueError: If the value cannot be serialized
+        """
+        serializer = self.serializer
+        try:
+            payload = serializer.encode(value)
+        except (TypeError, OverflowError):
+            if serializer.id == self._json.id:
+                raise
+            serializer = self._json
+            payload = serializer.encode(value)
+        compression = _NO_COMPRESSION
+        if len(payload) >= self.compress_min_size and self.compression.id != 0:
+            compression = self.compression
+            payload = compression.encode(payload)
+        return bytes((HEADER_MARKER, HEADER_VERSION, serializer.id, compression.id)) + payload
+
+    def decode(self, data: bytes) -> Any:
+        """
+        Decode a value written by any codec version, or as plain JSON.
+
+        Args:
+            data: Encoded value
+
+        Returns:
+            Any: Decoded value
+
+        Raises:
+            ValueError: If the value is corrupted or needs an unknown or
+                uninstalled format
+        """
+        if not data or data[0] != HEADER_MARKER:
+            return json.loads(data)
+        if len(data) < HEADER_SIZE or data[1] != HEADER_VERSION:
+            raise ValueError(f"Unknown cache value header: {bytes(data[:HEADER_SIZE])!r}")
+        serializer, compression = self._decoder(data[2], data[3])
+        try:
+            return serializer.decode(compression.decode(data[HEADER_SIZE:]))
+        except Exception as e:
+            raise ValueError(f"Corrupted {serializer.name}/{compression.name} "
+                             f"cache value: {e}") from e
+
+    def to_json(self, data: bytes) -> bytes:
+        """
+        Get the JSON text of an encoded value.
+
+        A value serialized as JSON is only decompressed, never decoded, so
+        it can be spliced into a response as it is.
+
+        Args:
+            data: Encoded value
+
+        Returns:
+            bytes: JSON text of the value
+
+        Raises:
+            ValueError: If the value is corrupted or needs an unknown or
+                uninstalled format
+        """
+        if not data or data[0] != HEADER_MARKER:
+            return bytes(data)
+        if len(data) < HEADER_SIZE or data[1] != HEADER_VERSION:
+            raise ValueError(f"Unknown cache value header: {bytes(data[:HEADER_SIZE])!r}")
+        serializer, compression = self._decoder(data[2], data[3])
+        if not serializer.json:
+            return self.dumps_json(self.decode(data))
+        try:
+            return bytes(compression.decode(memoryview(data)[HEADER_SIZE:]))
+        except Exception as e:
+            raise ValueError(f"Corrupted {compression.name} cache value: {e}") from e
+
+    def dumps_json(self, value: Any) -> bytes:
+        """
+        Serialize a value as compact JSON text, with orjson when installed.
+
+        Args:
+            value: JSON-compatible value
+
+        Returns:
+            bytes: JSON text
+
+        Raises:
+            TypeError: If the value is not JSON-compatible
+        """
+        try:
+            return self._json_writer.encode(value)
+        except (TypeError, OverflowError):
+            if self._json_writer.id == self._json.id:
+                raise
+            return self._json.encode(value)
+
+    def _decoder(self, serializer_id: int, compression_id: int) -> tuple[Format, Format]:
+        """ serializer and compression of a header, loaded on first use """
+        key = (serializer_id, compression_id)
+        decoder = self._decoders.get(key)
+        if decoder is None:
+            try:
+                decoder = (list(SERIALIZERS.values())[serializer_id](),
+                           list(COMPRESSIONS.values())[compression_id]())
+            except (IndexError, ImportError) as e:
+                raise ValueError(f"Cannot decode cache format {key}: {e!r}") from e
+            self._decoders[key] = decoder
+        return decoder
+
@@ -0,0 +1,179 @@
+"""
+Cached JSON Download Module
+
+This module keeps a copy of a remote JSON document on disk with:
+- Conditional refreshes (If-None-Match / If-Modified-Since) so an unchanged
+  document costs a 304 instead of a full download
+- Atomic writes, so a crash never leaves a truncated copy behind
+- A background refresh loop that never blocks the event loop
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import requests
+
+
+logger = logging.getLogger(__name__)
+
+# Seconds between attempts while the document cannot be fetched
+RETRY_INTERVAL = 60
+
+
+class CachedJsonFile:
+    """
+    Remote JSON document persisted on disk.
+
+    The document is saved as-is to `path`; the validators of the response
+    (ETag, Last-Modified), its url and the fetch time are saved next to it
+    in `<path>.meta`. A copy fetched from another url is ignored; a copy
+    without `.meta` is used and revalidated on the first refresh.
+
+    Attributes:
+        url (str): Document url
+        path (Path): Local copy
+        parse (Callable[[Any], Any]): Turns the document into the value used
+            by the caller, raising ValueError if the document is invalid
+        timeout (float): Request timeout in seconds
+        fetched_at (float): Unix time the copy was last fetched or revalidated
+
+    Example:
+        chainlist = CachedJsonFile(url, data_folder.joinpath("chainlist.json"))
+        chains = chainlist.load() or chainlist.fetch()
+    """
+
+    def __init__(self, url: str, path: Path, parse: Callable[[Any], Any] = lambda doc: doc,
+                 timeout: float = 10):
+        """
+        Initialize cached document.
+
+        Args:
+            url: Document url
+            path: Local copy
+            parse: Validates the document and extracts the value to return
+            timeout: Request timeout in seconds
+        """
+        self.url = url
+        self.path = Path(path)
+        self.parse = parse
+        self.timeout = timeout
+        self.fetched_at = 0.0
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+
+    @property
+    def meta_path(self) -> Path:
+        """ file holding the validators of the local copy """
+        return self.path.with_name(self.path.name + ".meta")
+
+    def load(self) -> Optional[Any]:
+        """
+        Load the local copy.
+
+        Returns:
+            Optional[Any]: Parsed value, or None if there is no valid copy of this url
+        """
+        try:
+            # a copy saved without validators is kept and revalidated on the first refresh
+            meta = {"url": self.url}
+            if self.meta_path.exists():
+                with open(self.meta_path, encoding='utf-8') as f:
+                    meta = json.load(f)
+            if meta.get("url") != self.url:
+                return None
+            with open(self.path, encoding='utf-8') as f:
+                value = self.parse(json.load(f))
+        except (OSError, ValueError) as e:
+            logger.debug(f"No usable copy of {self.url} in {self.path}: {e}")
+            return None
+        self._etag = meta.get("etag")
+        self._last_modified = meta.get("last_modified")
+        self.fetched_at = meta.get("fetched_at", 0.0)
+        return value
+
+    def fetch(self) -> Optional[Any]:
+        """
+        Revalidate the document and save it if it changed.
+
+        Returns:
+            Optional[Any]: Parsed new value, or None if the copy is still current
+
+        Raises:
+            OSError: If the request fails
+            ValueError: If the document is invalid
+        """
+        headers = {}
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+        if self._last_modified:
+            headers["If-Modified-Since"] = self._last_modified
+        res = requests.get(self.url, headers=headers, timeout=self.timeout)
+        if res.status_code == 304:
+            self.fetched_at = time.time()
+            self._save_meta()
+            return None
+        if res.status_code != 200:
+            raise OSError(f"Failed to get {self.url}: HTTP {res.status_code}")
+        document = res.json()
+        value = self.parse(document)
+        self._etag = res.headers.get("ETag")
+        self._last_modified = res.headers.get("Last-Modified")
+        self.save(document)
+        return value
+
+    def save(self, document: Any) -> None:
+        """
+        Save a copy of the document fetched now.
+
+        Args:
+            document: JSON document
+        """
+        self.fetched_at = time.time()
+        self._write(self.path, document)
+        self._save_meta()
+
+    def due_in(self, interval: float) -> float:
+        """ seconds until the copy is older than `interval` """
+        return max(0.0, self.fetched_at + interval - time.time())
+
+    async def refresh_loop(self, interval: float, on_update: Callable[[Any], None]) -> None:
+        """
+        Revalidate the document every `interval` seconds, forever.
+
+        The request runs in a worker thread; `on_update` is called on the
+        event loop with every new value.
+
+        Args:
+            interval: Seconds between revalidations
+            on_update: Receives each changed value
+        """
+        while True:
+            await asyncio.sleep(self.due_in(interval))
+            try:
+                value = await asyncio.to_thread(self.fetch)
+            except Exception as e:
+                logger.warning(f"Failed to refresh {self.url}: {e}")
+                await asyncio.sleep(min(interval, RETRY_INTERVAL))
+                continue
+            if value is not None:
+                on_update(value)
+
+    def _save_meta(self) -> None:
+        """ save the validators of the current copy """
+        self._write(self.meta_path, {"url": self.url, "etag": self._etag,
+                                     "last_modified": self._last_modified,
+                                     "fetched_at": self.fetched_at})
+
+    @staticmethod
+    def _write(path: Path, document: Any) -> None:
+        """ write a JSON file atomically """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding='utf-8') as f:
+            json.dump(document, f)
+        tmp_path.replace(path)
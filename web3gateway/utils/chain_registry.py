@@ -0,0 +1,168 @@
+"""
+Chain Registry Module
+
+This module provides a read-only index over chain metadata with:
+- Compact immutable per-chain records (only the fields the gateway uses)
+- O(1) lookup by chainId, name and shortName
+- No selection state, so one registry is safely shared by all requests
+"""
+
+import sys
+from types import MappingProxyType
+from typing import Any, Iterable, Iterator, NamedTuple, Optional
+
+
+class ChainRecord(NamedTuple):
+    """
+    Metadata of one chain.
+
+    Attributes:
+        chain_id (int): Chain ID
+        name (str): Chain name (e.g. "Ethereum Mainnet")
+        short_name (str): Chain short name (e.g. "eth")
+        rpc (tuple[str, ...]): RPC urls, possibly with ${...} API key placeholders
+        currency_symbol (str): Native currency symbol
+        currency_decimals (int): Native currency decimals
+    """
+    chain_id: int
+    name: str
+    short_name: str
+    rpc: tuple[str, ...]
+    currency_symbol: str
+    currency_decimals: int
+
+    @classmethod
+    def from_chainid_network(cls, chain_info: dict[str, Any]) -> "ChainRecord":
+        """
+        Build a record from a chainid.network chains.json entry.
+
+        Args:
+            chain_info: chains.json entry
+
+        Returns:
+            ChainRecord: Compact record of the chain
+        """
+        currency = chain_info.get("nativeCurrency") or {}
+        return cls(
+            chain_id=int(chain_info["chainId"]),
+            name=chain_info.get("name", ""),
+            short_name=sys.intern(chain_info.get("shortName", "")),
+            rpc=tuple(sys.intern(url) for url in chain_info.get("rpc", ())),
+            currency_symbol=sys.intern(currency.get("symbol", "")),
+            currency_decimals=int(currency.get("decimals", 18)),
+        )
+
+    def rpc_urls(self, infura_project_id: str = "") -> list[str]:
+        """
+        Get the RPC urls with the Infura project ID filled in.
+
+        Args:
+            infura_project_id: Project ID for Infura RPC endpoints
+
+        Returns:
+            list[str]: RPC urls
+        """
+        return [url.replace("${INFURA_API_KEY}", infura_project_id) for url in self.rpc]
+
+
+class ChainRegistry:
+    """
+    Immutable, indexed collection of chain records.
+
+    Indexes are built once; name and shortName lookups are case-insensitive.
+    When several entries share a key the first one wins, like the linear
+    scan it replaces.
+
+    Attributes:
+        by_id (Mapping[int, ChainRecord]): Records by chain ID
+        by_name (Mapping[str, ChainRecord]): Records by lower-cased name
+        by_short_name (Mapping[str, ChainRecord]): Records by lower-cased shortName
+
+    Example:
+        registry = ChainRegistry.from_chainid_network(chains_json)
+        record = registry.get(1)
+        rpc_urls = record.rpc_urls(infura_project_id)
+    """
+
+    __slots__ = ("by_id", "by_name", "by_short_name")
+
+    def __init__(self, records: Iterable[ChainRecord]):
+        """
+        Build the indexes.
+
+        Args:
+            records: Chain records
+        """
+        by_id: dict[int, ChainRecord] = {}
+        by_name: dict[str, ChainRecord] = {}
+        by_short_name: dict[str, ChainRecord] = {}
+        for record in records:
+            by_id.setdefault(record.chain_id, record)
+            if record.name:
+                by_name.setdefault(record.name.lower(), record)
+            if record.short_name:
+                by_short_name.setdefault(record.short_name.lower(), record)
+        self.by_id = MappingProxyType(by_id)
+        self.by_name = MappingProxyType(by_name)
+        self.by_short_name = MappingProxyType(by_short_name)
+
+    @classmethod
+    def from_chainid_network(cls, chains_json: Iterable[Any]) -> "ChainRegistry":
+        """
+        Build a registry from the chainid.network chains.json list.
+
+        Entries without a chainId are skipped.
+
+        Args:
+            chains_json: chains.json content
+
+        Returns:
+            ChainRegistry: Indexed registry
+        """
+        return cls(ChainRecord.from_chainid_network(chain_info) for chain_info in chains_json
+                   if isinstance(chain_info, dict) and "chainId" in chain_info)
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def __iter__(self) -> Iterator[ChainRecord]:
+        return iter(self.by_id.values())
+
+    def __contains__(self, chain_id: object) -> bool:
+        return chain_id in self.by_id
+
+    def get(self, chain_id: int) -> Optional[ChainRecord]:
+        """
+        Look up a chain by ID.
+
+        Args:
+            chain_id: Chain ID
+
+        Returns:
+            Optional[ChainRecord]: Record or None if unknown
+        """
+        return self.by_id.get(chain_id)
+
+    def get_by_name(self, name: str) -> Optional[ChainRecord]:
+        """
+        Look up a chain by name, case-insensitively.
+
+        Args:
+            name: Chain name
+
+        Returns:
+            Optional[ChainRecord]: Record or None if unknown
+        """
+        return self.by_name.get(name.lower())
+
+    def get_by_short_name(self, short_name: str) -> Optional[ChainRecord]:
+        """
+        Look up a chain by shortName, case-insensitively.
+
+        Args:
+            short_name: Chain short name
+
+        Returns:
+            Optional[ChainRecord]: Record or None if unknown
+        """
+        return self.by_short_name.get(short_name.lower())
@@ -3,19 +3,30 @@ Chain Information Management Module
 
 This module provides functionality to:
 - Fetch and manage EVM-compatible blockchain network information
-- Load and save chain configurations from/to JSON files
+- Load and save chain configurations from/to JSON files, revalidating the
+  local copy with ETag/If-Modified-Since
 - Select and retrieve specific chain information
+- Look up chains through an immutable indexed registry
 - Handle Infura project integration
 
 The chain information structure follows the chainid.network format.
 """
 
-import json
 from typing import Any, Optional
 
-import requests
-
 from web3gateway.config import data_folder
+from web3gateway.utils.cached_json_file import CachedJsonFile
+from web3gateway.utils.chain_registry import ChainRecord, ChainRegistry
+
+
+CHAINS_JSON_URL = "https://chainid.network/chains.json"
+
+
+def _parse_chains_json(document: Any) -> list[dict[str, Any]]:
+    """ validate a chains.json document """
+    if not isinstance(document, list):
+        raise ValueError("chains.json is not a list")
+    return document
 
 
 class Chains:
@@ -24,52 +35,117 @@ class Chains:
 
     This class handles the loading, saving, and selection of blockchain network
     configurations. It supports both local JSON files and remote updates from
-    chainid.network.
+    chainid.network. Without pre-loaded configurations nothing is read until
+    the chains are first used; the local copy is used if there is one,
+    otherwise chains.json is downloaded.
 
     Attributes:
         infura_project_id (str): Infura project ID for RPC endpoints
         chains_json (Optional[dict]): Loaded chain configurations
         selected_chain (Optional[dict]): Currently selected chain info
+        registry (ChainRegistry): Indexed records, rebuilt when chains_json changes
 
     Example:
         chains = Chains("your-infura-project-id")
         chains.update_chains_json()
         chains.select_chain_by_key_value("chainId", 1)
         rpc_urls = chains.get_selected_chain_value("rpc")
+
+        # shared, selection-free lookup
+        rpc_urls = chains.get_chain(1).rpc_urls(chains.infura_project_id)
     """
 
-    def __init__(self, infura_project_id: str, chains_json: Optional[dict[str, Any]] = None):
+    def __init__(self, infura_project_id: str, chains_json: Optional[dict[str, Any]] = None,
+                 url: str = CHAINS_JSON_URL):
         """
         Initialize Chains instance.
 
         Args:
             infura_project_id: Project ID for Infura RPC endpoints
             chains_json: Optional pre-loaded chain configurations
+            url: chains.json url
         """
         self.infura_project_id = infura_project_id
-
-        if chains_json is None:
-            self.update_chains_json()
-        else:
+        self.file = CachedJsonFile(url, data_folder.joinpath("chains.json"), _parse_chains_json)
+        self._chains_json: Optional[list[dict[str, Any]]] = None
+        self._registry: Optional[ChainRegistry] = None
+        self._key_indexes: dict[str, dict[Any, dict[str, Any]]] = {}
+        self._loaded = chains_json is not None
+        if chains_json is not None:
             self.chains_json = chains_json
 
         self.selected_chain = None
 
+    @property
+    def chains_json(self) -> Optional[list[dict[str, Any]]]:
+        """ loaded chain configurations, read or downloaded on first access """
+        if not self._loaded:
+            self._loaded = True
+            if not self.load_chains_json_file():
+                self.update_chains_json()
+        return self._chains_json
+
+    @chains_json.setter
+    def chains_json(self, chains_json: Optional[list[dict[str, Any]]]) -> None:
+        """ replace the chain configurations and drop the indexes built from them """
+        self._chains_json = chains_json
+        self._registry = None
+        self._key_indexes = {}
+
+    @property
+    def loaded(self) -> bool:
+        """ whether chain configurations were loaded or attempted to """
+        return self._loaded
+
+    @property
+    def registry(self) -> ChainRegistry:
+        """
+        Indexed, immutable view of the loaded chains, built on first use.
+
+        Raises:
+            ValueError: If chains_json is not loaded
+        """
+        if self._registry is None:
+            chains_json = self.chains_json
+            if chains_json is None:
+                raise ValueError("chains_json is None")
+            self._registry = ChainRegistry.from_chainid_network(chains_json)
+        return self._registry
+
+    def get_chain(self, chain_id: int) -> Optional[ChainRecord]:
+        """
+        Look up a chain by ID without touching the selection.
+
+        Args:
+            chain_id: Chain ID
+
+        Returns:
+            Optional[ChainRecord]: Record or None if unknown
+
+        Raises:
+            ValueError: If chains_json is not loaded
+        """
+        return self.registry.get(chain_id)
+
     def update_chains_json(self):
         """
         Update chain information from chainid.network.
 
-        Downloads the latest chain configurations and saves them locally.
+        Revalidates the local copy and saves the latest chain configurations
+        if they changed.
 
         Raises:
             ConnectionError: If unable to fetch chain information
         """
-        url = "https://chainid.network/chains.json"
-        response = requests.get(url, timeout=10)
-        if response.status_code != 200:
-            raise ConnectionError(f"Failed to get {url}")
-        self.chains_json = response.json()
-        self.save_chains_json()
+        try:
+            chains_json = self.file.fetch()
+        except (OSError, ValueError) as e:
+            raise ConnectionError(f"Failed to get {self.file.url}") from e
+        if chains_json is not None:
+            self.chains_json = chains_json
+            print("data/chains.json has been saved.")
+        elif self._chains_json is None:
+            self.load_chains_json_file()
 
     def save_chains_json(self) -> None:
         """
@@ -78,13 +154,7 @@ class Chains:
         Creates data directory if it doesn't exist and saves the current
         chain configurations to chains.json.
         """
-        # Ensure data directory exists
-        if not data_folder.exists():
-            data_folder.mkdir()
-
-        # Save configurations to JSON file
-        with open(data_folder.joinpath("chains.json"), "w", encoding='utf-8') as f:
-            json.dump(self.chains_json, f, indent=4)
+        self.file.save(self.chains_json)
         print("data/chains.json has been saved.")
 
     def load_chains_json_file(self) -> bool:
@@ -94,16 +164,29 @@ class Chains:
         Returns:
             bool: True if successful, False if file not found
         """
-        chain_file = data_folder.joinpath("chains.json")
-        if not chain_file.exists():
+        chains_json = self.file.load()
+        if chains_json is None:
             print(f"chains.json not found in {data_folder}")
             return False
 
-        with open(chain_file, encoding='utf-8') as f:
-            self.chains_json = json.load(f)
+        self._loaded = True
+        self.chains_json = chains_json
         print("data/chains.json has been loaded.")
         return True
 
+    async def refresh_loop(self, interval: float) -> None:
+        """
+        Revalidate chains.json every `interval` seconds in the background.
+
+        Args:
+            interval: Seconds between revalidations
+        """
+        def on_update(chains_json: list[dict[str, Any]]) -> None:
+            self._loaded = True
+            self.chains_json = chains_json
+
+        await self.file.refresh_loop(interval, on_update)
+
     def select_chain_by_key_value(self, key: str, value: Any) -> bool:
         """
         Select a chain configuration by matching key and value.
@@ -121,11 +204,32 @@ class Chains:
         if self.chains_json is None:
             raise ValueError("chains_json is None")
 
-        for chain_info in self.chains_json:
-            if isinstance(chain_info, dict) and chain_info.get(key) == value:
-                self.selected_chain = chain_info.copy()
-                return True
-        return False
+        try:
+            chain_info = self._key_index(key).get(value)
+        except TypeError:
+            # unhashable value, fall back to a scan
+            chain_info = next((chain_info for chain_info in self.chains_json
+                               if isinstance(chain_info, dict) and chain_info.get(key) == value),
+                              None)
+        if chain_info is None:
+            return False
+        self.selected_chain = chain_info.copy()
+        return True
+
+    def _key_index(self, key: str) -> dict[Any, dict[str, Any]]:
+        """ chains by their hashable `key` value, first entry wins """
+        index = self._key_indexes.get(key)
+        if index is None:
+            index = {}
+            for chain_info in self.chains_json:
+                if not isinstance(chain_info, dict) or key not in chain_info:
+                    continue
+                try:
+                    index.setdefault(chain_info[key], chain_info)
+                except TypeError:
+                    continue
+            self._key_indexes[key] = index
+        return index
 
     def get_selected_chain_value(self, key: str) -> Any:
         """
@@ -0,0 +1,124 @@
+"""
+Async HTTP Client Module
+
+This module provides a shared, non-blocking HTTP transport with:
+- Pooled keep-alive connections (httpx.AsyncClient)
+- HTTP/2 when the optional `h2` package is installed
+- Configurable global and per-host connection limits
+- Lazy creation inside the running event loop
+"""
+
+import asyncio
+from importlib.util import find_spec
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+
+DEFAULT_TIMEOUT = 10
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 30
+DEFAULT_MAX_CONNECTIONS_PER_HOST = 20
+
+
+class HttpClient:
+    """
+    Shared asynchronous HTTP client with connection pooling.
+
+    One instance is meant to be shared by every API module of a gateway so
+    that all upstream calls reuse the same keep-alive connections instead
+    of opening a new TCP/TLS session per request.
+
+    Attributes:
+        timeout (float): Request timeout in seconds
+        http2 (bool): Whether HTTP/2 is negotiated when the server supports it
+        limits (httpx.Limits): Global pool limits
+        max_connections_per_host (int): Concurrent requests allowed per host
+
+    Example:
+        http = HttpClient({"http_max_connections_per_host": 10})
+        res = await http.get("https://api.etherscan.io/v2/chainlist")
+        await http.close()
+    """
+
+    def __init__(self, config: Optional[dict[str, Any]] = None):
+        """
+        Initialize HTTP client settings.
+
+        Args:
+            config: Optional configuration dictionary containing:
+                - http_timeout: Request timeout in seconds
+                - http_max_connections: Total pooled connections
+                - http_max_keepalive_connections: Idle connections kept open
+                - http_keepalive_expiry: Seconds an idle connection is kept
+                - http_max_connections_per_host: Concurrent requests per host
+                - http_http2: Enable HTTP/2 (requires the `h2` package)
+        """
+        config = config or {}
+        self.timeout = config.get('http_timeout', DEFAULT_TIMEOUT)
+        self.limits = httpx.Limits(
+            max_connections=config.get('http_max_connections', DEFAULT_MAX_CONNECTIONS),
+            max_keepalive_connections=config.get(
+                'http_max_keepalive_connections', DEFAULT_MAX_KEEPALIVE_CONNECTIONS),
+            keepalive_expiry=config.get('http_keepalive_expiry', DEFAULT_KEEPALIVE_EXPIRY),
+        )
+        self.max_connections_per_host = config.get(
+            'http_max_connections_per_host', DEFAULT_MAX_CONNECTIONS_PER_HOST)
+        # HTTP/2 silently falls back to HTTP/1.1 when h2 is not installed
+        self.http2 = bool(config.get('http_http2', True)) and find_spec('h2') is not None
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_semaphores: dict[str, asyncio.Semaphore] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """
+        Underlying httpx client, created on first use.
+
+        Returns:
+            httpx.AsyncClient: Pooled async client
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=self.http2,
+                limits=self.limits,
+                timeout=self.timeout,
+            )
+        return self._client
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        """ get the concurrency semaphore for the host of the url """
+        host = urlsplit(url).netloc
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_connections_per_host)
+            self._host_semaphores[host] = semaphore
+        return semaphore
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a GET request through the shared connection pool.
+
+        Args:
+            url: Request URL
+            **kwargs: Extra arguments passed to httpx.AsyncClient.get
+
+        Returns:
+            httpx.Response: Upstream response
+
+        Raises:
+            OSError: If the request fails at the transport level
+        """
+        async with self._host_semaphore(url):
+            try:
+                return await self.client.get(url, **kwargs)
+            except httpx.TransportError as e:
+                raise OSError(f"HTTP request failed: {str(e)}") from e
+
+    async def close(self) -> None:
+        """ Close all pooled connections. """
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
@@ -0,0 +1,139 @@
+"""
+Local Cache Module
+
+This module provides a bounded in-process cache tier with:
+- Least-recently-used eviction when the size limit is reached
+- Per-entry time-to-live
+- Hit/miss/eviction/expiration statistics
+"""
+
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Optional
+
+
+class LocalCache:
+    """
+    Size-limited LRU cache with per-entry TTL.
+
+    Values are stored as-is (no serialization) and shared between
+    callers, so they must be treated as read-only.
+
+    Attributes:
+        max_size (int): Maximum number of entries
+        default_ttl (float): TTL in seconds used when none is given
+        hits (int): Number of successful lookups
+        misses (int): Number of failed lookups (absent or expired)
+        evictions (int): Entries dropped to respect max_size
+        expirations (int): Entries dropped because their TTL elapsed
+
+    Example:
+        local = LocalCache(max_size=10000, default_ttl=5)
+        local.set("key", {"value": 123}, ttl=2)
+        local.get("key")
+    """
+
+    def __init__(self, max_size: int, default_ttl: float):
+        """
+        Initialize local cache.
+
+        Args:
+            max_size: Maximum number of entries
+            default_ttl: TTL in seconds used when none is given
+        """
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a value, refreshing its LRU position.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Optional[Any]: Cached value or None if absent or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a value, evicting least-recently-used entries if full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: TTL in seconds (default_ttl if None)
+        """
+        if ttl is None:
+            ttl = self.default_ttl
+        self._entries[key] = (monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: str) -> bool:
+        """
+        Drop a key.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            bool: True if the key was present
+        """
+        return self._entries.pop(key, None) is not None
+
+    def clear_prefix(self, prefix: str) -> int:
+        """
+        Drop all keys starting with a prefix.
+
+        Args:
+            prefix: Key prefix
+
+        Returns:
+            int: Number of keys dropped
+        """
+        keys = [key for key in self._entries if key.startswith(prefix)]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            dict[str, Any]: Size, limits and hit/miss/eviction counters
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
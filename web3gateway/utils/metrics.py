@@ -0,0 +1,137 @@
+"""
+Metrics Module
+
+This module provides lightweight in-process metrics with:
+- Named counters
+- Per-stage timing statistics (count/total/max)
+- Value histograms with exact integer buckets
+- Context manager for timing code blocks
+- JSON-friendly snapshots for the metrics endpoint
+"""
+
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, Iterator
+
+
+@dataclass
+class StageTiming:
+    """
+    Accumulated timing statistics of one stage.
+
+    Attributes:
+        count (int): Number of observations
+        total (float): Sum of observed durations in seconds
+        max (float): Longest observed duration in seconds
+    """
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """ record one duration """
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def as_dict(self) -> dict[str, Any]:
+        """ JSON-friendly view with durations in milliseconds """
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 3),
+            "avg_ms": round(self.total * 1000 / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class Metrics:
+    """
+    In-process counters and stage timers.
+
+    Metrics are kept per process and are cheap enough to update on every
+    request. They are not persisted and reset on restart.
+
+    Attributes:
+        counters (dict[str, int]): Named event counters
+        timings (dict[str, StageTiming]): Named stage timings
+        histograms (dict[str, dict[int, int]]): Named value -> occurrences
+
+    Example:
+        metrics = Metrics()
+        with metrics.timer("upstream"):
+            await fetch()
+        metrics.incr("cache_hit")
+    """
+
+    def __init__(self) -> None:
+        """ Initialize empty metrics. """
+        self.counters: dict[str, int] = defaultdict(int)
+        self.timings: dict[str, StageTiming] = defaultdict(StageTiming)
+        self.histograms: dict[str, dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    def incr(self, name: str, value: int = 1) -> None:
+        """
+        Increment a counter.
+
+        Args:
+            name: Counter name
+            value: Amount to add
+        """
+        self.counters[name] += value
+
+    def observe(self, name: str, seconds: float) -> None:
+        """
+        Record a stage duration.
+
+        Args:
+            name: Stage name
+            seconds: Duration in seconds
+        """
+        self.timings[name].observe(seconds)
+
+    def record(self, name: str, value: int) -> None:
+        """
+        Record a small integer value (e.g. a batch size) in a histogram.
+
+        Args:
+            name: Histogram name
+            value: Observed value, used as the bucket
+        """
+        self.histograms[name][value] += 1
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """
+        Time the enclosed block as a stage, including awaited calls.
+
+        Args:
+            name: Stage name
+        """
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, perf_counter() - start)
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Get a JSON-friendly copy of all metrics.
+
+        Returns:
+            dict[str, Any]: Counters, stage timings and histograms
+        """
+        return {
+            "counters": dict(self.counters),
+            "stages": {name: timing.as_dict() for name, timing in self.timings.items()},
+            "histograms": {name: dict(sorted(buckets.items()))
+                           for name, buckets in self.histograms.items()},
+        }
+
+    def reset(self) -> None:
+        """ Clear all metrics. """
+        self.counters.clear()
+        self.timings.clear()
+        self.histograms.clear()
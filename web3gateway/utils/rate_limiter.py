@@ -2,30 +2,74 @@
 Rate Limiter Module
 
 This module provides asynchronous rate limiting functionality with:
-- Configurable time window and request limits
+- Configurable time window, request limit and burst size
+- O(1) GCRA (generic cell rate algorithm) bookkeeping per call
+- Reservations computed atomically, waiting done outside the lock
+- Redis-backed mode sharing one budget across workers and hosts
 - Decorator support for easy function rate limiting
-- Thread-safe implementation using asyncio locks
-- Auto-cleanup of expired timestamps
 """
 
 import asyncio
+import logging
+import threading
 from functools import wraps
-from time import time
-from typing import Any
+from math import floor
+from time import monotonic
+from typing import Any, Optional
+
+
+logger = logging.getLogger(__name__)
+
+# Default of the optional rate_limit_burst setting: calls strictly paced, so
+# no window of rate_limit_period seconds exceeds rate_limit_calls
+DEFAULT_BURST = 1
+# Seconds to use the local fallback before retrying Redis after an error
+REDIS_RETRY_INTERVAL = 5.0
+
+# GCRA reservation executed atomically in Redis, using the Redis clock so
+# every worker and host agrees on time. Times are in microseconds.
+# Returns {delay until the reserved slot, backlog after the reservation}.
+GCRA_RESERVE_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local clock = redis.call("TIME")
+local now = tonumber(clock[1]) * 1000000 + tonumber(clock[2])
+local tat = tonumber(redis.call("GET", KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+local new_tat = tat + interval
+redis.call("SET", KEYS[1], string.format("%d", new_tat),
+           "PX", math.ceil((new_tat - now) / 1000) + 1000)
+local delay = tat - tolerance - now
+if delay < 0 then
+    delay = 0
+end
+return {delay, new_tat - now}
+"""
 
 
 class RateLimiter:
     """
-    Asynchronous rate limiter implementation.
+    Asynchronous GCRA rate limiter.
 
-    Provides both decorator and direct usage patterns for rate limiting
-    with configurable windows and limits.
+    Calls are spaced `rate_limit_period / rate_limit_calls` seconds apart
+    on average, with up to `rate_limit_burst` calls allowed back to back.
+    With the default burst of 1 no window of `rate_limit_period` seconds
+    ever sees more than `rate_limit_calls` calls. Larger bursts are opt-in:
+    spaced calls may follow a full burst of B calls, so a window can then
+    see up to `rate_limit_calls + B - 1` calls.
+    Each caller reserves its slot under a short lock by advancing the
+    theoretical arrival time (TAT) and then sleeps until its slot without
+    holding the lock, so waiters never queue behind each other's sleep.
 
     Attributes:
         rate_limit_period (float): Time window in seconds
         rate_limit_calls (int): Maximum allowed calls within window
-        function_calls (list): Timestamp history of function calls
-        _lock (asyncio.Lock): Thread-safe lock for concurrent access
+        rate_limit_burst (int): Calls allowed back to back
+        emission_interval (float): Average seconds between calls
+        _tat (float): Theoretical arrival time of the next call
+        _lock (threading.Lock): Guards the reservation bookkeeping
 
     Example:
         limiter = RateLimiter({"rate_limit_period": 1, "rate_limit_calls": 5})
@@ -40,41 +84,55 @@ class RateLimiter:
         Initialize rate limiter with configuration.
 
         Args:
-            config: Dictionary containing 'rate_limit_period' and 'rate_limit_calls'
+            config: Dictionary containing 'rate_limit_period' and 'rate_limit_calls',
+                and optionally 'rate_limit_burst' (defaults to 1)
         """
         self.rate_limit_period = config['rate_limit_period']
         self.rate_limit_calls = config['rate_limit_calls']
-        self.function_calls: list[Any] = []
-        self._lock = asyncio.Lock()
+        self.rate_limit_burst = max(1, config.get('rate_limit_burst', DEFAULT_BURST))
+        self.emission_interval = self.rate_limit_period / self.rate_limit_calls
+        # How far ahead of now the TAT may run before callers must wait
+        self._tolerance = self.emission_interval * (self.rate_limit_burst - 1)
+        self._tat = 0.0
+        self._lock = threading.Lock()
 
-    async def acquire(self):
+    def reserve(self) -> float:
         """
-        Acquire permission to proceed with rate-limited operation.
+        Reserve the next call slot without waiting.
 
-        Blocks until rate limit allows execution or raises if limit exceeded.
-        Thread-safe using asyncio lock.
+        Returns:
+            float: Seconds the caller must wait before proceeding (0 if none)
+        """
+        with self._lock:
+            now = monotonic()
+            tat = max(self._tat, now)
+            self._tat = tat + self.emission_interval
+            return max(0.0, tat - self._tolerance - now)
 
-        Raises:
-            asyncio.TimeoutError: If waiting exceeds configured timeout
+    def available(self) -> int:
         """
-        async with self._lock:
-            now = time()
+        Number of calls that can proceed right now without waiting.
 
-            # Remove expired timestamps
-            self.function_calls = [
-                ts for ts in self.function_calls
-                if ts > now - self.rate_limit_period]
+        Returns:
+            int: Remaining burst capacity
+        """
+        with self._lock:
+            now = monotonic()
+            tat = max(self._tat, now)
+            # epsilon absorbs float error when the budget is exactly full
+            slack = (now + self._tolerance - tat) / self.emission_interval
+            return max(0, floor(slack + 1e-9) + 1)
 
-            if len(self.function_calls) >= self.rate_limit_calls:
-                # Calculate wait time until oldest request expires
-                sleep_time = self.function_calls[0] - \
-                    (now - self.rate_limit_period)
-                if sleep_time > 0:
-                    print(f"Rate limit exceeded, sleeping for {sleep_time} seconds")
-                    await asyncio.sleep(sleep_time)
-                self.function_calls = self.function_calls[1:]
+    async def acquire(self):
+        """
+        Acquire permission to proceed with rate-limited operation.
 
-            self.function_calls.append(now)
+        Reserves a slot atomically, then sleeps until the slot without
+        holding any lock.
+        """
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
 
     def __call__(self, func):
         """
@@ -88,27 +146,123 @@ class RateLimiter:
         """
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            now = time()
-
-            # Clean up expired call records
-            self.function_calls = [
-                call for call in self.function_calls
-                if call > now - self.rate_limit_period]
-
-            if len(self.function_calls) >= self.rate_limit_calls:
-                # Wait until earliest call expires
-                sleep_time = self.function_calls[0] - \
-                    (now - self.rate_limit_period)
-                if sleep_time > 0:
-                    print(f"Rate limit exceeded, sleeping for {sleep_time} seconds")
-                    await asyncio.sleep(sleep_time)
-                self.function_calls = self.function_calls[1:]
-
-            self.function_calls.append(now)
+            await self.acquire()
             return await func(*args, **kwargs)
         return wrapper
 
 
+class RedisRateLimiter(RateLimiter):
+    """
+    GCRA rate limiter whose state lives in Redis.
+
+    Every worker process (and host) sharing the Redis key shares one call
+    budget. The reservation runs as a Lua script, so it is atomic, and
+    callers sleep locally until their slot. If Redis is unavailable the
+    limiter falls back to its in-process budget and retries Redis after
+    `REDIS_RETRY_INTERVAL` seconds.
+
+    Attributes:
+        redis: Async Redis client (e.g. CacheService.redis)
+        key (str): Redis key holding the theoretical arrival time
+
+    Example:
+        limiter = RedisRateLimiter(config, cache.redis, name="etherscan")
+        await limiter.acquire()
+    """
+
+    def __init__(self, config: dict, redis: Any, name: str = "etherscan"):
+        """
+        Initialize Redis-backed rate limiter.
+
+        Args:
+            config: Rate limit configuration (see RateLimiter)
+            redis: Async Redis client to run the reservation script on
+            name: Budget name; limiters with the same name share a budget
+        """
+        super().__init__(config)
+        self.redis = redis
+        self.key = f"web3gateway:ratelimit:{name}"
+        self._script = redis.register_script(GCRA_RESERVE_SCRIPT)
+        self._retry_at = 0.0
+        # Last shared backlog seen in Redis, to estimate `available` locally
+        self._backlog: Optional[tuple[float, float]] = None
+
+    async def reserve_shared(self) -> Optional[float]:
+        """
+        Reserve the next call slot in the shared budget.
+
+        Returns:
+            Optional[float]: Seconds to wait, or None if Redis is unavailable
+        """
+        if monotonic() < self._retry_at:
+            return None
+        try:
+            delay, backlog = await self._script(
+                keys=[self.key],
+                args=[int(self.emission_interval * 1e6), int(self._tolerance * 1e6)])
+        except Exception as e:
+            logger.warning(f"Redis rate limiter unavailable, using local budget: {str(e)}")
+            self._retry_at = monotonic() + REDIS_RETRY_INTERVAL
+            return None
+        self._backlog = (monotonic(), int(backlog) / 1e6)
+        return int(delay) / 1e6
+
+    def available(self) -> int:
+        """
+        Estimate calls that can proceed right now in the shared budget.
+
+        The estimate is based on the last reservation made by this process
+        and falls back to the local budget when none was made yet.
+
+        Returns:
+            int: Estimated remaining burst capacity
+        """
+        if self._backlog is None or monotonic() < self._retry_at:
+            return super().available()
+        seen_at, backlog = self._backlog
+        remaining = backlog - (monotonic() - seen_at)
+        slack = (self._tolerance - max(0.0, remaining)) / self.emission_interval
+        return max(0, floor(slack + 1e-9) + 1)
+
+    async def acquire(self):
+        """
+        Acquire permission from the shared budget, or the local one if
+        Redis is unavailable.
+        """
+        delay = await self.reserve_shared()
+        if delay is None:
+            delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def create_rate_limiter(config: dict, redis: Any = None,
+                        name: str = "etherscan") -> RateLimiter:
+    """
+    Create the rate limiter selected by `rate_limit_backend`.
+
+    Args:
+        config: Rate limit configuration, with optional 'rate_limit_backend'
+            set to "local" (default) or "redis"
+        redis: Async Redis client, required for the "redis" backend
+        name: Budget name for the "redis" backend
+
+    Returns:
+        RateLimiter: Local or Redis-backed limiter
+
+    Raises:
+        ValueError: If the backend is unknown or Redis is missing
+    """
+    backend = config.get('rate_limit_backend', 'local')
+    if backend == 'local':
+        return RateLimiter(config)
+    if backend == 'redis':
+        if redis is None:
+            raise ValueError("rate_limit_backend 'redis' requires a Redis client")
+        return RedisRateLimiter(config, redis, name)
+    raise ValueError(f"Unknown rate_limit_backend: {backend}")
+
+
 # Example usage
 if __name__ == "__main__":
     # Create rate limiter allowing 5 calls per second
@@ -0,0 +1,90 @@
+"""
+Single-Flight Module
+
+This module provides in-process request coalescing:
+- Concurrent calls with the same key share one execution
+- Every waiter receives the same result or exception
+- The shared call survives cancellation of any single waiter
+- Background calls nobody waits for, deduplicated the same way
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key.
+
+    The first caller for a key starts the call; callers arriving while it
+    is in flight await the same task instead of starting their own.
+
+    Attributes:
+        coalesced (int): Number of calls that joined an in-flight call
+
+    Example:
+        flight = SingleFlight()
+        result = await flight.do(cache_key, lambda: fetch(url))
+    """
+
+    def __init__(self) -> None:
+        """ Initialize with no calls in flight. """
+        self._calls: dict[str, asyncio.Task] = {}
+        self.coalesced = 0
+
+    def in_flight(self, key: str) -> bool:
+        """
+        Check whether a call is in flight for a key.
+
+        Args:
+            key: Call key
+
+        Returns:
+            bool: True if a call for the key is running
+        """
+        return key in self._calls
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run `fn` once for all concurrent callers of `key`.
+
+        Args:
+            key: Call key (e.g. the cache key of the request)
+            fn: Zero-argument coroutine function performing the call
+
+        Returns:
+            Any: Result of the shared call
+
+        Raises:
+            Exception: Whatever the shared call raised
+        """
+        if key in self._calls:
+            self.coalesced += 1
+        # shield so a cancelled waiter does not cancel the call for the others
+        return await asyncio.shield(self.start(key, fn))
+
+    def start(self, key: str, fn: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """
+        Start `fn` for `key` without waiting for it, unless a call is in flight.
+
+        Args:
+            key: Call key
+            fn: Zero-argument coroutine function performing the call
+
+        Returns:
+            asyncio.Task: The new call, or the one already in flight
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        return task
+
+    def _done(self, key: str, task: asyncio.Task) -> None:
+        """ forget a finished call """
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # mark the exception retrieved even if every waiter was cancelled
+        if not task.cancelled():
+            task.exception()